@@ -0,0 +1,38 @@
+import os
+import pytest
+from unittest import mock
+
+from doors_dashboards.core import geodbaccess
+
+from dashboardsession import get_dashboard_configs
+from standins import GeoDBClientStandIn
+from standins import HttpStandIn
+from standins import VectorDataCubeStandIn
+
+NUM_ROWS_ENV_VAR = "DOORS_BENCHMARK_ROWS"
+DEFAULT_NUM_ROWS = 10000
+
+
+@pytest.fixture(scope="session", autouse=True)
+def stand_ins():
+    num_rows = int(os.environ.get(NUM_ROWS_ENV_VAR, DEFAULT_NUM_ROWS))
+    geodb_client = GeoDBClientStandIn(get_dashboard_configs(), num_rows)
+    http = HttpStandIn()
+    patches = [
+        mock.patch.object(geodbaccess, "_get_client", return_value=geodb_client),
+        mock.patch(
+            "doors_dashboards.core.featurehandler.VectorDataCubeAccessor",
+            side_effect=lambda: VectorDataCubeStandIn(num_rows),
+        ),
+        mock.patch("requests.get", side_effect=http.get),
+        # refreshing in the background would disturb the measurements
+        mock.patch("doors_dashboards.dashboards.dashboard.get_refresh_scheduler"),
+        mock.patch.dict(os.environ, {}),
+    ]
+    for patch in patches:
+        patch.start()
+    # features are read from the stand-ins on every build
+    os.environ.pop("DOORS_CACHE_DIR", None)
+    yield http
+    for patch in reversed(patches):
+        patch.stop()
@@ -0,0 +1,85 @@
+import argparse
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+import sys
+import time
+from typing import List
+
+from doors_dashboards.core.geodbaccess import convert_parameters_to_columns
+
+_VARIABLES = ["Ammonia nitrogen", "Nitrate nitrogen", "Phosphate", "Silicon"]
+_KEYS = ["station", "sampling depth [m]"]
+
+
+def convert_parameters_to_columns_by_rows(
+    gdf: gpd.GeoDataFrame,
+    variables: List[str],
+    keys: List[str],
+    value: str,
+    parameter: str,
+) -> gpd.GeoDataFrame:
+    # the implementation replaced by convert_parameters_to_columns
+    gdf = gdf.copy()
+    full = keys + [value]
+    for variable in variables:
+        sgdf = gdf[gdf[parameter] == variable][full]
+        for row, line in sgdf.iterrows():
+            loc_row = gdf[keys[0]] == line[keys[0]]
+            for key in keys[1:]:
+                loc_row &= gdf[key] == line[key]
+            gdf.loc[loc_row, variable] = line[value]
+    return gdf
+
+
+def create_long_frame(num_rows: int) -> gpd.GeoDataFrame:
+    # one row per measured parameter, like the EMBLAS nutrient collections
+    rng = np.random.default_rng(42)
+    stations = [f"Station {i}" for i in range(max(num_rows // 40, 1))]
+    return gpd.GeoDataFrame(
+        {
+            "station": rng.choice(stations, num_rows),
+            "sampling depth [m]": rng.choice([0.0, 10.0, 20.0, 50.0], num_rows),
+            "parameter": rng.choice(_VARIABLES, num_rows),
+            "value": rng.uniform(0, 5, num_rows),
+        },
+        geometry=shapely.points(
+            rng.uniform(39, 42, num_rows), rng.uniform(41, 44, num_rows)
+        ),
+        crs="EPSG:4326",
+    )
+
+
+def _time(function, gdf: gpd.GeoDataFrame) -> (float, gpd.GeoDataFrame):
+    start = time.perf_counter()
+    result = function(gdf, _VARIABLES, _KEYS, "value", "parameter")
+    return time.perf_counter() - start, result
+
+
+def main(args: List[str] = None):
+    parser = argparse.ArgumentParser(
+        description="Compares the pivot-based conversion of parameter rows to "
+        "variable columns with the former row-wise implementation."
+    )
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument(
+        "--skip-rows-implementation",
+        action="store_true",
+        help="Do not run the row-wise implementation, which takes several "
+        "minutes for 100,000 rows.",
+    )
+    parsed_args = parser.parse_args(args)
+    gdf = create_long_frame(parsed_args.rows)
+    pivot_duration, pivot_result = _time(convert_parameters_to_columns, gdf)
+    print(f"pivot: {pivot_duration:.3f}s for {parsed_args.rows} rows")
+    if parsed_args.skip_rows_implementation:
+        return
+    rows_duration, rows_result = _time(convert_parameters_to_columns_by_rows, gdf)
+    print(f"rows: {rows_duration:.3f}s for {parsed_args.rows} rows")
+    pd.testing.assert_frame_equal(rows_result, pivot_result)
+    print(f"Results are equal, speedup: {rows_duration / pivot_duration:.0f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
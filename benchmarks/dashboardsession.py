@@ -0,0 +1,187 @@
+from dash import Dash
+import glob
+import json
+import os
+import resource
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+import yaml
+
+from doors_dashboards import configreader
+from doors_dashboards.dashboards.dashboard import create_dashboard
+
+CONFIGS_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(configreader.__file__)), configreader.CONFIGS_PATH
+)
+
+
+def get_dashboard_configs():
+    configs = []
+    for config_path in sorted(glob.glob(os.path.join(CONFIGS_DIR, "*.yml"))):
+        with open(config_path, "r", encoding="utf-8") as config_stream:
+            configs.append(yaml.safe_load(config_stream))
+    return configs
+
+
+def get_peak_rss_mb() -> float:
+    # ru_maxrss is given in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _stringify_id(component_id: Any) -> str:
+    # the way the browser writes ids
+    if isinstance(component_id, dict):
+        return json.dumps(component_id, sort_keys=True, separators=(",", ":"))
+    return component_id
+
+
+def _parse_id(component_id: str) -> Any:
+    # pattern-matching ids are given as JSON
+    return json.loads(component_id) if component_id.startswith("{") else component_id
+
+
+def _get_outputs(output: str) -> List[Tuple[Any, str]]:
+    # "id.property" or "..id.property...id.property.." for several outputs
+    outputs = output[2:-2].split("...") if output.startswith("..") else [output]
+    return [
+        (_parse_id(component_id), prop)
+        for component_id, prop in (o.split("@")[0].rsplit(".", 1) for o in outputs)
+    ]
+
+
+def _matches(pattern: Any, component_id: Any) -> bool:
+    if not isinstance(pattern, dict):
+        return pattern == component_id
+    return (
+        isinstance(component_id, dict)
+        and pattern.keys() == component_id.keys()
+        and all(v == ["ALL"] or v == component_id[k] for k, v in pattern.items())
+    )
+
+
+def _is_wildcard(component_id: Any) -> bool:
+    return isinstance(component_id, dict) and ["ALL"] in component_id.values()
+
+
+# builds a dashboard and runs its callbacks the way the browser triggers them:
+# values of inputs and states are kept in between and callbacks are requested
+# from the server of a Dash app showing the dashboard
+class DashboardSession:
+
+    def __init__(self, config: Dict):
+        self.config = config
+        self.layout = create_dashboard(config)
+        app = Dash(__name__)
+        app.layout = self.layout
+        self._client = app.server.test_client()
+        self._client.get("/")
+        self._ids = []
+        self._values = {}
+        for component in self.layout._traverse():
+            component_id = getattr(component, "id", None)
+            if component_id is None:
+                continue
+            self._ids.append(component_id)
+            for prop in component._prop_names:
+                value = getattr(component, prop, None)
+                if value is not None:
+                    self._values[(_stringify_id(component_id), prop)] = value
+        # the app takes over all callbacks registered since the last one, like
+        # the browser only those updating components of the layout are run
+        self._callbacks = [
+            (output, spec)
+            for output, spec in app.callback_map.items()
+            if all(
+                _is_wildcard(output_id) or output_id in self._ids
+                for output_id, _ in _get_outputs(output)
+            )
+        ]
+        self.num_calls = 0
+        self.response_bytes = 0
+
+    def has(self, component_id: Any, prop: str) -> bool:
+        return (_stringify_id(component_id), prop) in self._values or any(
+            _matches(_parse_id(i["id"]), component_id)
+            and i["property"] == prop
+            for _, spec in self._callbacks
+            for i in spec["inputs"]
+        )
+
+    def get(self, component_id: Any, prop: str) -> Any:
+        return self._values.get((_stringify_id(component_id), prop))
+
+    def set(self, component_id: Any, prop: str, value: Any):
+        self._values[(_stringify_id(component_id), prop)] = value
+
+    def _get_dependencies(self, pattern: Any, prop: str, with_values: bool) -> Any:
+        # wildcards are replaced with the matching components of the layout
+        component_ids = [pattern]
+        if _is_wildcard(pattern):
+            component_ids = [i for i in self._ids if _matches(pattern, i)]
+        dependencies = [dict(id=i, property=prop) for i in component_ids]
+        if with_values:
+            for dependency in dependencies:
+                dependency["value"] = self.get(dependency["id"], prop)
+        return dependencies if _is_wildcard(pattern) else dependencies[0]
+
+    def _request(
+        self, output: str, spec: Dict, component_id: Any, prop: str
+    ) -> Optional[Dict]:
+        outputs = [
+            self._get_dependencies(output_id, output_prop, False)
+            for output_id, output_prop in _get_outputs(output)
+        ]
+        response = self._client.post(
+            "/_dash-update-component",
+            json={
+                "output": output,
+                "outputs": outputs if output.startswith("..") else outputs[0],
+                "inputs": [
+                    self._get_dependencies(_parse_id(i["id"]), i["property"], True)
+                    for i in spec["inputs"]
+                ],
+                "changedPropIds": [f"{_stringify_id(component_id)}.{prop}"],
+                "state": [
+                    self._get_dependencies(_parse_id(s["id"]), s["property"], True)
+                    for s in spec["state"]
+                ],
+            },
+        )
+        if response.status_code == 204:
+            # callbacks preventing updates
+            return None
+        if response.status_code != 200:
+            raise RuntimeError(f"callback {output} failed: {response.data}")
+        self.response_bytes += len(response.data)
+        return json.loads(response.data).get("response", {})
+
+    def trigger(self, component_id: Any, prop: str, value: Any, depth: int = 2):
+        # callbacks depending on the changed value are run, and those
+        # depending on their outputs up to the given depth
+        self.set(component_id, prop, value)
+        if depth == 0:
+            return
+        for output, spec in self._callbacks:
+            if not any(
+                _matches(_parse_id(i["id"]), component_id) and i["property"] == prop
+                for i in spec["inputs"]
+            ):
+                continue
+            response = self._request(output, spec, component_id, prop)
+            if response is None:
+                continue
+            self.num_calls += 1
+            for output_id, output_values in response.items():
+                for output_prop, output_value in output_values.items():
+                    # patches are applied in the browser, the value is kept
+                    if output_value is None or (
+                        isinstance(output_value, dict)
+                        and "__dash_patch_update" in output_value
+                    ):
+                        continue
+                    self.trigger(
+                        _parse_id(output_id), output_prop, output_value, depth - 1
+                    )
@@ -0,0 +1,269 @@
+import base64
+import geopandas as gpd
+import io
+import json
+import numpy as np
+import pandas as pd
+from PIL import Image
+import re
+import shapely
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from doors_dashboards.core.constants import REFERENCE_CRS
+from doors_dashboards.core.featurehandler import FeatureHandler
+
+# extent of the synthetic features, roughly the Black Sea
+_LON_RANGE = (27.5, 41.5)
+_LAT_RANGE = (41.0, 46.5)
+_NUM_GROUPS = 4
+_DEPTHS = [0.0, 10.0, 20.0, 50.0]
+COLOR_MAP_NAMES = ["chl_DeM2", "haline", "thermal"]
+
+
+def _png(width: int = 256, height: int = 256) -> bytes:
+    stream = io.BytesIO()
+    Image.new("RGBA", (width, height), (0, 0, 128, 128)).save(stream, "PNG")
+    return stream.getvalue()
+
+
+def get_area(eez: Optional[str] = None) -> shapely.Geometry:
+    if eez is None:
+        return shapely.box(_LON_RANGE[0], _LAT_RANGE[0], _LON_RANGE[1], _LAT_RANGE[1])
+    return FeatureHandler._load_eez(eez).union_all()
+
+
+def _sample_locations(
+    rng: np.random.Generator, num_locations: int, area: shapely.Geometry
+) -> Tuple[np.ndarray, np.ndarray]:
+    min_lon, min_lat, max_lon, max_lat = area.bounds
+    lons, lats = np.empty(0), np.empty(0)
+    while len(lons) < num_locations:
+        candidate_lons = rng.uniform(min_lon, max_lon, num_locations)
+        candidate_lats = rng.uniform(min_lat, max_lat, num_locations)
+        inside = shapely.contains_xy(area, candidate_lons, candidate_lats)
+        lons = np.concatenate([lons, candidate_lons[inside]])
+        lats = np.concatenate([lats, candidate_lats[inside]])
+    return lons[:num_locations], lats[:num_locations]
+
+
+def create_features(
+    params: Dict,
+    num_rows: int,
+    areas: Optional[List[shapely.Geometry]] = None,
+    seed: int = 0,
+) -> gpd.GeoDataFrame:
+    # a frame with the columns a collection configuration asks for; rows of a
+    # group share their location like the stations of a cruise, locations are
+    # spread evenly over the areas the collection is shown for
+    rng = np.random.default_rng(seed)
+    levels = params.get("levels") or []
+    areas = areas or [get_area()]
+    num_locations = max(num_rows // 20, len(areas))
+    location = rng.integers(0, num_locations, num_rows)
+    location_lons, location_lats = np.empty(num_locations), np.empty(num_locations)
+    for i, area in enumerate(areas):
+        area_locations = np.arange(i, num_locations, len(areas))
+        location_lons[area_locations], location_lats[area_locations] = (
+            _sample_locations(rng, len(area_locations), area)
+        )
+    lons = location_lons[location]
+    lats = location_lats[location]
+    columns = {
+        "id": np.arange(num_rows),
+        params.get("time_column", "timestamp"): pd.Timestamp("2016-01-01")
+        + pd.to_timedelta(np.sort(rng.uniform(0, 3 * 365, num_rows)), unit="D"),
+    }
+    for i, level in enumerate(levels):
+        if i == len(levels) - 1 and len(levels) > 1:
+            columns[level] = rng.choice(_DEPTHS, num_rows)
+        elif i == 0:
+            columns[level] = np.array([f"{level} {g}" for g in location % _NUM_GROUPS])
+        else:
+            columns[level] = np.array([f"{level} {g}" for g in location])
+    label = params.get("label")
+    if label and label not in columns:
+        columns[label] = np.array([f"{label} {g}" for g in location])
+    convert_from_parameters = params.get("convert_from_parameters")
+    variables = params.get("variables") or []
+    if convert_from_parameters:
+        columns[convert_from_parameters["parameter"]] = rng.choice(variables, num_rows)
+        columns[convert_from_parameters["value"]] = rng.uniform(0, 10, num_rows)
+    else:
+        for variable in variables:
+            if variable not in columns:
+                columns[variable] = rng.uniform(0, 10, num_rows)
+    color_code_variable = params.get("colorcodevariable", {}).get("name")
+    if color_code_variable and color_code_variable not in columns:
+        columns[color_code_variable] = rng.uniform(0, 10, num_rows)
+    return gpd.GeoDataFrame(
+        columns, geometry=shapely.points(lons, lats), crs=REFERENCE_CRS
+    )
+
+
+def _filter(gdf: gpd.GeoDataFrame, where: str) -> gpd.GeoDataFrame:
+    # understands the conditions geodbaccess creates: a time column compared
+    # to a timestamp and an envelope the geometries intersect
+    conditions = re.fullmatch(r"\((.+)\) AND \((.+)\)", where)
+    for condition in conditions.groups() if conditions else [where]:
+        envelope = re.fullmatch(
+            r'ST_Intersects\("geometry", ST_MakeEnvelope\((.+), (.+), (.+), (.+), '
+            r"4326\)\)",
+            condition,
+        )
+        if envelope is not None:
+            min_x, min_y, max_x, max_y = (float(e) for e in envelope.groups())
+            gdf = gdf.cx[min_x:max_x, min_y:max_y]
+            continue
+        column, operator, value = re.fullmatch(
+            '"(.+)" (>=?) \'(.+)\'', condition
+        ).groups()
+        if operator == ">=":
+            gdf = gdf[gdf[column] >= pd.Timestamp(value)]
+        else:
+            gdf = gdf[gdf[column] > pd.Timestamp(value)]
+    return gdf
+
+
+# serves synthetic collections through the GeoDBClient methods in use
+class GeoDBClientStandIn:
+
+    def __init__(self, configs: List[Dict], num_rows: int):
+        # several dashboards may show the same collection with other variables
+        # and for other areas
+        self._params = {}
+        self._areas = {}
+        for config in configs:
+            for feature in config.get("features", []):
+                if feature.get("type") != "geodb":
+                    continue
+                params = feature["params"]
+                key = (params.get("database"), params["collection"])
+                if key not in self._params:
+                    self._params[key] = dict(params, variables=[])
+                    self._areas[key] = []
+                variables = self._params[key]["variables"]
+                variables.extend(
+                    v for v in params.get("variables") or [] if v not in variables
+                )
+                if config.get("eez") not in self._areas[key]:
+                    self._areas[key].append(config.get("eez"))
+        self._num_rows = num_rows
+        self._gdfs = {}
+
+    def _get_gdf(self, collection: str, database: str) -> gpd.GeoDataFrame:
+        key = (database, collection)
+        if key not in self._gdfs:
+            self._gdfs[key] = create_features(
+                self._params.get(key, {}),
+                self._num_rows,
+                [get_area(eez) for eez in self._areas.get(key, [None])],
+            )
+        return self._gdfs[key]
+
+    def count_collection_rows(self, collection, database=None, exact_count=False):
+        return len(self._get_gdf(collection, database))
+
+    def get_collection_srid(self, collection, database=None):
+        return 4326
+
+    def get_collection_pg(
+        self,
+        collection,
+        select="*",
+        where=None,
+        group=None,
+        order=None,
+        limit=None,
+        offset=None,
+        database=None,
+    ):
+        gdf = self._get_gdf(collection, database)
+        if where is not None:
+            gdf = _filter(gdf, where)
+        if select == "count(*)":
+            return pd.DataFrame(dict(count=[len(gdf)]))
+        part = gdf.iloc[offset : offset + limit]
+        if select != "*":
+            part = part[[column.strip('"') for column in select.split(", ")]]
+        if len(part) == 0:
+            return pd.DataFrame(columns=["Empty Result"])
+        return part
+
+
+# replaces reading vector data cubes from S3
+class VectorDataCubeStandIn:
+
+    def __init__(self, num_rows: int):
+        self._num_rows = num_rows
+
+    def get_dataframe_from_vector_data_cube(
+        self,
+        filename: str,
+        bucket: str,
+        variables: List[str],
+        collection: str,
+        time_stamp_name: str = None,
+        collection_coord: str = None,
+        mask: gpd.GeoDataFrame = None,
+        time_range: Sequence[Optional[str]] = None,
+    ) -> gpd.GeoDataFrame:
+        params = dict(variables=variables, time_column=time_stamp_name)
+        areas = None if mask is None else [mask.union_all()]
+        gdf = create_features(params, self._num_rows, areas)
+        gdf = gdf[variables + ["geometry", time_stamp_name]]
+        if mask is not None:
+            gdf = gdf.clip(mask)
+        return gdf
+
+    def get_label(self, filename: str, bucket: str, collection: str, variable: str):
+        return variable
+
+    def get_var_for_label(self, collection: str, label: str):
+        return label
+
+
+class _Response:
+
+    def __init__(self, status_code: int, content: bytes = b""):
+        self.status_code = status_code
+        self.content = content
+        self.reason = "OK" if status_code == 200 else "Not Found"
+
+    def json(self):
+        return json.loads(self.content)
+
+
+# answers the requests to the xcube server and the meteogram service
+class HttpStandIn:
+
+    def __init__(self):
+        self.num_requests = 0
+        color_bar = base64.b64encode(_png(256, 2)).decode("ascii")
+        color_bars = [
+            ["Stand-in", "", [[name, color_bar] for name in COLOR_MAP_NAMES]]
+        ]
+        time_coords = dict(
+            coordinates=[f"2024-06-{day:02d}T00:00:00Z" for day in range(1, 31)]
+        )
+        self._responses = [
+            ("/api/colorbars", json.dumps(color_bars).encode()),
+            ("/coords/time", json.dumps(time_coords).encode()),
+            ("/api/tiles/", _png()),
+            (
+                "meteogram",
+                json.dumps(
+                    dict(data=dict(link=dict(href="https://example.com/m.png")))
+                ).encode(),
+            ),
+        ]
+
+    def get(self, url: str, params: Optional[Dict] = None, **kwargs) -> _Response:
+        self.num_requests += 1
+        for url_part, content in self._responses:
+            if url_part in url:
+                return _Response(200, content)
+        return _Response(404)
@@ -0,0 +1,115 @@
+import numpy as np
+import plotly.io.json
+import pytest
+
+from doors_dashboards.components.constant import COLLECTION
+from doors_dashboards.components.constant import GENERAL_STORE_ID
+from doors_dashboards.components.timeseries import TIMEPLOTS_ID
+from doors_dashboards.core.sourceregistry import get_source_registry
+from doors_dashboards.dashboards.dashboard import create_dashboard
+
+from dashboardsession import DashboardSession
+from dashboardsession import get_dashboard_configs
+from dashboardsession import get_peak_rss_mb
+
+CONFIGS = {config["id"]: config for config in get_dashboard_configs()}
+DASHBOARD_IDS = list(CONFIGS.keys())
+SCATTERMAP_ID = "scattermap"
+
+
+def _get_session(dashboard_id: str) -> DashboardSession:
+    session = DashboardSession(CONFIGS[dashboard_id])
+    collection = CONFIGS[dashboard_id]["features"][0]["id"]
+    session.set(f"{dashboard_id}-{GENERAL_STORE_ID}", "data", {COLLECTION: collection})
+    return session
+
+
+def _run(benchmark, session: DashboardSession, component_id, prop, value):
+    benchmark.pedantic(
+        session.trigger, args=(component_id, prop, value), rounds=5, iterations=1
+    )
+    benchmark.extra_info["callbacks"] = session.num_calls // 5
+    benchmark.extra_info["response_bytes"] = session.response_bytes // 5
+    benchmark.extra_info["peak_rss_mb"] = get_peak_rss_mb()
+
+
+@pytest.mark.parametrize("dashboard_id", DASHBOARD_IDS)
+def test_create_dashboard(benchmark, dashboard_id):
+    # sources shared between dashboards are read again for every build
+    layout = benchmark.pedantic(
+        create_dashboard,
+        args=(CONFIGS[dashboard_id],),
+        setup=get_source_registry().clear,
+        rounds=3,
+        iterations=1,
+    )
+    benchmark.extra_info["layout_bytes"] = len(plotly.io.json.to_json_plotly(layout))
+    benchmark.extra_info["peak_rss_mb"] = get_peak_rss_mb()
+
+
+@pytest.mark.parametrize("dashboard_id", DASHBOARD_IDS)
+def test_scattermap_click(benchmark, dashboard_id):
+    session = _get_session(dashboard_id)
+    figure = session.get(SCATTERMAP_ID, "figure")
+    if figure is None:
+        pytest.skip("dashboard has no scatter map")
+    points = [t for t in figure["data"] if t.get("customdata") is not None]
+    if not points:
+        pytest.skip("scatter map shows no points")
+    trace = points[0]
+    click_data = dict(
+        points=[
+            dict(
+                lon=trace["lon"][0],
+                lat=trace["lat"][0],
+                text=np.asarray(trace["text"])[0],
+                customdata=trace["customdata"][0],
+            )
+        ]
+    )
+    _run(benchmark, session, SCATTERMAP_ID, "clickData", click_data)
+
+
+@pytest.mark.parametrize("dashboard_id", DASHBOARD_IDS)
+def test_collection_switch(benchmark, dashboard_id):
+    features = CONFIGS[dashboard_id]["features"]
+    selector_id = f"{dashboard_id}-collection_selector"
+    session = _get_session(dashboard_id)
+    if len(features) < 2 or not session.has(selector_id, "data"):
+        pytest.skip("dashboard has no collections to switch between")
+    _run(benchmark, session, selector_id, "data", {COLLECTION: features[1]["id"]})
+
+
+@pytest.mark.parametrize("dashboard_id", DASHBOARD_IDS)
+def test_variable_switch(benchmark, dashboard_id):
+    variables = CONFIGS[dashboard_id]["features"][0]["params"].get("variables", [])
+    if "timeplots" not in CONFIGS[dashboard_id].get("components", {}):
+        pytest.skip("dashboard has no time plots")
+    if len(variables) < 2:
+        pytest.skip("collection has no variables to switch between")
+    session = _get_session(dashboard_id)
+    selector_id = f"{dashboard_id}-variable_selector"
+    _run(benchmark, session, selector_id, "data", {"selected_var": variables[1]})
+
+
+@pytest.mark.parametrize("dashboard_id", DASHBOARD_IDS)
+def test_timeseries_zoom(benchmark, dashboard_id):
+    if "timeplots" not in CONFIGS[dashboard_id].get("components", {}):
+        pytest.skip("dashboard has no time plots")
+    session = _get_session(dashboard_id)
+    general_id = f"{dashboard_id}-{GENERAL_STORE_ID}"
+    timeplots_id = f"{dashboard_id}-{TIMEPLOTS_ID}"
+    # shows the time plot of the default collection
+    session.trigger(general_id, "data", session.get(general_id, "data"), depth=1)
+    times = None
+    for component in session.layout._traverse():
+        if getattr(component, "id", None) == timeplots_id:
+            times = np.asarray(component.figure["data"][0]["x"], dtype="datetime64[ns]")
+    if times is None or len(times) < 2:
+        pytest.skip("time plot has no values")
+    start, end = times.min(), times.max()
+    relayout_data = {
+        "xaxis.range[0]": str(start + (end - start) // 3),
+        "xaxis.range[1]": str(start + 2 * (end - start) // 3),
+    }
+    _run(benchmark, session, timeplots_id, "relayoutData", relayout_data)
@@ -0,0 +1,95 @@
+import argparse
+import os
+import sys
+import time
+from typing import List
+
+from doors_dashboards.configreader import get_blocked_ids
+from doors_dashboards.configreader import get_dashboard_ids
+from doors_dashboards.configreader import read_config
+from doors_dashboards.core.constants import LOG
+from doors_dashboards.core.featurecache import CACHE_DIR_ENV_VAR
+from doors_dashboards.core.featurecache import FeatureCache
+from doors_dashboards.core.featurehandler import FeatureHandler
+
+
+def _get_requested_dashboard_ids(dashboard_ids: List[str]) -> List[str]:
+    if dashboard_ids:
+        return dashboard_ids
+    blocked_ids = get_blocked_ids()
+    return [d for d in get_dashboard_ids() if d not in blocked_ids]
+
+
+def _get_collection_ids(dashboard_ids: List[str]) -> List[str]:
+    collection_ids = []
+    for dashboard_id in dashboard_ids:
+        config = read_config(dashboard_id)
+        collection_ids.extend(f["id"] for f in config.get("features", []))
+    return collection_ids
+
+
+def warm(feature_cache: FeatureCache, dashboard_ids: List[str]):
+    for dashboard_id in _get_requested_dashboard_ids(dashboard_ids):
+        config = read_config(dashboard_id)
+        feature_handler = FeatureHandler(
+            config.get("features"), config.get("eez"), feature_cache
+        )
+        for collection in feature_handler.get_collections():
+            start = time.perf_counter()
+            try:
+                gdf = feature_handler.get_df(collection)
+            except Exception as e:
+                print(f"{dashboard_id}/{collection}: failed ({e})")
+                continue
+            duration = time.perf_counter() - start
+            print(f"{dashboard_id}/{collection}: {len(gdf)} rows in {duration:.2f}s")
+        feature_handler.close()
+
+
+def info(feature_cache: FeatureCache, dashboard_ids: List[str]):
+    collection_ids = _get_collection_ids(dashboard_ids) if dashboard_ids else None
+    total_bytes = 0
+    for entry in feature_cache.get_entries():
+        if collection_ids is not None and entry.get("id") not in collection_ids:
+            continue
+        age = time.time() - entry.get("created", 0)
+        total_bytes += entry.get("bytes", 0)
+        print(
+            f"{entry.get('id')} ({entry.get('type')}, eez: {entry.get('eez')}): "
+            f"{entry.get('rows')} rows, {entry.get('bytes', 0) / 1024:.1f} KiB, "
+            f"{age / 3600:.1f} h old"
+        )
+    print(f"Total: {total_bytes / (1024 * 1024):.2f} MiB in {feature_cache.cache_dir}")
+
+
+def evict(feature_cache: FeatureCache, dashboard_ids: List[str]):
+    collection_ids = _get_collection_ids(dashboard_ids) if dashboard_ids else None
+    num_evicted = feature_cache.evict_collections(collection_ids)
+    print(f"Evicted {num_evicted} cache entries")
+
+
+_COMMANDS = {"warm": warm, "info": info, "evict": evict}
+
+
+def main(args: List[str] = None):
+    parser = argparse.ArgumentParser(
+        description="Warm, inspect or evict the feature cache of the dashboards. "
+        f"The cache location is read from the environment variable "
+        f"'{CACHE_DIR_ENV_VAR}'."
+    )
+    parser.add_argument("command", choices=list(_COMMANDS.keys()))
+    parser.add_argument(
+        "dashboard_ids",
+        nargs="*",
+        help="Dashboards to consider. Default: all dashboards that are not blocked.",
+    )
+    parsed_args = parser.parse_args(args)
+    LOG.setLevel(os.getenv("DOORS_LOG_LEVEL", "INFO").upper())
+    feature_cache = FeatureCache.from_env()
+    if feature_cache is None:
+        raise ValueError(f"Environment variable '{CACHE_DIR_ENV_VAR}' must be set")
+    _COMMANDS[parsed_args.command](feature_cache, parsed_args.dashboard_ids)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
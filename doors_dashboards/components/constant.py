@@ -16,4 +16,5 @@ GENERAL_STORE_ID = "general"
 GROUPS_SECTION = "groups"
 GROUP = "group"
 MAIN_GROUP = "main_group"
+VERSION = "version"
 SCATTER_FONT_SIZE = "18"
@@ -1,4 +1,3 @@
-from dash import callback
 from dash import dcc
 from dash import html
 from dash import Input
@@ -27,6 +26,8 @@ from doors_dashboards.components.constant import (
 )
 from doors_dashboards.core.dashboardcomponent import DashboardComponent
 from doors_dashboards.core.featurehandler import FeatureHandler
+from doors_dashboards.core.metrics import callback
+from doors_dashboards.core.singleflight import SingleFlight
 
 BASE_PARAMS = {"format": "png"}
 COMPONENT_STORE_ID = "meteogram_component_store"
@@ -58,6 +59,7 @@ class MeteogramComponent(DashboardComponent):
         self._feature_handler = None
         self._meteogram_image = None
         self._previous_images = dict()
+        self._image_loads = SingleFlight()
         self._dashboard_id = dashboard_id
 
     def get(
@@ -136,6 +138,15 @@ class MeteogramComponent(DashboardComponent):
     ) -> html.Img:
         params = self._get_params(lon, lat, meteogram_type, time)
         key = ",".join(str(e) for e in list(params.values()))
+        image = self._previous_images.get(key)
+        if image is None:
+            # concurrent requests for the same meteogram query ECMWF only once
+            image = self._image_loads.do(
+                key, lambda: self._load_meteogram_image(key, params)
+            )
+        return image
+
+    def _load_meteogram_image(self, key: str, params: Dict) -> Component:
         if key in self._previous_images:
             return self._previous_images[key]
         response = requests.get(METEOGRAM_ENDPOINT, params=params, headers=HEADERS)
@@ -257,6 +268,7 @@ class MeteogramComponent(DashboardComponent):
             Input(f"{dashboard_id}-{GENERAL_STORE_ID}", "data"),
             Input(COMPONENT_STORE_ID, "data"),
             State(COMPONENT_STORE_ID, "data"),
+            dashboard_id=self._dashboard_id,
         )
         def update_meteogram_image(general_data, component_data, component_state_data):
             if general_data is not None:
@@ -305,6 +317,7 @@ class MeteogramComponent(DashboardComponent):
                 for dropdown_id in list(METEOGRAM_TYPE_TO_ID.values())
             ],
             prevent_initial_call=True,
+            dashboard_id=self._dashboard_id,
         )
         def selector_to_temp_store(*timestamps):
             clicked_index = timestamps.index(
@@ -323,6 +336,7 @@ class MeteogramComponent(DashboardComponent):
             Output(METEOGRAM_CHOOSER_ID, "label"),
             Input(COMPONENT_STORE_ID, "data"),
             prevent_initial_call=True,
+            dashboard_id=self._dashboard_id,
         )
         def component_store_to_drp_label(component_data):
             if component_data is None:
@@ -337,6 +351,7 @@ class MeteogramComponent(DashboardComponent):
             Input(METEOGRAM_DATE_PICKER_ID, "date"),
             State(COMPONENT_STORE_ID, "data"),
             prevent_initial_call=True,
+            dashboard_id=self._dashboard_id,
         )
         def datepicker_to_component_store(date_value, component_data):
             component_data = component_data or {}
@@ -354,6 +369,7 @@ class MeteogramComponent(DashboardComponent):
             Input(TEMP_STORE_ID, "data"),
             State(COMPONENT_STORE_ID, "data"),
             prevent_initial_call=True,
+            dashboard_id=self._dashboard_id,
         )
         def temp_to_component_store(temp_data, component_data):
             if temp_data is None:
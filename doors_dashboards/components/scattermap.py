@@ -1,10 +1,13 @@
-from dash import callback, html
+from dash import html
 from dash import Input
 from dash import no_update
 from dash import Output
+from dash import Patch
 from dash import State
 from dash import dcc
 from dash.development.base_component import Component
+import flask
+import json
 import math
 import matplotlib
 import numpy as np
@@ -13,9 +16,12 @@ from PIL import Image
 import plotly.graph_objs as go
 import random
 import requests
-from shapely.geometry import Point
+import threading
+import time
+import urllib.parse
 from typing import Dict
 from typing import List
+from typing import Optional
 from typing import Tuple
 
 # import numpy as np
@@ -32,8 +38,13 @@ from doors_dashboards.components.constant import (
     MAIN_GROUP,
     GROUP,
 )
+from doors_dashboards.core.constants import LOG
 from doors_dashboards.core.dashboardcomponent import DashboardComponent
 from doors_dashboards.core.featurehandler import FeatureHandler
+from doors_dashboards.core.metrics import callback
+from doors_dashboards.core.tilecache import DEFAULT_TILE_CACHE_MAX_AGE
+from doors_dashboards.core.tilecache import TileCache
+from doors_dashboards.core.tracer import trace
 
 DEFAULT_COLOR_RANGE = "viridis"
 DEFAULT_SELECTION_COLOR = "#CC0000"
@@ -42,6 +53,10 @@ DEFAULT_SELECTION_SIZE = 17
 HEADERS = {"accept": "application/json"}
 SELECTION_COLOR = DEFAULT_SELECTION_COLOR
 SELECTION_SIZE = DEFAULT_SELECTION_SIZE
+SELECTION_TRACE_NAME = "Selected"
+VERSION_STORE_ID = "scattermap-version"
+# size of the map in pixels assumed when the client does not send its extent
+VIEWPORT_SIZE = 1000
 
 TILE_VALUE_SETS = {
     1: {
@@ -99,25 +114,67 @@ TILE_ZOOM_LEVEL = 6
 XCUBE_COLOR_BAR_URL = "https://doors.api.brockmann-consult.de/api/colorbars"
 
 
-def get_color_bars():
-    response = requests.get(XCUBE_COLOR_BAR_URL, headers=HEADERS)
-    if response.status_code == 200:
-        return response.json()
+# increase when the cached color bars are not valid anymore
+COLOR_BARS_CACHE_VERSION = 1
+COLOR_BARS_MAX_AGE = 24 * 60 * 60
+# color bars that could not be fetched are not asked for again within this period
+COLOR_BARS_RETRY_PERIOD = 5 * 60
+
+_COLOR_BARS = None
+_COLOR_BARS_FAILURE_TIME = None
+_COLOR_MAP_IMAGES = {}
+_COLOR_BARS_LOCK = threading.Lock()
 
 
-XCUBE_COLOR_BARS = get_color_bars()
+def _is_color_bars_fetch_due() -> bool:
+    return (
+        _COLOR_BARS_FAILURE_TIME is None
+        or time.monotonic() - _COLOR_BARS_FAILURE_TIME >= COLOR_BARS_RETRY_PERIOD
+    )
 
 
-def get_color_map_image_stream(var_name: str):
+def get_color_bars() -> Optional[List]:
+    # color bars are fetched when first needed, so that importing this module
+    # does not depend on the network
+    global _COLOR_BARS, _COLOR_BARS_FAILURE_TIME
+    with _COLOR_BARS_LOCK:
+        if _COLOR_BARS is not None or not _is_color_bars_fetch_due():
+            return _COLOR_BARS
+    # the tile cache fetches concurrent requests once, other callers are not
+    # kept waiting for the lock meanwhile
+    with trace("fetch color bars"):
+        color_bars = get_tile_cache().get(
+            f"{XCUBE_COLOR_BAR_URL}?v={COLOR_BARS_CACHE_VERSION}",
+            lambda: _fetch(XCUBE_COLOR_BAR_URL),
+            max_age=COLOR_BARS_MAX_AGE,
+        )
+    try:
+        color_bars = json.loads(color_bars) if color_bars is not None else None
+    except ValueError as e:
+        LOG.warning(f"Could not read color bars: {e}")
+        color_bars = None
+    with _COLOR_BARS_LOCK:
+        if color_bars is not None:
+            _COLOR_BARS = color_bars
+        elif _COLOR_BARS is None:
+            _COLOR_BARS_FAILURE_TIME = time.monotonic()
+        return _COLOR_BARS
+
+
+def get_color_map_image(var_name: str) -> Optional[Image.Image]:
     bd = BACKGROUND_DEFINITONS.get(var_name)
     cm_name = bd.get("colormap")
-    for color_bar_group in XCUBE_COLOR_BARS:
+    if cm_name in _COLOR_MAP_IMAGES:
+        return _COLOR_MAP_IMAGES[cm_name]
+    for color_bar_group in get_color_bars() or []:
         for color_bar in color_bar_group[2]:
             if color_bar[0] == cm_name:
-                cbar_png_str = color_bar[1]
-                cbar_png_bytes = base64.b64decode(cbar_png_str)
-                stream = io.BytesIO(cbar_png_bytes)
-                return stream
+                cbar_png_bytes = base64.b64decode(color_bar[1])
+                with io.BytesIO(cbar_png_bytes) as stream:
+                    image = Image.open(stream)
+                    image.load()
+                _COLOR_MAP_IMAGES[cm_name] = image
+                return image
 
 
 XCUBE_SERVER_BASE_TILE_URL = "https://doors.api.brockmann-consult.de/api/tiles/{0}/{1}/{2}/{3}/{4}?vmin={5}&vmax={6}&cbar={7}&time={8}"
@@ -153,40 +210,118 @@ BACKGROUND_DEFINITONS = {
 }
 
 
-def get_time_coords(var_name: str) -> List[str]:
+TILE_PROXY_ROUTE = "/background-tiles"
+# new time steps are looked up at most once per period
+TIME_COORDS_MAX_AGE = 60 * 60
+
+_TILE_CACHE = None
+_TILE_CACHE_LOCK = threading.Lock()
+
+
+def get_tile_cache() -> TileCache:
+    global _TILE_CACHE
+    with _TILE_CACHE_LOCK:
+        if _TILE_CACHE is None:
+            _TILE_CACHE = TileCache.from_env()
+        return _TILE_CACHE
+
+
+def _fetch(url: str) -> Optional[bytes]:
+    try:
+        response = requests.get(url, headers=HEADERS, timeout=30)
+    except requests.RequestException as e:
+        LOG.warning(f"Could not fetch '{url}': {e}")
+        return None
+    if response.status_code == 200:
+        return response.content
+    LOG.warning(f"Could not fetch '{url}': status {response.status_code}")
+    return None
+
+
+def get_time_coords(var_name: str) -> Optional[List[str]]:
     bd = BACKGROUND_DEFINITONS.get(var_name)
     time_url = XCUBE_SERVER_BASE_TIME_URL.format(bd["dataset_name"])
-    response = requests.get(time_url, headers=HEADERS)
-    if response.status_code == 200:
-        return response.json().get("coordinates")
+    time_coords = get_tile_cache().get(
+        time_url, lambda: _fetch(time_url), max_age=TIME_COORDS_MAX_AGE
+    )
+    if time_coords is not None:
+        return json.loads(time_coords).get("coordinates")
 
 
-def get_last_time_coord(var_name: str) -> List[str]:
-    return get_time_coords(var_name)[-1]
+def get_last_time_coord(var_name: str) -> Optional[str]:
+    time_coords = get_time_coords(var_name)
+    return time_coords[-1] if time_coords else None
 
 
-def get_background_image_layers(var_name: str) -> List[Dict]:
+def get_tile(var_name: str, z: int, y: int, x: int, time: str) -> Optional[bytes]:
     bd = BACKGROUND_DEFINITONS.get(var_name)
+    tile_url = XCUBE_SERVER_BASE_TILE_URL.format(
+        bd["dataset_name"],
+        bd["variable_name"],
+        z,
+        y,
+        x,
+        bd["vmin"],
+        bd["vmax"],
+        bd["colormap"],
+        urllib.parse.quote(time, safe=""),
+    )
+    # the tile for a time step does not change, so it is fetched only once
+    return get_tile_cache().get(tile_url, lambda: _fetch(tile_url))
+
+
+def _is_tile_in_range(z: int, y: int, x: int) -> bool:
+    tvs = TILE_VALUE_SETS.get(z)
+    return (
+        tvs is not None
+        and tvs["lat_start_index"] <= y <= tvs["lat_end_index"]
+        and tvs["lon_start_index"] <= x <= tvs["lon_end_index"]
+    )
+
+
+def register_tile_proxy(server: flask.Flask):
+    # background tiles and time coordinates are served from the local cache
+    @server.route(f"{TILE_PROXY_ROUTE}/<var_name>/<int:z>/<int:y>/<int:x>")
+    def get_background_tile(var_name: str, z: int, y: int, x: int):
+        if var_name not in BACKGROUND_DEFINITONS or not _is_tile_in_range(z, y, x):
+            flask.abort(404)
+        # only tiles the dashboards request are proxied, so clients cannot fill
+        # the cache with arbitrary upstream responses
+        time_coords = get_time_coords(var_name)
+        if time_coords is None:
+            flask.abort(502)
+        time = flask.request.args.get("time")
+        if time not in time_coords:
+            flask.abort(404)
+        tile = get_tile(var_name, z, y, x, time)
+        if tile is None:
+            flask.abort(502)
+        response = flask.Response(tile, mimetype="image/png")
+        response.cache_control.max_age = DEFAULT_TILE_CACHE_MAX_AGE
+        return response
+
+    @server.route(f"{TILE_PROXY_ROUTE}/<var_name>/times")
+    def get_background_times(var_name: str):
+        if var_name not in BACKGROUND_DEFINITONS:
+            flask.abort(404)
+        time_coords = get_time_coords(var_name)
+        if time_coords is None:
+            flask.abort(502)
+        return flask.jsonify(time_coords)
+
+
+def get_background_image_layers(var_name: str, time: str) -> List[Dict]:
     image_layers = []
     tvs = TILE_VALUE_SETS.get(TILE_ZOOM_LEVEL)
-    time = get_last_time_coord(var_name)
     for lat_index in range(tvs["lat_start_index"], tvs["lat_end_index"] + 1):
         lat_0 = 90 - (lat_index * tvs["resolution"])
         lat_1 = lat_0 - tvs["resolution"]
         for lon_index in range(tvs["lon_start_index"], tvs["lon_end_index"] + 1):
             lon_0 = -180 + (lon_index * tvs["resolution"])
             lon_1 = lon_0 + tvs["resolution"]
-            # time = "2024-06-29T00%3A00%3A00Z"
-            img = XCUBE_SERVER_BASE_TILE_URL.format(
-                bd["dataset_name"],
-                bd["variable_name"],
-                TILE_ZOOM_LEVEL,
-                lat_index,
-                lon_index,
-                bd["vmin"],
-                bd["vmax"],
-                bd["colormap"],
-                time,
+            img = (
+                f"{TILE_PROXY_ROUTE}/{var_name}/{TILE_ZOOM_LEVEL}/{lat_index}/"
+                f"{lon_index}?{urllib.parse.urlencode(dict(time=time))}"
             )
             coordinates = [
                 [lon_0, lat_0],
@@ -205,9 +340,8 @@ def get_background_image_layers(var_name: str) -> List[Dict]:
     return image_layers
 
 
-def get_annotations(var_name: str):
+def get_annotations(var_name: str, time: str):
     bd = BACKGROUND_DEFINITONS.get(var_name)
-    time = get_last_time_coord(var_name)
     annotations = [
         dict(
             x=0.02,
@@ -250,11 +384,11 @@ def get_center(
         lons: List[float],
         lats: List[float],
 ) -> (Tuple)[float, float]:
-    valid_lats = [lat for lat in lats if lat is not None]
-    valid_lons = [lon for lon in lons if lon is not None]
-    center_lon = min(valid_lons) + (max(valid_lons) - min(valid_lons)) / 2
-    center_lat = min(valid_lats) + (max(valid_lats) - min(valid_lats)) / 2
-    return center_lon, center_lat
+    lons = np.asarray(lons, dtype=float)
+    lats = np.asarray(lats, dtype=float)
+    center_lon = np.nanmin(lons) + (np.nanmax(lons) - np.nanmin(lons)) / 2
+    center_lat = np.nanmin(lats) + (np.nanmax(lats) - np.nanmin(lats)) / 2
+    return float(center_lon), float(center_lat)
 
 
 def get_zoom_level(
@@ -263,14 +397,9 @@ def get_zoom_level(
         center_lon: float,
         center_lat: float,
 ) -> float:
-    valid_coords = [
-        (lat, lon)
-        for lat, lon in zip(lats, lons)
-        if lat is not None and lon is not None
-    ]
-    max_distance = max(
-        abs(lat - center_lat) + abs(lon - center_lon) for lat, lon in valid_coords
-    )
+    lons = np.asarray(lons, dtype=float)
+    lats = np.asarray(lats, dtype=float)
+    max_distance = np.nanmax(np.abs(lats - center_lat) + np.abs(lons - center_lon))
     log = math.log(max_distance, 2) if max_distance > 0 else 0
     zoom_level = math.floor(8 - log)
     return zoom_level
@@ -291,10 +420,47 @@ class ScatterMapComponent(DashboardComponent):
     def __init__(self, dashboard_id: str = None):
         self.feature_handler = None
         self._dashboard_id = dashboard_id
+        self._sub_config = {}
+        self._colors = {}
+        # the serialized base figure together with the feature handler
+        # version it has been created for
+        self._base_figure = None
+        self._base_figure_lock = threading.Lock()
+        # indexes of the traces of polygon collections in the base figure
+        self._polygon_traces = {}
 
     def get(
             self, sub_component: str, sub_component_id: str, sub_config: Dict
     ) -> Component:
+        self._sub_config = sub_config
+        version, figure = self._get_base_figure()
+
+        scattermap_graph = dcc.Graph(
+            id=sub_component_id, figure=figure, style={"height": "81.5vh"}
+        )
+        version_store = dcc.Store(
+            id=f"{self._dashboard_id}-{VERSION_STORE_ID}", data=version
+        )
+
+        return html.Div(
+            [scattermap_graph, version_store],
+            style={
+                "flex": "1",
+                "padding": "20px",
+                "alignItems": "center",
+                "backgroundColor": PLOT_BGCOLOR,
+            },
+        )
+
+    def _get_base_figure(self) -> Tuple[int, Dict]:
+        version = self.feature_handler.get_version()
+        with self._base_figure_lock:
+            if self._base_figure is None or self._base_figure[0] != version:
+                figure = self._create_figure(self._sub_config)
+                self._base_figure = version, figure.to_dict()
+            return self._base_figure
+
+    def _create_figure(self, sub_config: Dict) -> go.Figure:
         mapbox_style = sub_config.get("mapbox_style", "carto-positron")
         background_variable = sub_config.get("background_variable", "")
 
@@ -302,6 +468,7 @@ class ScatterMapComponent(DashboardComponent):
 
         all_lons = []
         all_lats = []
+        polygon_traces = {}
 
         for i, collection in enumerate(self.feature_handler.get_collections()):
             geometry_type = self.feature_handler.get_geometry_type(collection)
@@ -309,9 +476,27 @@ class ScatterMapComponent(DashboardComponent):
             if geometry_type == "Point":
                 self._process_points(collection, figure, sub_config, all_lons, all_lats)
             else:
+                polygon_traces[collection] = len(figure.data)
                 self._process_polygons(
                     collection, figure, all_lons, all_lats
                 )
+        self._polygon_traces = polygon_traces
+
+        # placeholder for the selection, filled in by patches
+        figure.add_trace(
+            go.Scattermapbox(
+                lat=[],
+                lon=[],
+                text=[],
+                mode="markers",
+                marker=dict(
+                    size=SELECTION_SIZE,
+                    color=SELECTION_COLOR,
+                ),
+                name=SELECTION_TRACE_NAME,
+                showlegend=False,
+            )
+        )
 
         # Calculate the center and zoom level after processing all geometries
         center_lon, center_lat = get_center(all_lons, all_lats)
@@ -341,46 +526,38 @@ class ScatterMapComponent(DashboardComponent):
             mapbox=mapbox,
         )
 
+        background_time = None
         if background_variable in list(BACKGROUND_DEFINITONS.keys()):
-            image_layers = get_background_image_layers(background_variable)
+            background_time = get_last_time_coord(background_variable)
+        if background_time is not None:
+            image_layers = get_background_image_layers(
+                background_variable, background_time
+            )
             figure.update_layout(mapbox_layers=image_layers)
 
-            color_map_image_stream = get_color_map_image_stream(background_variable)
-            color_map_image = Image.open(color_map_image_stream)
-            figure.add_layout_image(
-                dict(
-                    source=color_map_image,
-                    xref="paper",
-                    yref="paper",
-                    x=0.2,
-                    y=-0.075,  # Positioning of the image
-                    sizex=0.75,
-                    sizey=0.5,  # Size of the image
-                    xanchor="left",
-                    yanchor="top",
+            color_map_image = get_color_map_image(background_variable)
+            if color_map_image is not None:
+                figure.add_layout_image(
+                    dict(
+                        source=color_map_image,
+                        xref="paper",
+                        yref="paper",
+                        x=0.2,
+                        y=-0.075,  # Positioning of the image
+                        sizex=0.75,
+                        sizey=0.5,  # Size of the image
+                        xanchor="left",
+                        yanchor="top",
+                    )
                 )
-            )
-            color_map_image_stream.close()
-            annotations = get_annotations(background_variable)
+            annotations = get_annotations(background_variable, background_time)
             figure.update_layout(
                 annotations=annotations,
                 margin=dict(l=0, r=0, t=0, b=100),  # Space for the color bar
             )
             figure.update_layout(mapbox=mapbox)
 
-        scattermap_graph = dcc.Graph(
-            id=sub_component_id, figure=figure, style={"height": "81.5vh"}
-        )
-
-        return html.Div(
-            scattermap_graph,
-            style={
-                "flex": "1",
-                "padding": "20px",
-                "alignItems": "center",
-                "backgroundColor": PLOT_BGCOLOR,
-            },
-        )
+        return figure
 
     def _process_points(self, collection, figure, sub_config, all_lons, all_lats):
         marker_size = sub_config.get("marker_size", 10)
@@ -394,11 +571,12 @@ class ScatterMapComponent(DashboardComponent):
         all_lons.extend(lons)
         all_lats.extend(lats)
 
-        color_index = random.randint(0, len(dark_colors) - 1)
-        color = dark_colors[color_index]
-        del dark_colors[color_index]
+        # keep the color of a collection when the figure is recreated
+        if collection not in self._colors:
+            self._colors[collection] = random.choice(dark_colors)
+        color = self._colors[collection]
 
-        if variable_values:
+        if variable_values is not None:
             color_code_config = self.feature_handler.get_color_code_config(collection)
             marker = go.scattermapbox.Marker(
                 size=marker_size,
@@ -434,9 +612,16 @@ class ScatterMapComponent(DashboardComponent):
 
     def _process_polygons(self, collection, figure, all_lons, all_lats):
         gdf = self.feature_handler.get_df(collection)
-        lons, lats, text = self.feature_handler.get_polygon_data(gdf)
-        all_lons.extend(lons)
-        all_lats.extend(lats)
+        # polygons are simplified to the zoom level they are first shown at
+        min_lon, min_lat, max_lon, max_lat = gdf.total_bounds
+        bounds_lons = [min_lon, max_lon]
+        bounds_lats = [min_lat, max_lat]
+        zoom = get_zoom_level(
+            bounds_lons, bounds_lats, *get_center(bounds_lons, bounds_lats)
+        )
+        lons, lats, text = self.feature_handler.get_polygon_data(collection, zoom)
+        all_lons.extend(bounds_lons)
+        all_lats.extend(bounds_lats)
 
         figure.add_trace(
             go.Scattermapbox(
@@ -452,6 +637,35 @@ class ScatterMapComponent(DashboardComponent):
             )
         )
 
+    @staticmethod
+    def _get_viewport_bounds(
+        relayout_data: Dict,
+    ) -> Optional[Tuple[float, float, float, float]]:
+        coordinates = relayout_data.get("mapbox._derived", {}).get("coordinates")
+        if coordinates:
+            lons = [coordinate[0] for coordinate in coordinates]
+            lats = [coordinate[1] for coordinate in coordinates]
+            min_lon, max_lon = min(lons), max(lons)
+            min_lat, max_lat = min(lats), max(lats)
+        elif "mapbox.center" in relayout_data:
+            center = relayout_data["mapbox.center"]
+            half_size = (
+                360 / (256 * 2 ** relayout_data["mapbox.zoom"]) * VIEWPORT_SIZE / 2
+            )
+            min_lon, max_lon = center["lon"] - half_size, center["lon"] + half_size
+            min_lat, max_lat = center["lat"] - half_size, center["lat"] + half_size
+        else:
+            return None
+        # polygons next to the viewport are included, so panning shows no gaps
+        lon_margin = (max_lon - min_lon) / 2
+        lat_margin = (max_lat - min_lat) / 2
+        return (
+            min_lon - lon_margin,
+            min_lat - lat_margin,
+            max_lon + lon_margin,
+            max_lat + lat_margin,
+        )
+
     def set_feature_handler(self, feature_handler: FeatureHandler):
         self.feature_handler = feature_handler
 
@@ -461,6 +675,7 @@ class ScatterMapComponent(DashboardComponent):
             Input("scattermap", "clickData"),
             State(f"{dashboard_id}-{GENERAL_STORE_ID}", "data"),
             prevent_initial_call=True,
+            dashboard_id=self._dashboard_id,
         )
         def update_general_store_after_point_selection(click_data, general_data):
             if click_data is None:
@@ -475,9 +690,7 @@ class ScatterMapComponent(DashboardComponent):
                 general_data[GROUPS_SECTION] = {}
             lon = click_data["points"][0]["lon"]
             lat = click_data["points"][0]["lat"]
-            p = Point(lon, lat)
-            gdf = self.feature_handler.get_df(collection_name)
-            gdf = gdf[gdf["geometry"].geom_equals(p)]
+            gdf = self.feature_handler.get_df_at_point(collection_name, lon, lat)
             levels = self.feature_handler.get_levels(collection_name)
             text = click_data["points"][0]["text"]
             general_data["selected_data"] = {
@@ -501,28 +714,54 @@ class ScatterMapComponent(DashboardComponent):
 
         @callback(
             Output("scattermap", "figure", allow_duplicate=True),
+            Input("scattermap", "relayoutData"),
+            State(f"{dashboard_id}-{VERSION_STORE_ID}", "data"),
+            prevent_initial_call=True,
+            dashboard_id=self._dashboard_id,
+        )
+        def update_polygon_detail(relayout_data, shown_version):
+            if (
+                not self._polygon_traces
+                or not relayout_data
+                or "mapbox.zoom" not in relayout_data
+            ):
+                return no_update
+            zoom = relayout_data["mapbox.zoom"]
+            bounds = self._get_viewport_bounds(relayout_data)
+            # the level of detail of polygons follows the zoom level, only
+            # polygons within the viewport are sent
+            patched_figure = Patch()
+            for collection, trace_index in self._polygon_traces.items():
+                lons, lats, text = self.feature_handler.get_polygon_data(
+                    collection, zoom, bounds
+                )
+                patched_figure["data"][trace_index]["lon"] = lons
+                patched_figure["data"][trace_index]["lat"] = lats
+                patched_figure["data"][trace_index]["text"] = text
+                LOG.debug(
+                    f"Showing {len(lons)} vertices of collection '{collection}' "
+                    f"at zoom level {zoom:.1f} in dashboard '{dashboard_id}'"
+                )
+            return patched_figure
+
+        @callback(
+            Output("scattermap", "figure", allow_duplicate=True),
+            Output(f"{dashboard_id}-{VERSION_STORE_ID}", "data"),
             [Input(f"{dashboard_id}-{GENERAL_STORE_ID}", "data")],
-            State("scattermap", "figure"),
+            State(f"{dashboard_id}-{VERSION_STORE_ID}", "data"),
             prevent_initial_call=True,
+            dashboard_id=self._dashboard_id,
         )
-        def update_selected_dropdown_point_on_scattermap(general_data, current_figure):
+        def update_selected_dropdown_point_on_scattermap(general_data, shown_version):
             if COLLECTION not in general_data:
-                return no_update
+                return no_update, no_update
 
             collection_name = general_data[COLLECTION]
             df = self.feature_handler.get_df(collection_name)
             label = self.feature_handler.get_label(collection_name)
             if label is None:
-                if isinstance(current_figure, dict) and "data" in current_figure:
-                    current_figure = go.Figure(current_figure)
-                    current_figure["data"] = [
-                        trace
-                        for trace in current_figure["data"]
-                        if not trace["name"].startswith("Selected")
-                    ]
-                    return current_figure
-
-            if "selected_data" in general_data:
+                lon, lat, text = [], [], []
+            elif "selected_data" in general_data:
                 selected_data = general_data.get("selected_data", {})
                 lon = selected_data.get("lon")
                 lat = selected_data.get("lat")
@@ -540,6 +779,8 @@ class ScatterMapComponent(DashboardComponent):
                     group_values = self.feature_handler.get_nested_level_values(
                         collection_name
                     )
+                    if not group_values:
+                        return no_update, no_update
                     if isinstance(group_values, dict):
                         default_key = list(group_values.keys())[0]
                         group_value = default_key
@@ -554,30 +795,34 @@ class ScatterMapComponent(DashboardComponent):
                 lon = list(geometries[0])
                 lat = list(geometries[1])
                 text = [group_value] * len(lon)
-                general_data["selected_data"] = {"lon": lon, "lat": lat, "label": text}
 
             if lon is None or lat is None:
-                return no_update
-
-            highlighted_trace = go.Scattermapbox(
-                lat=lat,
-                lon=lon,
-                text=text,
-                mode="markers",
-                marker=dict(
-                    size=SELECTION_SIZE,
-                    color=SELECTION_COLOR,
-                ),
-                name=f"Selected {label.title()}",
-            )
-
-            if isinstance(current_figure, dict) and "data" in current_figure:
-                new_traces = []
-                for trace in current_figure["data"]:
-                    if not trace["name"].startswith("Selected"):
-                        trace["selectedpoints"] = []
-                        new_traces.append(trace)
-                current_figure["data"] = new_traces
-                current_figure = go.Figure(current_figure)
-                current_figure.add_trace(highlighted_trace)
-                return current_figure
+                return no_update, no_update
+
+            version, base_figure = self._get_base_figure()
+            # only the parts of the figure that change are sent to the client,
+            # the traces of all collections are sent again only when the
+            # features have changed since they have been shown
+            patched_figure = Patch()
+            features_changed = version != shown_version
+            if features_changed:
+                traces = [dict(trace) for trace in base_figure["data"]]
+            else:
+                traces = patched_figure["data"]
+            num_collection_traces = len(base_figure["data"]) - 1
+            for i in range(num_collection_traces):
+                traces[i]["selectedpoints"] = []
+            selection_trace = traces[num_collection_traces]
+            selection_trace["lat"] = lat
+            selection_trace["lon"] = lon
+            selection_trace["text"] = text
+            if label is None:
+                selection_trace["name"] = SELECTION_TRACE_NAME
+                selection_trace["showlegend"] = False
+            else:
+                selection_trace["name"] = f"{SELECTION_TRACE_NAME} {label.title()}"
+                selection_trace["showlegend"] = True
+            if not features_changed:
+                return patched_figure, no_update
+            patched_figure["data"] = traces
+            return patched_figure, version
@@ -1,4 +1,5 @@
-from dash import callback
+from dash import ALL
+from dash import ctx
 from dash import dash
 from dash import dcc
 from dash import html
@@ -9,9 +10,10 @@ from dash import State
 from dash.development.base_component import Component
 import dash_bootstrap_components as dbc
 import plotly.express as px
+from typing import Any
 from typing import Dict
 from typing import List
-from typing import Tuple
+from typing import Optional
 
 from doors_dashboards.components.constant import (
     COLLECTION,
@@ -27,249 +29,152 @@ from doors_dashboards.components.constant import (
 )
 from doors_dashboards.core.dashboardcomponent import DashboardComponent
 from doors_dashboards.core.featurehandler import FeatureHandler
+from doors_dashboards.core.metrics import callback
 
 DISPLAY_STYLE = {"height": "35vh"}
-GROUP_DROP_OPTION_TEMPLATE = "group_drp_option_{0}_{1}_{2}"
-MAIN_GROUP_DROP_OPTION_TEMPLATE = "main_group_drp_option_{0}_{1}"
-GROUP_DROPDOWN_TEMPLATE = "group_drp_option_{0}_{1}"
-MAIN_GROUP_DROPDOWN_TEMPLATE = "main_group_drp_option_{0}"
-MAIN_GROUP_DROPDOWN_OFFSET = MAIN_GROUP_DROPDOWN_TEMPLATE.index("{")
-
-LINE_VAR_DROPDOWN_ID_TEMPLATE = "line_var_drop_down_id_{0}"  # collection
-LINE_VAR_DROPDOWN_OFFSET = LINE_VAR_DROPDOWN_ID_TEMPLATE.index("{")
-POINT_X_VAR_DROPDOWN_ID_TEMPLATE = "point_x_var_drop_down_id_{0}"  # collection
-POINT_X_VAR_DROPDOWN_OFFSET = POINT_X_VAR_DROPDOWN_ID_TEMPLATE.index("{")
-POINT_Y_VAR_DROPDOWN_ID_TEMPLATE = "point_y_var_drop_down_id_{0}"  # collection
-POINT_Y_VAR_DROPDOWN_OFFSET = POINT_Y_VAR_DROPDOWN_ID_TEMPLATE.index("{")
-LINE_VAR_DROP_OPTION_TEMPLATE = "line_var_drop_option_id_{0}_{1}"  # collection variable
-POINT_X_VAR_DROP_OPTION_TEMPLATE = (
-    "point_x_var_drop_option_id_{0}_{1}"  # collection variable
-)
-POINT_Y_VAR_DROP_OPTION_TEMPLATE = (
-    "point_y_var_drop_option_id_{0}_{1}"  # collection variable
-)
+MENU_TYPE = "scatterplot-menu"
+OPTION_TYPE = "scatterplot-option"
 
 ALL_GROUP_MEMBERS = "all"
 COLLAPSE = "collapse_id"
 COMPONENT_STORE_ID = "scatterplot_component_store"
 LINE_VARIABLE = "line_variable"
+OPTIONS_STORE_ID = "scatterplot_options_store"
 TEMP_STORE_ID = "scatterplot_temp_store"
 VARIABLES_SECTION = "variables"
 X_VARIABLE = "x_variable"
 Y_VARIABLE = "y_variable"
 
+# the roles of the dropdown menus, in the order they appear in the layout
+MENU_ROLES = [MAIN_GROUP, LINE_VARIABLE, GROUP, X_VARIABLE, Y_VARIABLE]
+
+
+def get_menu_id(dashboard_id: str, role: Any) -> Dict[str, Any]:
+    return {"type": MENU_TYPE, "dashboard": dashboard_id, "role": role}
+
+
+def _get_id_value(value: Any) -> Any:
+    # dash only accepts strings, numbers and bools in dict ids, level values
+    # may be numpy scalars
+    if value is ALL:
+        return value
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def get_option_id(dashboard_id: str, role: Any, value: Any) -> Dict[str, Any]:
+    return {
+        "type": OPTION_TYPE,
+        "dashboard": dashboard_id,
+        "role": role,
+        "value": _get_id_value(value),
+    }
+
 
 class ScatterplotComponent(DashboardComponent):
 
     def __init__(self, dashboard_id: str = None):
         self.feature_handler = None
-        self.group_dropdown_menus = dict()
-        self.group_drop_options = dict()
-        self.main_group_dropdown_menus = dict()
-        self.main_group_drop_options = dict()
-
-        self.line_dropdown_menus = dict()
-        self.xvar_drop_options = dict()
-        self.point_x_dropdown_menus = dict()
-        self.point_x_drop_options = dict()
-        self.point_y_dropdown_menus = dict()
-        self.point_y_drop_options = dict()
-        self._encodings = dict()
         self._dashboard_id = dashboard_id
 
     def set_feature_handler(self, feature_handler: FeatureHandler):
         self.feature_handler = feature_handler
 
+    def _get_menu_items(self, role: str, values: List) -> List[dbc.DropdownMenuItem]:
+        return [
+            dbc.DropdownMenuItem(
+                value,
+                id=get_option_id(self._dashboard_id, role, value),
+                style={"fontSize": "larger", "fontFamily": FONT_FAMILY},
+            )
+            for value in values
+        ]
+
     @staticmethod
+    def _get_menu_style(values: List) -> Dict[str, str]:
+        return {"fontFamily": FONT_FAMILY, "display": "block" if values else "none"}
+
     def _get_dropdown_menu(
-        dropdown_id: str, items: List[dbc.DropdownMenuItem], default: str
+        self, role: str, values: List, default: Any
     ) -> dbc.DropdownMenu:
         return dbc.DropdownMenu(
-            id=dropdown_id,
+            id=get_menu_id(self._dashboard_id, role),
             label=default,
-            children=items,
-            style={"fontFamily": FONT_FAMILY, "display": "none"},
+            children=self._get_menu_items(role, values),
+            style=self._get_menu_style(values),
             color="secondary",
         )
 
-    def _setup_variable_dropdown_menus(self):
-        collections = self.feature_handler.get_collections()
-        for collection in collections:
-            variables = self.feature_handler.get_variables(collection)
-            line_drop_menu_items = []
-            point_x_drop_menu_items = []
-            point_y_drop_menu_items = []
-            for variable in variables:
-                line_drop_option_id = LINE_VAR_DROP_OPTION_TEMPLATE.format(
-                    collection, variable
-                )
-                point_x_drop_option_id = POINT_X_VAR_DROP_OPTION_TEMPLATE.format(
-                    collection, variable
-                )
-                point_y_drop_option_id = POINT_Y_VAR_DROP_OPTION_TEMPLATE.format(
-                    collection, variable
-                )
-                line_drop_option = dbc.DropdownMenuItem(
-                    variable,
-                    id=line_drop_option_id,
-                    n_clicks=1,
-                    style={"fontSize": "larger", "fontfamily": FONT_FAMILY},
-                )
-                point_x_drop_option = dbc.DropdownMenuItem(
-                    variable,
-                    id=point_x_drop_option_id,
-                    n_clicks=1,
-                    style={"fontSize": "larger", "fontfamily": FONT_FAMILY},
-                )
-                point_y_drop_option = dbc.DropdownMenuItem(
-                    variable,
-                    id=point_y_drop_option_id,
-                    n_clicks=1,
-                    style={"fontSize": "larger", "fontfamily": FONT_FAMILY},
-                )
-                self.xvar_drop_options[line_drop_option_id] = line_drop_option
-                self.point_x_drop_options[point_x_drop_option_id] = point_x_drop_option
-                self.point_y_drop_options[point_y_drop_option_id] = point_y_drop_option
-                line_drop_menu_items.append(line_drop_option)
-                point_x_drop_menu_items.append(point_x_drop_option)
-                point_y_drop_menu_items.append(point_y_drop_option)
-            line_dropdown_id = self.encode_linevar_dropdown(collection)
-            point_x_dropdown_id = self.encode_xvar_dropdown(collection)
-            point_y_dropdown_id = self.encode_yvar_dropdown(collection)
-            self.line_dropdown_menus[line_dropdown_id] = self._get_dropdown_menu(
-                line_dropdown_id, line_drop_menu_items, variables[0]
-            )
-            self.point_x_dropdown_menus[point_x_dropdown_id] = self._get_dropdown_menu(
-                point_x_dropdown_id, point_x_drop_menu_items, variables[0]
-            )
-            self.point_y_dropdown_menus[point_y_dropdown_id] = self._get_dropdown_menu(
-                point_y_dropdown_id, point_y_drop_menu_items, variables[-1]
-            )
-
-    def _setup_group_dropdown_menus(self):
-        collections = self.feature_handler.get_collections()
-        for collection in collections:
-            group_values, main_group_values = self._get_group_and_main_group_values(
-                collection
+    def _get_options(self, collection: str, main_group: Any) -> Dict[str, List]:
+        # the values offered in each menu; groups depend on the main group
+        group_values, main_group_values = self._get_group_and_main_group_values(
+            collection
+        )
+        if main_group_values is not None and main_group is not None:
+            group_values = self._get_group_values_for_main_group(
+                collection, main_group
             )
-            if main_group_values is not None:
-                dropdown_main_menu_items = []
-                for main_group in main_group_values:
-                    # set up main group drop options
-                    main_group_drop_option_id = MAIN_GROUP_DROP_OPTION_TEMPLATE.format(
-                        collection, main_group
-                    )
-                    main_group_drop_option = dbc.DropdownMenuItem(
-                        main_group,
-                        id=main_group_drop_option_id,
-                        n_clicks=1,
-                        style={"fontSize": "larger", "fontFamily": FONT_FAMILY},
-                    )
-                    self.main_group_drop_options[main_group_drop_option_id] = (
-                        main_group_drop_option
-                    )
-                    dropdown_main_menu_items.append(main_group_drop_option)
-                    # set up group drop options
-                    groups = self._get_group_values_for_main_group(
-                        collection, main_group
-                    )
-                    group_dropdown_menu_items = []
-                    for member in groups:
-                        group_drop_option_id = GROUP_DROP_OPTION_TEMPLATE.format(
-                            collection, main_group, member
-                        )
-                        group_drop_down_menu_item = dbc.DropdownMenuItem(
-                            member,
-                            id=group_drop_option_id,
-                            n_clicks=1,
-                            style={"fontSize": "larger", "fontFamily": FONT_FAMILY},
-                        )
-                        self.group_drop_options[group_drop_option_id] = (
-                            group_drop_down_menu_item
-                        )
-                        group_dropdown_menu_items.append(group_drop_down_menu_item)
-
-                    group_drop_option_id = GROUP_DROP_OPTION_TEMPLATE.format(
-                        collection, main_group, ALL_GROUP_MEMBERS
-                    )
-                    group_drop_down_menu_item = dbc.DropdownMenuItem(
-                        ALL_GROUP_MEMBERS,
-                        id=group_drop_option_id,
-                        n_clicks=1,
-                        style={"fontSize": "larger", "fontFamily": FONT_FAMILY},
-                    )
-                    self.group_drop_options[group_drop_option_id] = (
-                        group_drop_down_menu_item
-                    )
-                    group_dropdown_menu_items.append(group_drop_down_menu_item)
-
-                    group_dropdown_id = self.encode_group_dropdown(
-                        collection, main_group
-                    )
-                    self.group_dropdown_menus[group_dropdown_id] = (
-                        self._get_dropdown_menu(
-                            group_dropdown_id, group_dropdown_menu_items, groups[0]
-                        )
-                    )
-                main_group_dropdown_id = self.encode_main_group_dropdown(collection)
-                self.main_group_dropdown_menus[main_group_dropdown_id] = (
-                    self._get_dropdown_menu(
-                        main_group_dropdown_id,
-                        dropdown_main_menu_items,
-                        main_group_values[0],
-                    )
-                )
-            else:
-                dropdown_menu_items = []
-                for member in group_values:
-                    group_drop_option_id = GROUP_DROP_OPTION_TEMPLATE.format(
-                        collection, "all", member
-                    )
-                    group_drop_option = dbc.DropdownMenuItem(
-                        member,
-                        id=group_drop_option_id,
-                        n_clicks=1,
-                        style={"fontSize": "larger", "fontFamily": FONT_FAMILY},
-                    )
-                    dropdown_menu_items.append(group_drop_option)
-                    self.group_drop_options[group_drop_option_id] = group_drop_option
-
-                group_drop_option_id = GROUP_DROP_OPTION_TEMPLATE.format(
-                    collection, "all", ALL_GROUP_MEMBERS
-                )
-                group_drop_down_menu_item = dbc.DropdownMenuItem(
-                    ALL_GROUP_MEMBERS,
-                    id=group_drop_option_id,
-                    n_clicks=1,
-                    style={"fontSize": "larger", "fontFamily": FONT_FAMILY},
-                )
-                self.group_drop_options[group_drop_option_id] = (
-                    group_drop_down_menu_item
-                )
-                dropdown_menu_items.append(group_drop_down_menu_item)
-
-                group_dropdown_id = self.encode_group_dropdown(
-                    collection, ALL_GROUP_MEMBERS
-                )
-                self.group_dropdown_menus[group_dropdown_id] = self._get_dropdown_menu(
-                    group_dropdown_id, dropdown_menu_items, group_values[0]
-                )
+        variables = self.feature_handler.get_variables(collection)
+        return {
+            MAIN_GROUP: main_group_values or [],
+            LINE_VARIABLE: variables,
+            GROUP: group_values + [ALL_GROUP_MEMBERS],
+            X_VARIABLE: variables,
+            Y_VARIABLE: variables,
+        }
+
+    def _get_selection(
+        self,
+        collection: str,
+        general_data: Optional[Dict] = None,
+        component_data: Optional[Dict] = None,
+    ) -> Dict[str, Any]:
+        # the value selected in each menu, or its default
+        general_data = general_data or {}
+        component_data = component_data or {}
+        _, main_group_values = self._get_group_and_main_group_values(collection)
+        groups = general_data.get(GROUPS_SECTION, {}).get(collection, {})
+        if not isinstance(groups, dict):
+            # groups selected in the time plots are given for the first level
+            groups = {MAIN_GROUP if main_group_values is not None else GROUP: groups}
+        if main_group_values is None:
+            main_group = None
+            main_group_key = ALL_GROUP_MEMBERS
+        else:
+            main_group = groups.get(MAIN_GROUP, main_group_values[0])
+            main_group_key = main_group
+        default_group = self._get_group_values_for_main_group(
+            collection, main_group_key
+        )[0]
+        variables = self.feature_handler.get_variables(collection)
+        selected_variables = component_data.get(VARIABLES_SECTION, {}).get(
+            collection, {}
+        )
+        return {
+            MAIN_GROUP: main_group,
+            LINE_VARIABLE: selected_variables.get(LINE_VARIABLE, variables[0]),
+            GROUP: groups.get(GROUP, default_group),
+            X_VARIABLE: selected_variables.get(X_VARIABLE, variables[0]),
+            Y_VARIABLE: selected_variables.get(Y_VARIABLE, variables[-1]),
+        }
 
     def get(
         self, sub_component: str, sub_component_id_str, sub_config: Dict
     ) -> Component:
-        self._setup_group_dropdown_menus()
-        self._setup_variable_dropdown_menus()
         collection = self.feature_handler.get_default_collection()
         # For rendering scatterplots
         pointplot_fig = self.get_point_scatter_plot(collection)
         lineplot_fig = self.get_line_scatter_plot(collection)
 
-        main_group_drop_down_menus = list(self.main_group_dropdown_menus.values())
-        if len(main_group_drop_down_menus) > 0:
-            main_group_drop_down_menus[0].style["display"] = "block"
-        line_drop_down_menus = list(self.line_dropdown_menus.values())
-        line_drop_down_menus[0].style["display"] = "block"
+        options = self._get_options(collection, None)
+        selection = self._get_selection(collection)
+        menus = {
+            role: self._get_dropdown_menu(role, options[role], selection[role])
+            for role in MENU_ROLES
+        }
 
         levels = self.feature_handler.get_levels()
         upper_row_children = []
@@ -283,7 +188,7 @@ class ScatterplotComponent(DashboardComponent):
                 )
             )
         upper_row_children.append(
-            html.Div(main_group_drop_down_menus, className="col-auto px-1")
+            html.Div(menus[MAIN_GROUP], className="col-auto px-1")
         )
         upper_row_children.append(
             html.Div(
@@ -293,7 +198,7 @@ class ScatterplotComponent(DashboardComponent):
             )
         )
         upper_row_children.append(
-            html.Div(line_drop_down_menus, className="col-auto px-1")
+            html.Div(menus[LINE_VARIABLE], className="col-auto px-1")
         )
         upper_components = [
             html.Div(upper_row_children, className="row justify-content-center"),
@@ -301,12 +206,6 @@ class ScatterplotComponent(DashboardComponent):
                 id=SCATTER_PLOT_LINE_ID, figure=lineplot_fig, style={"height": "35.5vh"}
             ),
         ]
-        group_drop_down_menus = list(self.group_dropdown_menus.values())
-        group_drop_down_menus[0].style["display"] = "block"
-        point_x_drop_down_menus = list(self.point_x_dropdown_menus.values())
-        point_x_drop_down_menus[0].style["display"] = "block"
-        point_y_drop_down_menus = list(self.point_y_dropdown_menus.values())
-        point_y_drop_down_menus[0].style["display"] = "block"
 
         lower_row = html.Div(
             [
@@ -315,19 +214,19 @@ class ScatterplotComponent(DashboardComponent):
                     className="col-auto px-1 m-2",
                     style={"color": FONT_COLOR, "fontFamily": FONT_FAMILY},
                 ),
-                html.Div(group_drop_down_menus, className="col-auto px-1"),
+                html.Div(menus[GROUP], className="col-auto px-1"),
                 html.Div(
                     "X-Var",
                     className="col-auto px-1 m-2",
                     style={"color": FONT_COLOR, "fontFamily": FONT_FAMILY},
                 ),
-                html.Div(point_x_drop_down_menus, className="col-auto px-1"),
+                html.Div(menus[X_VARIABLE], className="col-auto px-1"),
                 html.Div(
                     "Y-Var",
                     className="col-auto px-1 m-2",
                     style={"color": FONT_COLOR, "fontFamily": FONT_FAMILY},
                 ),
-                html.Div(point_y_drop_down_menus, className="col-auto px-1"),
+                html.Div(menus[Y_VARIABLE], className="col-auto px-1"),
             ],
             className="row justify-content-center",
         )
@@ -369,7 +268,11 @@ class ScatterplotComponent(DashboardComponent):
         return html.Div(
             children=[
                 dcc.Store(id=f"{self._dashboard_id}-{COMPONENT_STORE_ID}"),
-                dcc.Store(id=TEMP_STORE_ID),
+                dcc.Store(id=f"{self._dashboard_id}-{TEMP_STORE_ID}"),
+                dcc.Store(
+                    id=f"{self._dashboard_id}-{OPTIONS_STORE_ID}",
+                    data=[collection, selection[MAIN_GROUP]],
+                ),
                 sub_components,
             ]
         )
@@ -487,209 +390,49 @@ class ScatterplotComponent(DashboardComponent):
         selected_group_item: str = "",
         selected_main_group_item: str = "",
     ):
-        df = self.feature_handler.get_df(collection)
         group_values, main_group_values = self._get_group_and_main_group_values(
             collection
         )
-        levels = self.feature_handler.get_levels()
+        level_values = []
         if main_group_values is not None:
             main_group_item = (
                 selected_main_group_item
                 if selected_main_group_item != ""
                 else main_group_values[0]
             )
-            df = df[df[levels[-3]] == main_group_item]
+            level_values.append(main_group_item)
         if selected_group_item != ALL_GROUP_MEMBERS:
             group_item = (
                 selected_group_item if selected_group_item != "" else group_values[0]
             )
-            df = df[df[levels[-2]] == group_item]
-        return df
-
-    @staticmethod
-    def encode_main_group_dropdown(collection: str) -> str:
-        return MAIN_GROUP_DROPDOWN_TEMPLATE.format(collection)
-
-    @staticmethod
-    def decode_main_group_dropdown(dropdown_id) -> str:
-        return dropdown_id[MAIN_GROUP_DROPDOWN_OFFSET:]
-
-    def encode_group_dropdown(self, collection: str, main_group: str) -> str:
-        new_collection = collection.replace("_", "-")
-        new_main_group = main_group.replace("_", "-")
-        self._encodings[new_collection] = collection
-        self._encodings[new_main_group] = main_group
-        return GROUP_DROPDOWN_TEMPLATE.format(new_collection, new_main_group)
-
-    def decode_group_dropdown(self, dropdown_id) -> Tuple[str, str]:
-        ids = dropdown_id.split("_")
-        collection = self._encodings.get(ids[-2], ids[-2])
-        main_group = self._encodings.get(ids[-1], ids[-1])
-        return collection, main_group
-
-    @staticmethod
-    def encode_xvar_dropdown(collection: str) -> str:
-        return POINT_X_VAR_DROPDOWN_ID_TEMPLATE.format(collection)
-
-    @staticmethod
-    def decode_xvar_dropdown(dropdown_id: str) -> str:
-        return dropdown_id[POINT_X_VAR_DROPDOWN_OFFSET:]
-
-    @staticmethod
-    def encode_yvar_dropdown(collection: str) -> str:
-        return POINT_Y_VAR_DROPDOWN_ID_TEMPLATE.format(collection)
-
-    @staticmethod
-    def decode_yvar_dropdown(dropdown_id: str) -> str:
-        return dropdown_id[POINT_Y_VAR_DROPDOWN_OFFSET:]
-
-    @staticmethod
-    def encode_linevar_dropdown(collection: str) -> str:
-        return LINE_VAR_DROPDOWN_ID_TEMPLATE.format(collection)
-
-    @staticmethod
-    def decode_linevar_dropdown(dropdown_id: str) -> str:
-        return dropdown_id[LINE_VAR_DROPDOWN_OFFSET:]
+            level_values.append(group_item)
+        return self.feature_handler.get_level_df(collection, *level_values)
 
     def register_callbacks(self, component_ids: List[str], dashboard_id: str = None):
-
-        group_dropdown_menus = list(self.group_dropdown_menus.keys())
-        group_drop_options = list(self.group_drop_options.keys())
-
-        line_dropdown_menus = list(self.line_dropdown_menus.keys())
-        line_drop_options = list(self.xvar_drop_options.keys())
-
-        point_x_dropdown_menus = list(self.point_x_dropdown_menus.keys())
-        point_x_drop_options = list(self.point_x_drop_options.keys())
-
-        point_y_dropdown_menus = list(self.point_y_dropdown_menus.keys())
-        point_y_drop_options = list(self.point_y_drop_options.keys())
-
-        main_group_dropdown_menus = list(self.main_group_dropdown_menus.keys())
-        main_group_drop_options = list(self.main_group_drop_options.keys())
-
-        if len(main_group_drop_options) > 0:
-
-            @callback(
-                Output(TEMP_STORE_ID, "data", allow_duplicate=True),
-                [
-                    Input(main_group_value_id, "n_clicks_timestamp")
-                    for main_group_value_id in main_group_drop_options
-                ],
-                prevent_initial_call=True,
-            )
-            def selector_to_temp_main_group(*timestamps):
-                if not any(timestamps):
-                    return dash.no_update
-                latest_timestamp_index = timestamps.index(
-                    max(t for t in timestamps if t is not None)
-                )
-                selected_main_group_dropdown_id = list(
-                    self.main_group_drop_options.keys()
-                )[latest_timestamp_index]
-                selected_main_group_item = self.main_group_drop_options[
-                    selected_main_group_dropdown_id
-                ].children
-                temp = {MAIN_GROUP: selected_main_group_item}
-                return temp
-
-        @callback(
-            Output(TEMP_STORE_ID, "data", allow_duplicate=True),
-            [
-                Input(group_value_id, "n_clicks_timestamp")
-                for group_value_id in group_drop_options
-            ],
-            prevent_initial_call=True,
-        )
-        def selector_to_temp_group(*timestamps):
-            if not any(timestamps):
-                return dash.no_update
-            latest_timestamp_index = timestamps.index(
-                max(t for t in timestamps if t is not None)
-            )
-            selected_group_dropdown_id = list(self.group_drop_options.keys())[
-                latest_timestamp_index
-            ]
-            selected_group_item = self.group_drop_options[
-                selected_group_dropdown_id
-            ].children
-            temp = {GROUP: selected_group_item}
-            return temp
+        # there is one menu per role, their options are replaced when the
+        # collection or main group changes; clicks on any option are handled
+        # by a single callback
+        menus = get_menu_id(self._dashboard_id, ALL)
+        temp_store_id = f"{self._dashboard_id}-{TEMP_STORE_ID}"
 
         @callback(
-            Output(TEMP_STORE_ID, "data", allow_duplicate=True),
-            [
-                Input(point_x_drop_id, "n_clicks_timestamp")
-                for point_x_drop_id in point_x_drop_options
-            ],
+            Output(temp_store_id, "data", allow_duplicate=True),
+            Input(get_option_id(self._dashboard_id, ALL, ALL), "n_clicks"),
             prevent_initial_call=True,
+            dashboard_id=self._dashboard_id,
         )
-        def selector_to_temp_xvar(*timestamps):
-            if not any(timestamps):
-                return dash.no_update
-            latest_timestamp_index = timestamps.index(
-                max(t for t in timestamps if t is not None)
-            )
-            xvar_drop_option_id = list(self.xvar_drop_options.keys())[
-                latest_timestamp_index
-            ]
-            xvar_drop_option_value = self.xvar_drop_options[
-                xvar_drop_option_id
-            ].children
-            temp_data = {X_VARIABLE: xvar_drop_option_value}
-            return temp_data
-
-        @callback(
-            Output(TEMP_STORE_ID, "data", allow_duplicate=True),
-            [
-                Input(point_y_drop_id, "n_clicks_timestamp")
-                for point_y_drop_id in point_y_drop_options
-            ],
-            prevent_initial_call=True,
-        )
-        def selector_to_temp_yvar(*timestamps):
-            if not any(timestamps):
-                return dash.no_update
-            latest_timestamp_index = timestamps.index(
-                max(t for t in timestamps if t is not None)
-            )
-            yvar_drop_option_id = list(self.point_y_drop_options.keys())[
-                latest_timestamp_index
-            ]
-            yvar_drop_option_value = self.point_y_drop_options[
-                yvar_drop_option_id
-            ].children
-            temp_data = {Y_VARIABLE: yvar_drop_option_value}
-            return temp_data
-
-        @callback(
-            Output(TEMP_STORE_ID, "data", allow_duplicate=True),
-            [
-                Input(line_drop_id, "n_clicks_timestamp")
-                for line_drop_id in line_drop_options
-            ],
-            prevent_initial_call=True,
-        )
-        def selector_to_temp_linevar(*timestamps):
-            if not any(timestamps):
-                return dash.no_update
-            latest_timestamp_index = timestamps.index(
-                max(t for t in timestamps if t is not None)
-            )
-            line_drop_option_id = list(self.xvar_drop_options.keys())[
-                latest_timestamp_index
-            ]
-            line_drop_option_value = self.xvar_drop_options[
-                line_drop_option_id
-            ].children
-            temp_data = {LINE_VARIABLE: line_drop_option_value}
-            return temp_data
+        def options_to_temp(n_clicks):
+            # options inserted with new menus trigger without being clicked
+            if ctx.triggered_id is None or not ctx.triggered[0]["value"]:
+                return no_update
+            return {ctx.triggered_id["role"]: ctx.triggered_id["value"]}
 
         @callback(
             Output(f"{dashboard_id}-{GENERAL_STORE_ID}", "data", allow_duplicate=True),
-            [Input(TEMP_STORE_ID, "data")],
+            [Input(temp_store_id, "data")],
             [State(f"{dashboard_id}-{GENERAL_STORE_ID}", "data")],
             prevent_initial_call=True,
+            dashboard_id=self._dashboard_id,
         )
         def temp_to_general(temp_data, general_data):
             general_data = general_data or {}
@@ -699,7 +442,7 @@ class ScatterplotComponent(DashboardComponent):
                 general_data[GROUPS_SECTION] = {}
             collection = general_data[COLLECTION]
             if temp_data is not None:
-                if collection not in general_data[GROUPS_SECTION]:
+                if not isinstance(general_data[GROUPS_SECTION].get(collection), dict):
                     general_data[GROUPS_SECTION][collection] = {}
                 if MAIN_GROUP in temp_data:
                     general_data[GROUPS_SECTION][collection][MAIN_GROUP] = temp_data[
@@ -715,12 +458,13 @@ class ScatterplotComponent(DashboardComponent):
 
         @callback(
             Output(f"{self._dashboard_id}-{COMPONENT_STORE_ID}", "data"),
-            [Input(TEMP_STORE_ID, "data")],
+            [Input(temp_store_id, "data")],
             [
                 State(f"{dashboard_id}-{GENERAL_STORE_ID}", "data"),
                 State(f"{self._dashboard_id}-{COMPONENT_STORE_ID}", "data"),
             ],
             prevent_initial_call=True,
+            dashboard_id=self._dashboard_id,
         )
         def temp_to_component(temp_data, general_data, component_data):
             general_data = general_data or {}
@@ -741,341 +485,46 @@ class ScatterplotComponent(DashboardComponent):
                         )
             return component_data
 
-        if len(main_group_dropdown_menus) > 0:
-
-            @callback(
-                [
-                    Output(main_group_dropdown_menu, "style")
-                    for main_group_dropdown_menu in main_group_dropdown_menus
-                ],
-                [
-                    Input(f"{dashboard_id}-{GENERAL_STORE_ID}", "data"),
-                ],
-                prevent_initial_call=True,
-            )
-            def general_to_styles_main_group(data):
-                if data is None or COLLECTION not in data:
-                    return dash.no_update
-                selected_collection = data.get(COLLECTION)
-                selected_main_group_dropdown_id = self.encode_main_group_dropdown(
-                    selected_collection
-                )
-                results = []
-                for (
-                    main_group_dropdown_menu_id,
-                    main_group_dropdown_menu,
-                ) in self.main_group_dropdown_menus.items():
-                    if main_group_dropdown_menu_id == selected_main_group_dropdown_id:
-                        results.append({"display": "block"})
-                    else:
-                        results.append({"display": "none"})
-                return tuple(results)
-
         @callback(
-            [
-                Output(group_dropdown_menu, "style", allow_duplicate=True)
-                for group_dropdown_menu in group_dropdown_menus
-            ],
-            [
-                Input(f"{dashboard_id}-{GENERAL_STORE_ID}", "data"),
-            ],
+            Output(menus, "children"),
+            Output(menus, "style"),
+            Output(f"{self._dashboard_id}-{OPTIONS_STORE_ID}", "data"),
+            Input(f"{dashboard_id}-{GENERAL_STORE_ID}", "data"),
+            State(f"{self._dashboard_id}-{OPTIONS_STORE_ID}", "data"),
             prevent_initial_call=True,
+            dashboard_id=self._dashboard_id,
         )
-        def general_to_styles_group(general_data):
+        def general_to_options(general_data, shown_options):
             if not general_data or COLLECTION not in general_data:
-                return dash.no_update
+                return no_update
             collection = general_data[COLLECTION]
-            group_values, main_group_values = self._get_group_and_main_group_values(
-                collection
-            )
-            main_group = ALL_GROUP_MEMBERS
-            if main_group_values is not None:
-                main_group = (
-                    general_data.get(GROUPS_SECTION, {})
-                    .get(collection, {})
-                    .get(MAIN_GROUP, main_group_values[0])
-                )
-            selected_group_dropdown_id = self.encode_group_dropdown(
-                collection, main_group
-            )
-            results = []
-            for (
-                group_dropdown_menu_id,
-                group_dropdown_menu,
-            ) in self.group_dropdown_menus.items():
-                if group_dropdown_menu_id == selected_group_dropdown_id:
-                    results.append({"display": "block"})
-                else:
-                    results.append({"display": "none"})
-            return tuple(results)
-
-        @callback(
-            [
-                Output(point_x_dropdown_menu, "style", allow_duplicate=True)
-                for point_x_dropdown_menu in point_x_dropdown_menus
-            ],
-            [
-                Input(f"{dashboard_id}-{GENERAL_STORE_ID}", "data"),
-            ],
-            prevent_initial_call=True,
-        )
-        def general_to_styles_xvar(selected_data):
-            if selected_data is None or COLLECTION not in selected_data:
-                return dash.no_update
-            collection = selected_data[COLLECTION]
-            selected_point_x_dropdown_id = self.encode_xvar_dropdown(collection)
-            results = []
-            for (
-                point_x_dropdown_menu_id,
-                point_x_dropdown_menu,
-            ) in self.point_x_dropdown_menus.items():
-                if point_x_dropdown_menu_id == selected_point_x_dropdown_id:
-                    results.append({"display": "block"})
-                else:
-                    results.append({"display": "none"})
-            return tuple(results)
-
-        @callback(
-            [
-                Output(point_y_dropdown_menu, "style", allow_duplicate=True)
-                for point_y_dropdown_menu in point_y_dropdown_menus
-            ],
-            [
-                Input(f"{dashboard_id}-{GENERAL_STORE_ID}", "data"),
-            ],
-            prevent_initial_call=True,
-        )
-        def general_to_styles_yvar(selected_data):
-            if selected_data is None or COLLECTION not in selected_data:
-                return dash.no_update
-            collection = selected_data[COLLECTION]
-            selected_point_y_dropdown_id = self.encode_yvar_dropdown(collection)
-            results = []
-            for (
-                point_y_dropdown_menu_id,
-                point_y_dropdown_menu,
-            ) in self.point_y_dropdown_menus.items():
-                if point_y_dropdown_menu_id == selected_point_y_dropdown_id:
-                    results.append({"display": "block"})
-                else:
-                    results.append({"display": "none"})
-            return tuple(results)
-
-        @callback(
-            [
-                Output(line_dropdown_menu, "style", allow_duplicate=True)
-                for line_dropdown_menu in line_dropdown_menus
-            ],
-            [
-                Input(f"{dashboard_id}-{GENERAL_STORE_ID}", "data"),
-            ],
-            prevent_initial_call=True,
-        )
-        def general_to_styles_linevar(selected_data):
-            if selected_data is None or COLLECTION not in selected_data:
+            main_group = self._get_selection(collection, general_data)[MAIN_GROUP]
+            if shown_options == [collection, main_group]:
                 return no_update
-            collection = selected_data[COLLECTION]
-            selected_line_dropdown_id = self.encode_linevar_dropdown(collection)
-            results = []
-            for (
-                line_dropdown_menu_id,
-                line_dropdown_menu,
-            ) in self.line_dropdown_menus.items():
-                if line_dropdown_menu_id == selected_line_dropdown_id:
-                    results.append({"display": "block"})
-                else:
-                    results.append({"display": "none"})
-            return tuple(results)
-
-        if len(main_group_dropdown_menus) > 0:
-
-            @callback(
-                [
-                    Output(main_group_dropdown_menu, "label")
-                    for main_group_dropdown_menu in main_group_dropdown_menus
-                ],
-                Input(f"{dashboard_id}-{GENERAL_STORE_ID}", "data"),
-                prevent_initial_call=True,
-            )
-            def stores_to_labels_main_group(general_data):
-                general_data = general_data or {}
-                collection = general_data.get(
-                    COLLECTION, self.feature_handler.get_default_collection()
-                )
-                main_group = (
-                    general_data.get(GROUPS_SECTION, {})
-                    .get(collection, {})
-                    .get(MAIN_GROUP)
-                )
-                if main_group is None:
-                    return dash.no_update
-                relevant_main_group_dropdown_id = self.encode_main_group_dropdown(
-                    collection
-                )
-                results = []
-                for (
-                    main_group_dropdown_menu_id,
-                    main_group_dropdown_menu,
-                ) in self.main_group_dropdown_menus.items():
-                    if main_group_dropdown_menu_id == relevant_main_group_dropdown_id:
-                        results.append(main_group)
-                    else:
-                        c = self.decode_main_group_dropdown(main_group_dropdown_menu_id)
-                        _, main_groups = self._get_group_and_main_group_values(c)
-
-                        results.append(main_groups[0])
-                return tuple(results)
-
-        @callback(
-            [
-                Output(group_dropdown_menu, "label")
-                for group_dropdown_menu in group_dropdown_menus
-            ],
-            Input(f"{dashboard_id}-{GENERAL_STORE_ID}", "data"),
-            prevent_initial_call=True,
-        )
-        def stores_to_labels_group(general_data):
-            general_data = general_data or {}
-            results = []
-            for (
-                group_dropdown_menu_id,
-                group_dropdown_menu,
-            ) in self.group_dropdown_menus.items():
-                c, main_group = self.decode_group_dropdown(group_dropdown_menu_id)
-                default_group = self._get_group_values_for_main_group(c, main_group)[0]
-                group = (
-                    general_data.get(GROUPS_SECTION, {})
-                    .get(c, {})
-                    .get(GROUP, default_group)
-                )
-                results.append(group)
-            return tuple(results)
-
-        @callback(
-            [
-                Output(x_dropdown_menu, "label")
-                for x_dropdown_menu in point_x_dropdown_menus
-            ],
-            [
-                Input(f"{self._dashboard_id}-{COMPONENT_STORE_ID}", "data"),
-                Input(f"{dashboard_id}-{GENERAL_STORE_ID}", "data"),
-            ],
-            prevent_initial_call=True,
-        )
-        def stores_to_labels_xvar(component_data, general_data):
-            component_data = component_data or {}
-            general_data = general_data or {}
-            collection = general_data.get(
-                COLLECTION, self.feature_handler.get_default_collection()
-            )
-            x_variable = (
-                component_data.get(VARIABLES_SECTION, {})
-                .get(collection, {})
-                .get(X_VARIABLE)
-            )
-            if x_variable is None:
-                return dash.no_update
-            relevant_x_dropdown_menu_id = self.encode_xvar_dropdown(collection)
-            results = []
-            for (
-                x_dropdown_menu_id,
-                x_dropdown_menu,
-            ) in self.point_x_dropdown_menus.items():
-                if x_dropdown_menu_id == relevant_x_dropdown_menu_id:
-                    results.append(x_variable)
-                else:
-                    c = self.decode_xvar_dropdown(x_dropdown_menu_id)
-                    default_var = self.feature_handler.get_default_variable(c)
-                    results.append(
-                        component_data.get(VARIABLES_SECTION, {})
-                        .get(c, {})
-                        .get(X_VARIABLE, default_var)
-                    )
-            return tuple(results)
-
-        @callback(
-            [
-                Output(y_dropdown_menu, "label")
-                for y_dropdown_menu in point_y_dropdown_menus
-            ],
-            [
-                Input(f"{self._dashboard_id}-{COMPONENT_STORE_ID}", "data"),
-                Input(f"{dashboard_id}-{GENERAL_STORE_ID}", "data"),
-            ],
-            prevent_initial_call=True,
-        )
-        def stores_to_labels_yvar(component_data, general_data):
-            component_data = component_data or {}
-            general_data = general_data or {}
-            collection = general_data.get(
-                COLLECTION, self.feature_handler.get_default_collection()
-            )
-            y_variable = (
-                component_data.get(VARIABLES_SECTION, {})
-                .get(collection, {})
-                .get(Y_VARIABLE)
+            options = self._get_options(collection, main_group)
+            roles = [output["id"]["role"] for output in ctx.outputs_list[0]]
+            return (
+                [self._get_menu_items(role, options[role]) for role in roles],
+                [self._get_menu_style(options[role]) for role in roles],
+                [collection, main_group],
             )
-            if y_variable is None:
-                return dash.no_update
-            relevant_y_dropdown_menu_id = self.encode_yvar_dropdown(collection)
-            results = []
-            for (
-                y_dropdown_menu_id,
-                y_dropdown_menu,
-            ) in self.point_y_dropdown_menus.items():
-                if y_dropdown_menu_id == relevant_y_dropdown_menu_id:
-                    results.append(y_variable)
-                else:
-                    c = self.decode_yvar_dropdown(y_dropdown_menu_id)
-                    default_var = self.feature_handler.get_variables()[-1]
-                    results.append(
-                        component_data.get(VARIABLES_SECTION, {})
-                        .get(c, {})
-                        .get(Y_VARIABLE, default_var)
-                    )
-            return tuple(results)
 
         @callback(
-            [
-                Output(line_dropdown_menu, "label")
-                for line_dropdown_menu in line_dropdown_menus
-            ],
+            Output(menus, "label"),
             [
                 Input(f"{self._dashboard_id}-{COMPONENT_STORE_ID}", "data"),
                 Input(f"{dashboard_id}-{GENERAL_STORE_ID}", "data"),
             ],
             prevent_initial_call=True,
+            dashboard_id=self._dashboard_id,
         )
-        def stores_to_labels_linevar(component_data, general_data):
-            component_data = component_data or {}
+        def stores_to_labels(component_data, general_data):
             general_data = general_data or {}
             collection = general_data.get(
                 COLLECTION, self.feature_handler.get_default_collection()
             )
-            line_variable = (
-                component_data.get(VARIABLES_SECTION, {})
-                .get(collection, {})
-                .get(LINE_VARIABLE)
-            )
-            if line_variable is None:
-                return dash.no_update
-            relevant_line_dropdown_menu_id = self.encode_linevar_dropdown(collection)
-            results = []
-            for (
-                line_dropdown_menu_id,
-                line_dropdown_menu,
-            ) in self.line_dropdown_menus.items():
-                if line_dropdown_menu_id == relevant_line_dropdown_menu_id:
-                    results.append(line_variable)
-                else:
-                    c = self.decode_linevar_dropdown(line_dropdown_menu_id)
-                    default_var = self.feature_handler.get_default_variable(c)
-                    results.append(
-                        component_data.get(VARIABLES_SECTION, {})
-                        .get(c, {})
-                        .get(LINE_VARIABLE, default_var)
-                    )
-            return tuple(results)
+            selection = self._get_selection(collection, general_data, component_data)
+            return [selection[output["id"]["role"]] for output in ctx.outputs_list]
 
         @callback(
             [
@@ -1087,62 +536,31 @@ class ScatterplotComponent(DashboardComponent):
                 Input(f"{self._dashboard_id}-{COMPONENT_STORE_ID}", "data"),
             ],
             prevent_initial_call=True,
+            dashboard_id=self._dashboard_id,
         )
         def stores_to_plots(general_data, component_data):
-
-            component_data = component_data or {}
             if general_data is None or COLLECTION not in general_data:
                 return no_update
             collection = general_data[COLLECTION]
-            _, main_group_values = self._get_group_and_main_group_values(collection)
-            if main_group_values is None:
-                main_group = None
-                default_group = self._get_group_values_for_main_group(
-                    collection, ALL_GROUP_MEMBERS
-                )[0]
-            else:
-                main_group = (
-                    general_data.get(GROUPS_SECTION, {})
-                    .get(collection, {})
-                    .get(MAIN_GROUP, main_group_values[0])
-                )
-                default_group = self._get_group_values_for_main_group(
-                    collection, main_group
-                )[0]
-            group = (
-                general_data.get(GROUPS_SECTION, {})
-                .get(collection, {})
-                .get(GROUP, default_group)
-            )
-            variables = self.feature_handler.get_variables(collection)
-            x_variable = (
-                component_data.get(VARIABLES_SECTION, {})
-                .get(collection, {})
-                .get(X_VARIABLE, variables[0])
-            )
-            y_variable = (
-                component_data.get(VARIABLES_SECTION, {})
-                .get(collection, {})
-                .get(Y_VARIABLE, variables[-1])
-            )
-            line_variable = (
-                component_data.get(VARIABLES_SECTION, {})
-                .get(collection, {})
-                .get(LINE_VARIABLE, variables[0])
-            )
+            selection = self._get_selection(collection, general_data, component_data)
             point_plot_fig = dash.no_update
-            if len(variables) > 1:
+            if len(self.feature_handler.get_variables(collection)) > 1:
                 point_plot_fig = self.get_point_scatter_plot(
-                    collection, group, main_group, x_variable, y_variable
+                    collection,
+                    selection[GROUP],
+                    selection[MAIN_GROUP],
+                    selection[X_VARIABLE],
+                    selection[Y_VARIABLE],
                 )
             line_plot_fig = self.get_line_scatter_plot(
-                collection, main_group, line_variable
+                collection, selection[MAIN_GROUP], selection[LINE_VARIABLE]
             )
             return point_plot_fig, line_plot_fig
 
         @callback(
             Output(f"{self._dashboard_id}-{COLLAPSE}", "is_open"),
             Input(f"{dashboard_id}-{GENERAL_STORE_ID}", "data"),
+            dashboard_id=self._dashboard_id,
         )
         def general_to_collapse(selected_data):
             if not selected_data or COLLECTION not in selected_data:
@@ -1,4 +1,3 @@
-from dash import callback
 from dash import dash
 from dash import html
 from dash import Input
@@ -19,6 +18,7 @@ from doors_dashboards.components.constant import (
 )
 from doors_dashboards.core.dashboardcomponent import DashboardComponent
 from doors_dashboards.core.featurehandler import FeatureHandler
+from doors_dashboards.core.metrics import callback
 
 SELECT_COLLECTION_DRP = "collection-drp"
 
@@ -41,6 +41,7 @@ class SelectCollectionComponent(DashboardComponent):
                 Input(dropdown_id, "n_clicks_timestamp")
                 for dropdown_id in list(self.collection_to_id.values())
             ],
+            dashboard_id=self._dashboard_id,
         )
         def update_label(*timestamps):
             if any(timestamps):
@@ -65,6 +66,7 @@ class SelectCollectionComponent(DashboardComponent):
             Input(f"{dashboard_id}-collection_selector", "data"),
             State(f"{dashboard_id}-{GENERAL_STORE_ID}", "data"),
             prevent_initial_call=True,
+            dashboard_id=self._dashboard_id,
         )
         def update_general_store(selected_data, general_data):
             if selected_data is not None:
@@ -77,6 +79,7 @@ class SelectCollectionComponent(DashboardComponent):
         @callback(
             Output(f"{dashboard_id}-collection_selector", "data"),
             Input(f"{dashboard_id}-{GENERAL_STORE_ID}", "data"),
+            dashboard_id=self._dashboard_id,
         )
         def update_collection_selector_store_after_general_store_update(general_data):
             if general_data is None:
@@ -93,6 +96,7 @@ class SelectCollectionComponent(DashboardComponent):
                 for dropdown_id in list(self.collection_to_id.values())
             ],
             prevent_initial_call=True,
+            dashboard_id=self._dashboard_id,
         )
         def update_collection_selector_store(*timestamps):
             if any(timestamps):
@@ -4,29 +4,36 @@ from dash import Input
 from dash import no_update
 from dash import Output
 from dash import State
-from dash import callback
+from dash import Patch
 from dash.development.base_component import Component
 import dash_bootstrap_components as dbc
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from typing import Dict
 from typing import List
 from typing import Optional
+from typing import Tuple
 
 from doors_dashboards.components.constant import (
     COLLECTION,
     FONT_FAMILY,
     SCATTER_FONT_SIZE,
     FONT_COLOR,
+    GROUP,
     GROUPS_SECTION,
+    MAIN_GROUP,
     PLOT_BGCOLOR,
     GENERAL_STORE_ID,
 )
 
 from doors_dashboards.core.constants import LOG
 from doors_dashboards.core.dashboardcomponent import DashboardComponent
+from doors_dashboards.core.downsampling import DEFAULT_PIXEL_BUDGET
+from doors_dashboards.core.downsampling import downsample
 from doors_dashboards.core.featurehandler import FeatureHandler
+from doors_dashboards.core.metrics import callback
 
 TIMEGRAPH_ID = "timeplots_graph"
 TIMEPLOTS_ID = "timeplots"
@@ -47,6 +54,9 @@ class TimeSeriesComponent(DashboardComponent):
         self.group_drop_menus = dict()
         self.group_drop_options = dict()
         self._dashboard_id = dashboard_id
+        # graphs of several dashboards are shown by one app
+        self._timeplots_id = f"{dashboard_id}-{TIMEPLOTS_ID}"
+        self._pixel_budget = DEFAULT_PIXEL_BUDGET
 
     @staticmethod
     def _get_dropdown_menu(
@@ -134,9 +144,10 @@ class TimeSeriesComponent(DashboardComponent):
         self, sub_component: str, sub_component_id: str, sub_config: Dict
     ) -> Component:
         if sub_component == TIMEPLOTS_ID:
+            self._pixel_budget = sub_config.get("pixel_budget", DEFAULT_PIXEL_BUDGET)
             self._setup_group_dropdown_menus()
             self._setup_variable_dropdown_menus()
-            time_plots = self._get_timeplots(sub_component_id)
+            time_plots = self._get_timeplots(self._timeplots_id)
             time_div = html.Div(
                 id=f"{self._dashboard_id}-{TIMEGRAPH_ID}", children=[time_plots]
             )
@@ -202,41 +213,78 @@ class TimeSeriesComponent(DashboardComponent):
             f"'timeslider'."
         )
 
-    def _get_timeplots(
+    def _get_series(
         self,
-        timeseries_id: str,
-        *,
         collection: Optional[str] = None,
         variable: Optional[str] = None,
         group: Optional[str] = None,
-    ) -> Component:
+    ) -> Tuple[pd.Series, pd.Series]:
         collection = collection or self.feature_handler.get_default_collection()
         variable = variable or self.feature_handler.get_default_variable(collection)
-        label = self.feature_handler.get_var_label(collection, variable)
         df = self.feature_handler.get_df(collection)
 
         if group is None:
             group_values, _ = self._get_group_and_main_group_values(collection)
             if group_values is not None and len(group_values) > 0:
                 group = group_values[0]
+        if isinstance(group, dict):
+            # groups selected on the map or scatter plot are given per level
+            group = group.get(MAIN_GROUP, group.get(GROUP))
         if group is not None:
             level = self.feature_handler.get_levels(collection)[0]
-            df = df[df[level] == group]
+            df = self.feature_handler.get_level_df(collection, group)
             LOG.debug(f"Updating time plot for level '{level}' and group '{group}'")
         LOG.debug(
             f"Updating time plot for collection '{collection}' and group '{group}'"
         )
         time_column = self.feature_handler.get_time_column_name(collection)
-        df.loc[df.index, time_column] = pd.to_datetime(df[time_column])
-        df = df.sort_values(by=time_column)
+        series = pd.DataFrame(
+            {"time": pd.to_datetime(df[time_column]), "value": df[variable]}
+        ).sort_values(by="time")
+        return series["time"], series["value"]
+
+    def _downsample(
+        self,
+        times: pd.Series,
+        values: pd.Series,
+        window: Tuple[pd.Timestamp, pd.Timestamp] = None,
+    ) -> Tuple[pd.Series, pd.Series]:
+        x = times.values.astype("datetime64[ns]").astype(np.int64)
+        x_window = None
+        if window is not None:
+            x_window = []
+            for window_time in window:
+                window_time = pd.Timestamp(window_time)
+                # plotly shows dates in the wall time they have been passed in
+                if times.dt.tz is not None and window_time.tz is None:
+                    window_time = window_time.tz_localize(times.dt.tz)
+                x_window.append(window_time.as_unit("ns").value)
+        indices = downsample(x, values.values, self._pixel_budget, x_window)
+        return times.iloc[indices], values.iloc[indices]
+
+    def _get_timeplots(
+        self,
+        timeseries_id: str,
+        *,
+        collection: Optional[str] = None,
+        variable: Optional[str] = None,
+        group: Optional[str] = None,
+    ) -> Component:
+        collection = collection or self.feature_handler.get_default_collection()
+        variable = variable or self.feature_handler.get_default_variable(collection)
+        label = self.feature_handler.get_var_label(collection, variable)
+        times, values = self._get_series(collection, variable, group)
+        min_time = min(times)
+        max_time = max(times)
+        times, values = self._downsample(times, values)
         fig = make_subplots(
             cols=1,
             rows=1,
         )
         fig.add_trace(
             go.Scatter(
-                x=pd.to_datetime(df[time_column]),
-                y=df[variable],
+                x=times,
+                y=values,
                 name=label,
                 textfont={
                     "family": FONT_FAMILY,
@@ -265,8 +313,6 @@ class TimeSeriesComponent(DashboardComponent):
 
         fig.update_xaxes(showticklabels=True, showgrid=False, nticks=10, type="date")
         fig.update_yaxes(title=label.title(), showticklabels=True, showgrid=False)
-        min_time = min(df[time_column])
-        max_time = max(df[time_column])
         delta = max_time - min_time
         range_list = [
             dict(count=1, label="1h", step="hour", stepmode="backward"),
@@ -307,6 +353,12 @@ class TimeSeriesComponent(DashboardComponent):
             id=timeseries_id, figure=fig, style={"width": "100%", "height": "60vh"}
         )
 
+    @staticmethod
+    def _get_x_range(relayout_data: Dict) -> Optional[List[str]]:
+        if "xaxis.range[0]" in relayout_data and "xaxis.range[1]" in relayout_data:
+            return [relayout_data["xaxis.range[0]"], relayout_data["xaxis.range[1]"]]
+        return relayout_data.get("xaxis.range")
+
     def _get_time_slider(self, time_slider_id: str) -> Component:
         min_time, max_time = self.feature_handler.get_time_range()
         delta = (max_time - min_time) / 5
@@ -338,6 +390,7 @@ class TimeSeriesComponent(DashboardComponent):
             Input(f"{dashboard_id}-variable_selector", "data"),
             State(f"{dashboard_id}-general", "data"),
             prevent_initial_call=True,
+            dashboard_id=self._dashboard_id,
         )
         def update_general_store_after_variable_selection(selected_data, general_data):
             if selected_data is None:
@@ -358,6 +411,7 @@ class TimeSeriesComponent(DashboardComponent):
                 Input(var_drop_id, "n_clicks_timestamp")
                 for var_drop_id in var_drop_options
             ],
+            dashboard_id=self._dashboard_id,
         )
         def update_variable_selector_store(*timestamps):
             if not any(timestamps):
@@ -375,6 +429,7 @@ class TimeSeriesComponent(DashboardComponent):
         @callback(
             [Output(var_drop_menu, "label") for var_drop_menu in var_drop_menus],
             Input(f"{dashboard_id}-{GENERAL_STORE_ID}", "data"),
+            dashboard_id=self._dashboard_id,
         )
         def update_variable_drop_down_labels(general_data):
             if general_data is None:
@@ -399,6 +454,7 @@ class TimeSeriesComponent(DashboardComponent):
                 Input(f"{dashboard_id}-group_selector", "data"),
                 State(f"{dashboard_id}-{GENERAL_STORE_ID}", "data"),
                 prevent_initial_call=True,
+                dashboard_id=self._dashboard_id,
             )
             def update_general_store_after_group_selection(selected_data, general_data):
                 if selected_data is None:
@@ -420,6 +476,7 @@ class TimeSeriesComponent(DashboardComponent):
                     Input(group_drop_id, "n_clicks_timestamp")
                     for group_drop_id in group_drop_options
                 ],
+                dashboard_id=self._dashboard_id,
             )
             def update_group_selector_store(*timestamps):
                 if not any(timestamps):
@@ -440,6 +497,7 @@ class TimeSeriesComponent(DashboardComponent):
                     for group_drop_menu in group_drop_menus
                 ],
                 Input(f"{dashboard_id}-{GENERAL_STORE_ID}", "data"),
+                dashboard_id=self._dashboard_id,
             )
             def update_group_drop_down_labels(general_data):
                 if general_data is None:
@@ -460,6 +518,7 @@ class TimeSeriesComponent(DashboardComponent):
         @callback(
             Output(f"{self._dashboard_id}-{TIMEGRAPH_ID}", "children"),
             Input(f"{dashboard_id}-{GENERAL_STORE_ID}", "data"),
+            dashboard_id=self._dashboard_id,
         )
         def update_time_plots_after_general_data_change(general_data):
             if general_data is None:
@@ -477,10 +536,41 @@ class TimeSeriesComponent(DashboardComponent):
             )
             group = general_data.get(GROUPS_SECTION, {}).get(collection)
             line_plots = self._get_timeplots(
-                TIMEPLOTS_ID, collection=collection, variable=variable, group=group
+                self._timeplots_id,
+                collection=collection,
+                variable=variable,
+                group=group,
             )
             return line_plots
 
+        @callback(
+            Output(self._timeplots_id, "figure"),
+            Input(self._timeplots_id, "relayoutData"),
+            State(f"{dashboard_id}-{GENERAL_STORE_ID}", "data"),
+            prevent_initial_call=True,
+            dashboard_id=self._dashboard_id,
+        )
+        def update_time_plot_resolution(relayout_data, general_data):
+            if not relayout_data:
+                return no_update
+            x_range = self._get_x_range(relayout_data)
+            if x_range is None and not relayout_data.get("xaxis.autorange"):
+                return no_update
+            general_data = general_data or {}
+            collection = general_data.get(COLLECTION)
+            variable = general_data.get("variables", {}).get(collection)
+            group = general_data.get(GROUPS_SECTION, {}).get(collection)
+            times, values = self._get_series(collection, variable, group)
+            times, values = self._downsample(times, values, x_range)
+            LOG.debug(
+                f"Showing {len(times)} values for time range '{x_range}' "
+                f"in dashboard '{dashboard_id}'"
+            )
+            figure = Patch()
+            figure["data"][0]["x"] = times
+            figure["data"][0]["y"] = values
+            return figure
+
         variable_style_outputs = [
             Output(variable_drop_menu, "style") for variable_drop_menu in var_drop_menus
         ]
@@ -495,6 +585,7 @@ class TimeSeriesComponent(DashboardComponent):
             variable_outputs,
             Input(f"{dashboard_id}-{GENERAL_STORE_ID}", "data"),
             prevent_initial_call=True,
+            dashboard_id=self._dashboard_id,
         )
         def update_variable_outputs(general_data):
             if general_data is None or COLLECTION not in general_data:
@@ -535,6 +626,7 @@ class TimeSeriesComponent(DashboardComponent):
                 group_outputs,
                 Input(f"{dashboard_id}-{GENERAL_STORE_ID}", "data"),
                 prevent_initial_call=True,
+                dashboard_id=self._dashboard_id,
             )
             def update_group_outputs(general_data):
                 if general_data is None or COLLECTION not in general_data:
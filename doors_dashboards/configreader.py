@@ -0,0 +1,35 @@
+import os
+from pathlib import Path
+from typing import Dict
+from typing import List
+import yaml
+
+CONFIGS_PATH = "../configs"
+
+
+def get_blocked_ids() -> List[str]:
+    blocked_ids = []
+    with open(os.path.join(CONFIGS_PATH, "blocklist.txt"), "r") as bl:
+        for line in bl:
+            blocked_ids.append(line.strip())
+    return blocked_ids
+
+
+def get_dashboard_ids() -> List[str]:
+    p = Path(CONFIGS_PATH)
+    return [
+        entry.stem
+        for entry in p.iterdir()
+        if entry.is_file() and entry.suffix == ".yml"
+    ]
+
+
+def read_config(dashboard_id: str) -> Dict:
+    return read_config_file(f"{dashboard_id}.yml")
+
+
+def read_config_file(config_filename: str) -> Dict:
+    file_dir = os.path.dirname(os.path.abspath(__file__))
+    config_path = os.path.join(file_dir, CONFIGS_PATH, config_filename)
+    with open(config_path, "r", encoding="utf-8") as config_stream:
+        return yaml.safe_load(config_stream)
@@ -0,0 +1,64 @@
+import numpy as np
+from typing import Tuple
+
+DEFAULT_PIXEL_BUDGET = 1000
+
+
+def _reduce_at_mask(y: np.ndarray, starts: np.ndarray, bins: np.ndarray, reduce):
+    # per bucket, marks the first row whose value equals the bucket's reduced
+    # value (nan values never match)
+    reduced = reduce.reduceat(y, starts)
+    matches = np.flatnonzero(y == reduced[bins])
+    _, first_matches = np.unique(bins[matches], return_index=True)
+    return matches[first_matches]
+
+
+def m4(x: np.ndarray, y: np.ndarray, num_buckets: int) -> np.ndarray:
+    # indices of the first, last, minimum and maximum value of each of
+    # num_buckets equally wide buckets along the sorted x; a line drawn through
+    # these renders like the full series on num_buckets pixel columns
+    num_values = len(x)
+    if num_values <= 4 * num_buckets:
+        return np.arange(num_values)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    x_min = x[0]
+    x_extent = x[-1] - x[0]
+    if x_extent == 0:
+        bins = np.zeros(num_values, dtype=np.int64)
+    else:
+        bins = ((x - x_min) / x_extent * num_buckets).astype(np.int64)
+        bins = np.minimum(bins, num_buckets - 1)
+    starts = np.flatnonzero(np.diff(bins, prepend=-1))
+    ends = np.append(starts[1:], num_values) - 1
+    bins = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, num_values)))
+    indices = np.concatenate(
+        [
+            starts,
+            ends,
+            _reduce_at_mask(y, starts, bins, np.fmin),
+            _reduce_at_mask(y, starts, bins, np.fmax),
+        ]
+    )
+    return np.unique(indices)
+
+
+def downsample(
+    x: np.ndarray,
+    y: np.ndarray,
+    num_buckets: int = DEFAULT_PIXEL_BUDGET,
+    window: Tuple[float, float] = None,
+) -> np.ndarray:
+    # a window along x is sampled with the full budget, outside of it the
+    # overview resolution is kept
+    overview = m4(x, y, num_buckets)
+    if window is None:
+        return overview
+    start = np.searchsorted(x, window[0], side="left")
+    end = np.searchsorted(x, window[1], side="right")
+    # include the neighbours so lines continue across the window borders
+    start = max(start - 1, 0)
+    end = min(end + 1, len(x))
+    detail = start + m4(x[start:end], y[start:end], num_buckets)
+    outside = overview[(overview < start) | (overview >= end)]
+    return np.union1d(outside, detail)
@@ -0,0 +1,187 @@
+import geopandas as gpd
+import glob
+import hashlib
+import json
+import os
+import time
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from doors_dashboards.core.constants import LOG
+
+CACHE_DIR_ENV_VAR = "DOORS_CACHE_DIR"
+CACHE_MAX_AGE_ENV_VAR = "DOORS_CACHE_MAX_AGE"
+DEFAULT_CACHE_MAX_AGE = 24 * 60 * 60
+FEATURES_SUB_DIR = "features"
+
+_CACHE_FORMAT_VERSION = 4
+_DATA_SUFFIX = ".parquet"
+_META_SUFFIX = ".json"
+
+
+def get_cache_dir(sub_dir: str = None) -> Optional[str]:
+    cache_dir = os.environ.get(CACHE_DIR_ENV_VAR)
+    if not cache_dir:
+        return None
+    if sub_dir:
+        cache_dir = os.path.join(cache_dir, sub_dir)
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+
+def get_source_files(file_path: str) -> List[str]:
+    # shapefiles consist of several files which all affect the read frame
+    if os.path.splitext(file_path)[1] == ".shp":
+        stem = os.path.splitext(file_path)[0]
+        return sorted(glob.glob(f"{glob.escape(stem)}.*"))
+    return [file_path]
+
+
+def get_source_stamps(source_files: List[str]) -> List[List]:
+    stamps = []
+    for source_file in source_files:
+        stat = os.stat(source_file)
+        stamps.append([os.path.basename(source_file), stat.st_mtime_ns, stat.st_size])
+    return stamps
+
+
+def _hash(definition: Any) -> str:
+    serialized = json.dumps(definition, sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+class FeatureCache:
+
+    def __init__(self, cache_dir: str, max_age: float = DEFAULT_CACHE_MAX_AGE):
+        self._cache_dir = cache_dir
+        self._max_age = max_age
+        os.makedirs(self._cache_dir, exist_ok=True)
+
+    @classmethod
+    def from_env(cls) -> Optional["FeatureCache"]:
+        cache_dir = get_cache_dir(FEATURES_SUB_DIR)
+        if cache_dir is None:
+            return None
+        max_age = float(os.environ.get(CACHE_MAX_AGE_ENV_VAR, DEFAULT_CACHE_MAX_AGE))
+        return cls(cache_dir, max_age)
+
+    @property
+    def cache_dir(self) -> str:
+        return self._cache_dir
+
+    @staticmethod
+    def get_source_id(features: Dict, eez: str = None) -> str:
+        return _hash(
+            dict(
+                version=_CACHE_FORMAT_VERSION,
+                type=features.get("type"),
+                params=features.get("params", {}),
+                eez=eez,
+            )
+        )
+
+    def get_key(
+        self, features: Dict, eez: str = None, source_files: List[str] = None
+    ) -> str:
+        stamps = get_source_stamps(source_files or [])
+        return _hash(
+            dict(source_id=self.get_source_id(features, eez), stamps=stamps)
+        )
+
+    def _data_path(self, key: str) -> str:
+        return os.path.join(self._cache_dir, f"{key}{_DATA_SUFFIX}")
+
+    def _meta_path(self, key: str) -> str:
+        return os.path.join(self._cache_dir, f"{key}{_META_SUFFIX}")
+
+    def _read_meta(self, key: str) -> Optional[Dict]:
+        try:
+            with open(self._meta_path(key), "r") as meta_file:
+                return json.load(meta_file)
+        except (OSError, ValueError):
+            return None
+
+    def read(self, key: str) -> Optional[gpd.GeoDataFrame]:
+        meta = self._read_meta(key)
+        if meta is None or not os.path.exists(self._data_path(key)):
+            return None
+        # entries of remote sources cannot be validated against a file stamp
+        if not meta.get("has_source_files") and self._max_age is not None:
+            if time.time() - meta.get("created", 0) > self._max_age:
+                LOG.debug(f"Cache entry for '{meta.get('id')}' expired")
+                self.evict(key)
+                return None
+        try:
+            gdf = gpd.read_parquet(self._data_path(key))
+        except Exception as e:
+            LOG.warning(f"Could not read cache entry for '{meta.get('id')}': {e}")
+            self.evict(key)
+            return None
+        LOG.debug(f"Read '{meta.get('id')}' from cache")
+        return gdf
+
+    def write(
+        self,
+        key: str,
+        gdf: gpd.GeoDataFrame,
+        features: Dict,
+        eez: str = None,
+        has_source_files: bool = False,
+    ):
+        source_id = self.get_source_id(features, eez)
+        data_path = self._data_path(key)
+        tmp_path = f"{data_path}.{os.getpid()}.tmp"
+        try:
+            gdf.to_parquet(tmp_path)
+            os.replace(tmp_path, data_path)
+        except Exception as e:
+            LOG.warning(
+                f"Could not write cache entry for '{features.get('id')}': {e}"
+            )
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        meta = dict(
+            id=features.get("id"),
+            type=features.get("type"),
+            eez=eez,
+            source_id=source_id,
+            has_source_files=has_source_files,
+            created=time.time(),
+            rows=len(gdf),
+            columns=len(gdf.columns),
+            bytes=os.path.getsize(data_path),
+        )
+        with open(self._meta_path(key), "w") as meta_file:
+            json.dump(meta, meta_file)
+        # entries for outdated versions of the same source are never hit again
+        for entry in self.get_entries():
+            if entry["source_id"] == source_id and entry["key"] != key:
+                self.evict(entry["key"])
+        LOG.debug(f"Wrote '{features.get('id')}' to cache")
+
+    def evict(self, key: str):
+        for path in [self._data_path(key), self._meta_path(key)]:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def evict_collections(self, collection_ids: List[str] = None) -> int:
+        num_evicted = 0
+        for entry in self.get_entries():
+            if collection_ids is None or entry.get("id") in collection_ids:
+                self.evict(entry["key"])
+                num_evicted += 1
+        return num_evicted
+
+    def get_entries(self) -> List[Dict]:
+        entries = []
+        meta_pattern = os.path.join(self._cache_dir, f"*{_META_SUFFIX}")
+        for meta_path in sorted(glob.glob(meta_pattern)):
+            key = os.path.basename(meta_path)[: -len(_META_SUFFIX)]
+            meta = self._read_meta(key)
+            if meta is not None:
+                meta["key"] = key
+                entries.append(meta)
+        return entries
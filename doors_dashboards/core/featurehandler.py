@@ -1,7 +1,13 @@
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+import copy
 import geopandas as gpd
+import numpy as np
 import os
 import pandas as pd
-from shapely import wkt
+import shapely
+import threading
+import time
 from typing import Any
 from typing import Dict
 from typing import List
@@ -11,16 +17,85 @@ from typing import Union
 
 from doors_dashboards.core.constants import LOG
 from doors_dashboards.core.constants import REFERENCE_CRS
+from doors_dashboards.core.featurecache import FeatureCache
+from doors_dashboards.core.featurecache import get_source_files
+from doors_dashboards.core.featurecache import get_source_stamps
+from doors_dashboards.core.geodbaccess import DEFAULT_MAX_ROWS
 from doors_dashboards.core.geodbaccess import get_dataframe_from_geodb
+from doors_dashboards.core.masking import mask_frame
+from doors_dashboards.core.pointindex import PointIndex
+from doors_dashboards.core.singleflight import SingleFlight
+from doors_dashboards.core.sourceregistry import get_source_registry
+from doors_dashboards.core.tracer import continue_trace
+from doors_dashboards.core.tracer import get_trace_context
+from doors_dashboards.core.tracer import trace
 from doors_dashboards.core.vectordatacubeaccess import VectorDataCubeAccessor
 
 
+# zoom levels polygons are simplified for, beyond the last one polygons are
+# shown with full detail
+POLYGON_DETAIL_LEVELS = (2, 4, 6, 8, 10, 12)
+
+# collections read at once by prefetch; reads mostly wait for geoDB or S3
+DEFAULT_PREFETCH_WORKERS = 8
+
+# empty geoDB collections have no time to select new rows by, so refresh reads
+# them completely, but at most once per period
+EMPTY_COLLECTION_REFRESH_PERIOD = 60 * 60
+
+# parameters that only affect how a collection is shown, collections that
+# differ only in these are read once
+_DISPLAY_PARAMS = ("color", "colorcodevariable", "mapmode", "title")
+
+
+def _get_detail_level(zoom: Optional[float]) -> Optional[int]:
+    if zoom is None:
+        return None
+    for detail_level in POLYGON_DETAIL_LEVELS:
+        if zoom <= detail_level:
+            return detail_level
+    return None
+
+
+def _get_simplify_tolerance(zoom: int) -> float:
+    # size of a pixel in degrees at the given web map zoom level
+    return 360 / (256 * 2**zoom)
+
+
+def _log_prefetch_failure(collection: str, future: Future):
+    if future.exception() is not None:
+        LOG.warning(f"Could not read collection '{collection}': {future.exception()}")
+
+
 class FeatureHandler:
 
-    def __init__(self, configs: List, eez: str = None):
+    def __init__(
+        self, configs: List, eez: str = None, feature_cache: FeatureCache = None
+    ):
         self._configs = {c["id"]: c for c in configs}
         self._dfs = {}
-        self._eez_frame = self._load_eez(eez)
+        # guards changes of the frames, readers look frames up without locking
+        self._lock = threading.Lock()
+        self._loads = SingleFlight()
+        self._point_indexes = {}
+        self._points = {}
+        self._level_indexes = {}
+        self._polygon_data = {}
+        self._source_stamps = {}
+        self._source_keys = {}
+        self._read_times = {}
+        self._version = 0
+        self._eez = eez
+        self._eez_key = ("eez", eez) if eez else None
+        self._eez_frame = None
+        if self._eez_key is not None:
+            with trace("load eez"):
+                self._eez_frame = get_source_registry().acquire(
+                    self._eez_key, lambda: self._load_eez(eez)
+                )
+        self._feature_cache = (
+            feature_cache if feature_cache is not None else FeatureCache.from_env()
+        )
         self._default_collection = (
             self.get_collections()[0] if len(self.get_collections()) > 0 else None
         )
@@ -56,29 +131,220 @@ class FeatureHandler:
         )
 
     @staticmethod
-    def _load_eez(eez: str = None):
+    def _get_eez_path(eez: str) -> str:
+        extended_eez_path = f"../../data/eez/{eez}/{eez}.shp"
+        file_dir = os.path.dirname(os.path.abspath(__file__))
+        return os.path.join(file_dir, extended_eez_path)
+
+    @classmethod
+    def _load_eez(cls, eez: str = None):
         if eez:
-            extended_eez_path = f"../../data/eez/{eez}/{eez}.shp"
-            file_dir = os.path.dirname(os.path.abspath(__file__))
-            eez_path = os.path.join(file_dir, extended_eez_path)
-            eez = gpd.read_file(eez_path)
+            eez = gpd.read_file(cls._get_eez_path(eez))
             eez = eez.to_crs(REFERENCE_CRS)
             return eez
 
     def get_collections(self) -> List[str]:
         return list(self._configs.keys())
 
+    def close(self):
+        # releases the shared frames held by this handler
+        with self._lock:
+            source_keys = list(self._source_keys.values())
+            self._source_keys.clear()
+        for source_key in source_keys:
+            get_source_registry().release(source_key)
+        if self._eez_key is not None:
+            get_source_registry().release(self._eez_key)
+            self._eez_key = None
+
     def get_df(self, collection: str = None) -> gpd.GeoDataFrame:
         collection = self._default_collection if not collection else collection
-        if collection not in self._dfs:
-            if collection not in self._configs:
-                raise ValueError(f"No collection with name '{collection}' configured.")
-            self._dfs[collection] = self._read_features(self._configs[collection])
-        return self._dfs[collection]
+        gdf = self._dfs.get(collection)
+        if gdf is not None:
+            return gdf
+        if collection not in self._configs:
+            raise ValueError(f"No collection with name '{collection}' configured.")
+        # concurrent first requests for a collection read it only once
+        return self._loads.do(collection, lambda: self._read_df(collection))
+
+    def prefetch(
+        self, collections: List[str] = None, max_workers: int = None
+    ) -> Dict[str, Future]:
+        # reads the collections in the background; get_df waits for reads
+        # that are running already instead of starting another one
+        collections = self.get_collections() if collections is None else collections
+        if not collections:
+            return {}
+        executor = ThreadPoolExecutor(
+            max_workers=max_workers or min(len(collections), DEFAULT_PREFETCH_WORKERS),
+            thread_name_prefix="doors-prefetch",
+        )
+        trace_context = get_trace_context()
+        futures = {}
+        for collection in collections:
+            future = executor.submit(self._prefetch_df, collection, trace_context)
+            future.add_done_callback(
+                lambda f, c=collection: _log_prefetch_failure(c, f)
+            )
+            futures[collection] = future
+        executor.shutdown(wait=False)
+        return futures
+
+    def _prefetch_df(self, collection: str, trace_context) -> gpd.GeoDataFrame:
+        with continue_trace(trace_context):
+            return self.get_df(collection)
+
+    def _read_df(self, collection: str) -> gpd.GeoDataFrame:
+        # the collection may have been read while waiting for the load
+        gdf = self._dfs.get(collection)
+        if gdf is not None:
+            return gdf
+        with trace(f"read collection {collection}"):
+            features = self._configs[collection]
+            source_key = self._get_source_key(features)
+            source_stamps = get_source_stamps(self._get_source_files(features))
+            # frames are shared with other dashboards reading the same source,
+            # unless its files have changed since
+            shared = get_source_registry().get(source_key)
+            if shared is not None and shared[1] != source_stamps:
+                get_source_registry().invalidate(source_key)
+            gdf, source_stamps = get_source_registry().acquire(
+                source_key, lambda: self._load_source(features)
+            )
+            with self._lock:
+                self._source_keys[collection] = source_key
+            self._set_df(collection, gdf, source_stamps)
+        return gdf
+
+    def _load_source(self, features: Dict) -> Tuple[gpd.GeoDataFrame, List]:
+        source_stamps = get_source_stamps(self._get_source_files(features))
+        return self._load_features(features), source_stamps
+
+    def _get_source_key(self, features: Dict) -> str:
+        params = features.get("params", {})
+        if features.get("type") == "local":
+            params = dict(
+                file=self._get_local_file_path(features),
+                crs=params.get("crs", REFERENCE_CRS),
+                lat_column=params.get("lat_column"),
+                lon_column=params.get("lon_column"),
+            )
+        else:
+            params = {k: v for k, v in params.items() if k not in _DISPLAY_PARAMS}
+        return FeatureCache.get_source_id(
+            dict(type=features.get("type"), params=params), self._eez
+        )
+
+    def _set_df(
+        self, collection: str, gdf: gpd.GeoDataFrame, source_stamps: Dict = None
+    ):
+        # the frame is replaced as a whole, so readers see either the old or
+        # the new frame together with its index
+        point_index = PointIndex(gdf.geometry)
+        with self._lock:
+            self._read_times[collection] = time.monotonic()
+            self._point_indexes[collection] = (gdf, point_index)
+            if source_stamps is not None:
+                self._source_stamps[collection] = source_stamps
+            self._dfs[collection] = gdf
+
+    def get_df_at_point(
+        self, collection: str, lon: float, lat: float
+    ) -> gpd.GeoDataFrame:
+        collection = self._default_collection if not collection else collection
+        gdf = self.get_df(collection)
+        cached = self._point_indexes.get(collection)
+        # the frame may have been replaced or removed since it was read
+        point_index = cached[1] if cached and cached[0] is gdf else None
+        if point_index is None:
+            point_index = PointIndex(gdf.geometry)
+        return gdf.iloc[point_index.lookup(lon, lat)]
+
+    def get_version(self) -> int:
+        return self._version
+
+    def refresh(self) -> bool:
+        changed = False
+        for collection in self.get_collections():
+            # collections that have not been read yet are read up-to-date
+            if collection not in self._dfs:
+                continue
+            try:
+                changed = self._refresh_collection(collection) or changed
+            except Exception as e:
+                LOG.warning(f"Could not refresh collection '{collection}': {e}")
+        if changed:
+            with self._lock:
+                self._version += 1
+        return changed
+
+    def _refresh_collection(self, collection: str) -> bool:
+        features = self._configs[collection]
+        source_key = self._source_keys.get(collection)
+        shared = get_source_registry().get(source_key)
+        if shared is not None and shared[0] is not self._dfs.get(collection):
+            # the source has been refreshed for another dashboard
+            self._set_df(collection, *shared)
+            return True
+        if features.get("type") == "local":
+            source_stamps = get_source_stamps(self._get_source_files(features))
+            if source_stamps == self._source_stamps.get(collection):
+                return False
+            gdf = self._read_features(features)
+        elif features.get("type") == "geodb":
+            source_stamps = self._source_stamps.get(collection)
+            gdf = self._dfs.get(collection)
+            if gdf is None:
+                return False
+            time_column = self.get_time_column_name(collection)
+            last_time = pd.to_datetime(gdf[time_column]).max()
+            if pd.isna(last_time):
+                read_time = self._read_times.get(collection, 0)
+                if time.monotonic() - read_time < EMPTY_COLLECTION_REFRESH_PERIOD:
+                    return False
+                gdf = self._read_features(features)
+                if len(gdf) == 0:
+                    with self._lock:
+                        self._read_times[collection] = time.monotonic()
+                    return False
+            else:
+                # rows at the last time may have been added or completed since
+                # the last read, so they are replaced by the rows read now
+                new_gdf = self._read_geodb_features(
+                    features, where=f"\"{time_column}\" >= '{last_time.isoformat()}'"
+                )
+                is_last = pd.to_datetime(gdf[time_column]) == last_time
+                last_rows = gdf[is_last].reset_index(drop=True)
+                num_kept = len(gdf) - len(last_rows)
+                gdf = pd.concat([gdf[~is_last], new_gdf], ignore_index=True)
+                if gdf.iloc[num_kept:].reset_index(drop=True).equals(last_rows):
+                    return False
+        else:
+            return False
+        LOG.debug(f"Refreshed collection '{collection}', now {len(gdf)} rows")
+        self._set_df(collection, gdf, source_stamps)
+        get_source_registry().update(source_key, (gdf, source_stamps))
+        if self._feature_cache is not None:
+            self._write_to_cache(features, gdf)
+        return True
 
     def delete_df(self, collection: str) -> None:
-        if collection in self._dfs:
-            del self._dfs[collection]
+        if self._feature_cache is not None and collection in self._configs:
+            self._feature_cache.evict(self._get_cache_key(self._configs[collection]))
+        with self._lock:
+            source_key = self._source_keys.pop(collection, None)
+            gdf = self._dfs.pop(collection, None)
+            if gdf is not None:
+                self._point_indexes.pop(collection, None)
+                self._points.pop(collection, None)
+                self._level_indexes.pop(collection, None)
+                self._polygon_data.pop(collection, None)
+                self._version += 1
+        if source_key is not None:
+            # other dashboards keep their frame until they are refreshed
+            get_source_registry().invalidate(source_key)
+            get_source_registry().release(source_key)
+        if gdf is not None:
             LOG.debug(f"Removed read dataframe '{collection}', requires re-reading")
             return
         LOG.debug(f"No dataframe '{collection}' read, nothing to remove")
@@ -143,61 +409,131 @@ class FeatureHandler:
     def _get_unique_values(self, collection: str, column: str) -> List[str]:
         return list(self.get_df(collection)[column].unique())
 
-    def _get_nested_level_values(
-        self, gdf: pd.DataFrame, levels: List[str]
-    ) -> Union[List[str], Dict[str, Any]]:
-        level = levels[0]
-        level_keys = list(gdf[level].unique())
-        if len(levels) == 1:
-            return level_keys
-        level_dict = dict()
-        for level_key in level_keys:
-            sub_gdf = gdf[gdf[level] == level_key]
-            level_dict[level_key] = self._get_nested_level_values(sub_gdf, levels[1:])
-        return level_dict
+    def _get_level_index(
+        self, collection: str
+    ) -> Tuple[Union[List[str], Dict[str, Any]], Dict[Tuple, np.ndarray]]:
+        gdf = self.get_df(collection)
+        cached = self._level_indexes.get(collection)
+        if cached is not None and cached[0] is gdf:
+            return cached[1]
+        levels = self.get_levels(collection)
+        # row positions for every combination of leading level values, keys
+        # keep the order of their first occurrence
+        level_rows = {}
+        for i in range(1, len(levels) + 1):
+            groups = gdf.groupby(levels[:i], sort=False, dropna=False).indices
+            for key, rows in groups.items():
+                level_rows[key if isinstance(key, tuple) else (key,)] = rows
+        nested_level_values = [] if len(levels) == 1 else {}
+        for key in level_rows:
+            if len(key) < len(levels):
+                continue
+            values = nested_level_values
+            for level_value in key[:-2]:
+                values = values.setdefault(level_value, {})
+            if len(key) == 1:
+                values.append(key[0])
+            else:
+                values.setdefault(key[-2], []).append(key[-1])
+        level_index = nested_level_values, level_rows
+        self._level_indexes[collection] = (gdf, level_index)
+        return level_index
 
     def get_nested_level_values(
         self, collection: str = None
     ) -> Optional[Union[List[str], Dict[str, Any]]]:
         collection = self._default_collection if not collection else collection
-        levels = self.get_levels(collection)
-        if not levels:
+        if not self.get_levels(collection):
             return None
+        nested_level_values, _ = self._get_level_index(collection)
+        # callers may sort or otherwise modify the returned values
+        return copy.deepcopy(nested_level_values)
+
+    def get_level_df(
+        self, collection: str = None, *level_values: Any
+    ) -> gpd.GeoDataFrame:
+        collection = self._default_collection if not collection else collection
         gdf = self.get_df(collection)
-        return self._get_nested_level_values(gdf, levels)
+        if not level_values:
+            return gdf
+        _, level_rows = self._get_level_index(collection)
+        rows = level_rows.get(tuple(level_values), np.empty(0, dtype=np.int64))
+        return gdf.iloc[rows]
+
+    @staticmethod
+    def _get_local_file_path(features: Dict) -> str:
+        filepath = features.get("params").get("file")
+        file_dir = os.path.dirname(os.path.abspath(__file__))
+        return os.path.join(file_dir, filepath)
+
+    def _get_source_files(self, features: Dict) -> List[str]:
+        if features.get("type") == "local":
+            return get_source_files(self._get_local_file_path(features))
+        return []
+
+    def _get_cache_key(self, features: Dict) -> str:
+        # cached frames are masked, so they depend on the EEZ files as well
+        source_files = self._get_source_files(features)
+        if self._eez:
+            source_files += get_source_files(self._get_eez_path(self._eez))
+        return self._feature_cache.get_key(features, self._eez, source_files)
+
+    @staticmethod
+    def _get_geometries(df: pd.DataFrame, params: Dict) -> np.ndarray:
+        if "geometry" in df.columns:
+            return shapely.from_wkt(df["geometry"].values)
+        lat_column = params.get("lat_column", "lat")
+        lon_column = params.get("lon_column", "lon")
+        if lat_column in df.columns and lon_column in df.columns:
+            return shapely.points(
+                df[lon_column].values.astype(float),
+                df[lat_column].values.astype(float),
+            )
+        raise ValueError(
+            f"File '{params.get('file')}' has neither a 'geometry' column nor "
+            f"columns '{lat_column}' and '{lon_column}'"
+        )
+
+    def _load_features(self, features: Dict) -> gpd.GeoDataFrame:
+        if self._feature_cache is None:
+            return self._read_features(features)
+        key = self._get_cache_key(features)
+        gdf = self._feature_cache.read(key)
+        if gdf is None:
+            gdf = self._read_features(features)
+            self._write_to_cache(features, gdf, key)
+        return gdf
+
+    def _write_to_cache(
+        self, features: Dict, gdf: gpd.GeoDataFrame, key: str = None
+    ):
+        self._feature_cache.write(
+            key or self._get_cache_key(features),
+            gdf,
+            features,
+            self._eez,
+            has_source_files=len(self._get_source_files(features)) > 0,
+        )
 
     def _read_features(self, features: Dict) -> gpd.GeoDataFrame:
         if features.get("type") == "local":
-            filepath = features.get("params").get("file")
-            file_dir = os.path.dirname(os.path.abspath(__file__))
-            os_file_path = os.path.join(file_dir, filepath)
+            os_file_path = self._get_local_file_path(features)
             crs = features.get("params").get("crs", REFERENCE_CRS)
             with open(os_file_path, "r") as points_file:
                 file_extension = os.path.splitext(os_file_path)
                 if file_extension[1] == ".csv":
                     df = pd.read_csv(points_file)
-                    df["geometry"] = df["geometry"].apply(wkt.loads)
+                    df["geometry"] = self._get_geometries(df, features.get("params"))
                     gdf = gpd.GeoDataFrame(df, crs=crs)
                 else:
                     gdf = gpd.read_file(os_file_path)
 
                 if crs != REFERENCE_CRS:
                     gdf = gdf.to_crs(REFERENCE_CRS)
-                if self._eez_frame is not None:
-                    gdf = gdf.clip(self._eez_frame)
+                gdf = mask_frame(gdf, self._eez_frame)
                 return gdf
         if features.get("type") == "geodb":
-            params = features.get("params")
-            return get_dataframe_from_geodb(
-                params.get("collection"),
-                params.get("database"),
-                variables=params.get("variables"),
-                name_of_time_column=params.get("time_column", "timestamp"),
-                convert_from_parameters=params.get("convert_from_parameters", None),
-                label=params.get("label"),
-                levels=params.get("levels"),
-                mask=self._eez_frame,
-            )
+            return self._read_geodb_features(features)
         if features.get("type") == "vectordatacube":
             params = features.get("params")
             return self._vdc_accessor.get_dataframe_from_vector_data_cube(
@@ -208,29 +544,63 @@ class FeatureHandler:
                 collection_coord=params.get("collection_coord"),
                 time_stamp_name=params.get("time_column", "timestamp"),
                 mask=self._eez_frame,
+                time_range=params.get("time_range"),
             )
 
+    def _read_geodb_features(
+        self, features: Dict, where: str = None
+    ) -> gpd.GeoDataFrame:
+        params = features.get("params")
+        return get_dataframe_from_geodb(
+            params.get("collection"),
+            params.get("database"),
+            variables=params.get("variables"),
+            name_of_time_column=params.get("time_column", "timestamp"),
+            convert_from_parameters=params.get("convert_from_parameters", None),
+            label=params.get("label"),
+            levels=params.get("levels"),
+            mask=self._eez_frame,
+            max_rows=params.get("max_rows", DEFAULT_MAX_ROWS),
+            where=where,
+        )
+
     def get_points_as_tuples(
         self, collection: str = None
-    ) -> Tuple[List[float], List[float], List[str], List[float]]:
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Optional[np.ndarray]]:
         collection = self._default_collection if not collection else collection
         gdf = self.get_df(collection)
-        lons = list(gdf.geometry.apply(lambda p: p.x))
-        lats = list(gdf.geometry.apply(lambda p: p.y))
+        # the points are derived once per frame, a refresh replaces the frame
+        cached = self._points.get(collection)
+        if cached is not None and cached[0] is gdf:
+            return cached[1]
+        geometries = np.asarray(gdf.geometry)
+        lons = shapely.get_x(geometries)
+        lats = shapely.get_y(geometries)
         label = self.get_label(collection)
         if label:
-            labels = list(gdf[label])
+            labels = gdf[label].to_numpy()
         else:
-            labels = []
-            for i, row in gdf.iterrows():
-                dic = row.to_dict()
-                res = ""
-                for k, v in dic.items():
-                    res += f"{k}: {v}<br>"
-                labels.append(res[:-4])
+            labels = self._get_hover_labels(gdf)
         ccvar = self.get_color_code_config(collection).get("name")
-        values = list(gdf[ccvar]) if ccvar else None
-        return lons, lats, labels, values
+        values = gdf[ccvar].to_numpy() if ccvar else None
+        points = lons, lats, labels, values
+        self._points[collection] = (gdf, points)
+        return points
+
+    @staticmethod
+    def _get_hover_labels(gdf: gpd.GeoDataFrame) -> np.ndarray:
+        # "column: value" for every column, separated by line breaks
+        labels = np.full(len(gdf), "", dtype=object)
+        for i, column in enumerate(gdf.columns):
+            if column == gdf.geometry.name:
+                values = shapely.to_wkt(np.asarray(gdf[column]), rounding_precision=-1)
+            elif pd.api.types.is_datetime64_any_dtype(gdf[column]):
+                values = np.asarray(gdf[column].astype(str), dtype=object)
+            else:
+                values = np.asarray(gdf[column], dtype=str)
+            separator = "<br>" if i > 0 else ""
+            labels = labels + f"{separator}{column}: " + values.astype(object)
+        return labels
 
     def get_geometry_type(self, collection: str) -> str:
         gdf = self.get_df(collection)
@@ -240,27 +610,72 @@ class FeatureHandler:
             if geom.geom_type == "Polygon" or geom.geom_type == "MultiPolygon":
                 return "Polygon"
 
+    def _get_polygon_geometries(
+        self, collection: str, zoom: Optional[int]
+    ) -> Dict[str, Any]:
+        gdf = self.get_df(collection)
+        cached = self._polygon_data.get(collection)
+        if cached is None or cached[0] is not gdf:
+            cached = gdf, {}
+            self._polygon_data[collection] = cached
+        if zoom not in cached[1]:
+            geometries = np.asarray(gdf.geometry)
+            if zoom is not None:
+                geometries = shapely.simplify(
+                    geometries, _get_simplify_tolerance(zoom), preserve_topology=True
+                )
+            if "sitename" in gdf.columns:
+                names = gdf["sitename"].astype(str).to_numpy(dtype=object)
+            else:
+                names = np.full(len(gdf), "", dtype=object)
+            cached[1][zoom] = dict(
+                geometries=geometries,
+                bounds=shapely.bounds(geometries),
+                polygon_data=self._get_polygon_rings(geometries, names),
+                names=names,
+            )
+        return cached[1][zoom]
+
     def get_polygon_data(
-        self, df: gpd.GeoDataFrame
-    ) -> [List[float], List[float], List[str]]:
-        latitudes = []
-        longitudes = []
-        hover_texts = []
-
-        for idx, geom in enumerate(df.geometry):
-            if geom.geom_type == "Polygon":
-                lon = [coord[0] for coord in geom.exterior.coords] + [None]
-                lat = [coord[1] for coord in geom.exterior.coords] + [None]
-                latitudes += lat
-                longitudes += lon
-                hover_texts += [f"{df.iloc[idx]['sitename']}"] * len(lon)
-
-            elif geom.geom_type == "MultiPolygon":
-                for polygon in geom.geoms:
-                    lon = [coord[0] for coord in polygon.exterior.coords] + [None]
-                    lat = [coord[1] for coord in polygon.exterior.coords] + [None]
-                    latitudes += lat
-                    longitudes += lon
-                    hover_texts += [f"{df.iloc[idx]['sitename']}"] * len(lon)
+        self,
+        collection: str,
+        zoom: float = None,
+        bounds: Tuple[float, float, float, float] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # exterior rings of all polygons, separated by NaN coordinates; with a
+        # zoom level, rings are simplified to about one pixel at that zoom,
+        # with bounds, only polygons intersecting them are returned
+        polygon_geometries = self._get_polygon_geometries(
+            collection, _get_detail_level(zoom)
+        )
+        if bounds is None:
+            return polygon_geometries["polygon_data"]
+        min_lon, min_lat, max_lon, max_lat = bounds
+        geometry_bounds = polygon_geometries["bounds"]
+        in_bounds = (
+            (geometry_bounds[:, 0] <= max_lon)
+            & (geometry_bounds[:, 1] <= max_lat)
+            & (geometry_bounds[:, 2] >= min_lon)
+            & (geometry_bounds[:, 3] >= min_lat)
+        )
+        return self._get_polygon_rings(
+            polygon_geometries["geometries"][in_bounds],
+            polygon_geometries["names"][in_bounds],
+        )
 
+    @staticmethod
+    def _get_polygon_rings(
+        geometries: np.ndarray, names: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        polygons, geometry_index = shapely.get_parts(geometries, return_index=True)
+        is_polygon = shapely.get_type_id(polygons) == 3
+        polygons = polygons[is_polygon]
+        geometry_index = geometry_index[is_polygon]
+        rings = shapely.get_exterior_ring(polygons)
+        coords = shapely.get_coordinates(rings)
+        num_coords = shapely.get_num_coordinates(rings)
+        ring_ends = np.cumsum(num_coords)
+        longitudes = np.insert(coords[:, 0], ring_ends, np.nan)
+        latitudes = np.insert(coords[:, 1], ring_ends, np.nan)
+        hover_texts = np.repeat(names[geometry_index], num_coords + 1)
         return longitudes, latitudes, hover_texts
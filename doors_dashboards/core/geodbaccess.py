@@ -1,14 +1,28 @@
+from concurrent.futures import ThreadPoolExecutor
 import geopandas as gpd
+import math
+import numpy as np
+import pandas as pd
+import shapely
+import time
 from typing import Any
 from typing import Dict
+from typing import Iterator
 from typing import List
+from typing import Optional
 
 from xcube_geodb.core.geodb import GeoDBClient
 
+from doors_dashboards.core.constants import LOG
 from doors_dashboards.core.constants import REFERENCE_CRS
+from doors_dashboards.core.masking import get_mask_geometry
+from doors_dashboards.core.masking import mask_frame
 
 _GEODB_CLIENT = None
 _PART_SIZE = 100000
+_MAX_WORKERS = 4
+_SAMPLE_CELL_SIZE = 0.1
+DEFAULT_MAX_ROWS = 1000000
 
 
 def _get_client() -> GeoDBClient:
@@ -29,6 +43,197 @@ def get_collection_names_from_geodb():
     return list(doors_collections.collection)
 
 
+def _quote(column: str) -> str:
+    return '"' + column.replace('"', '""') + '"'
+
+
+def _get_select(columns: Optional[List[str]]) -> str:
+    if columns is None:
+        return "*"
+    return ", ".join(_quote(column) for column in dict.fromkeys(columns))
+
+
+def _get_mask_filter(
+    collection: str, database: str, mask: Optional[gpd.GeoDataFrame]
+) -> Optional[str]:
+    # rows outside of the bounding box of the mask are not transferred, the
+    # mask itself is applied to the parts
+    if mask is None:
+        return None
+    min_x, min_y, max_x, max_y = get_mask_geometry(mask).bounds
+    envelope = (
+        f"ST_MakeEnvelope({min_x!r}, {min_y!r}, {max_x!r}, {max_y!r}, "
+        f"{mask.crs.to_epsg()})"
+    )
+    srid = _get_client().get_collection_srid(collection, database=database)
+    if srid is not None and int(srid) != mask.crs.to_epsg():
+        envelope = f"ST_Transform({envelope}, {int(srid)})"
+    return f'ST_Intersects("geometry", {envelope})'
+
+
+def _join_filters(*filters: Optional[str]) -> Optional[str]:
+    filters = [f for f in filters if f]
+    if len(filters) < 2:
+        return filters[0] if filters else None
+    return " AND ".join(f"({f})" for f in filters)
+
+
+def _count_rows(collection: str, database: str, where: str = None) -> int:
+    geodb = _get_client()
+    if where is None:
+        return geodb.count_collection_rows(
+            collection, database=database, exact_count=True
+        )
+    counts = geodb.get_collection_pg(
+        collection, select="count(*)", where=where, database=database
+    )
+    return int(counts["count"].iloc[0])
+
+
+def _read_part(
+    collection: str,
+    database: str,
+    offset: int,
+    where: str = None,
+    select: str = "*",
+) -> Optional[gpd.GeoDataFrame]:
+    geodb = _get_client()
+    part = geodb.get_collection_pg(
+        collection,
+        select=select,
+        where=where,
+        order="id",
+        limit=_PART_SIZE,
+        offset=offset,
+        database=database,
+    )
+    if not isinstance(part, gpd.GeoDataFrame):
+        # geodb returns an empty data frame without geometries for empty results
+        return None
+    return part
+
+
+def _sample(gdf: gpd.GeoDataFrame, step: int) -> gpd.GeoDataFrame:
+    # keeps every step-th row per grid cell, so sparsely covered regions keep
+    # at least one row while dense regions are thinned out
+    bounds = shapely.bounds(gdf.geometry.values)
+    cell_x = np.floor(bounds[:, 0] / _SAMPLE_CELL_SIZE)
+    cell_y = np.floor(bounds[:, 1] / _SAMPLE_CELL_SIZE)
+    cells = pd.DataFrame(dict(x=cell_x, y=cell_y))
+    in_cell_index = cells.groupby(["x", "y"], sort=False, dropna=False).cumcount()
+    return gdf[in_cell_index.values % step == 0]
+
+
+def _prepare_part(
+    part: gpd.GeoDataFrame,
+    columns: Optional[List[str]],
+    mask: Optional[gpd.GeoDataFrame],
+    sample_step: int,
+) -> gpd.GeoDataFrame:
+    if columns is not None:
+        part = part[[c for c in part.columns if c in columns]]
+    if part.crs != REFERENCE_CRS:
+        part = part.to_crs(REFERENCE_CRS)
+    part = mask_frame(part, mask)
+    if sample_step > 1:
+        part = _sample(part, sample_step)
+    return part
+
+
+def read_parts_from_geodb(
+    collection: str,
+    database: str,
+    columns: List[str] = None,
+    mask: gpd.GeoDataFrame = None,
+    max_rows: Optional[int] = DEFAULT_MAX_ROWS,
+    max_workers: int = _MAX_WORKERS,
+    where: str = None,
+) -> Iterator[gpd.GeoDataFrame]:
+    # only the requested columns and the rows within the bounds of the mask
+    # are read
+    select = _get_select(columns)
+    mask_filter = _get_mask_filter(collection, database, mask)
+    if where is not None:
+        # the number of matching rows is unknown, so pages are read one after
+        # another until one is not full
+        where = _join_filters(where, mask_filter)
+        offset = 0
+        while True:
+            part = _read_part(collection, database, offset, where, select)
+            if part is None:
+                return
+            LOG.info(f"Read {offset + len(part)} rows of '{collection}' ({where})")
+            yield _prepare_part(part, columns, mask, 1)
+            if len(part) < _PART_SIZE:
+                return
+            offset += _PART_SIZE
+    num_rows = _count_rows(collection, database, mask_filter)
+    sample_step = 1
+    if max_rows and num_rows > max_rows:
+        sample_step = math.ceil(num_rows / max_rows)
+        LOG.info(
+            f"Collection '{collection}' has {num_rows} rows, "
+            f"sampling every {sample_step}th row per cell"
+        )
+    offsets = list(range(0, num_rows, _PART_SIZE))
+    start = time.perf_counter()
+    num_read = 0
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="doors-geodb"
+    ) as executor:
+        futures = [
+            executor.submit(
+                _read_part, collection, database, offset, mask_filter, select
+            )
+            for offset in offsets[:max_workers]
+        ]
+        next_offsets = offsets[max_workers:]
+        while futures:
+            part = futures.pop(0).result()
+            # keep at most max_workers requests in flight
+            if next_offsets:
+                futures.append(
+                    executor.submit(
+                        _read_part,
+                        collection,
+                        database,
+                        next_offsets.pop(0),
+                        mask_filter,
+                        select,
+                    )
+                )
+            if part is None:
+                continue
+            num_read += len(part)
+            duration = time.perf_counter() - start
+            LOG.info(
+                f"Read {num_read}/{num_rows} rows of '{collection}' "
+                f"({num_read / max(duration, 1e-6):.0f} rows/s)"
+            )
+            yield _prepare_part(part, columns, mask, sample_step)
+
+
+def convert_parameters_to_columns(
+    gdf: gpd.GeoDataFrame,
+    variables: List[str],
+    keys: List[str],
+    value: str,
+    parameter: str,
+) -> gpd.GeoDataFrame:
+    # every row gets the value of each variable measured for its keys; of
+    # several measurements for the same keys, the last one is used
+    long_df = gdf.loc[gdf[parameter].isin(variables), keys + [parameter, value]]
+    long_df = long_df.dropna(subset=keys)
+    long_df = long_df.drop_duplicates(subset=keys + [parameter], keep="last")
+    wide_df = long_df.pivot(index=keys, columns=parameter, values=value)
+    wide_df = wide_df.reindex(columns=variables)
+    merged = gdf[keys].merge(wide_df, how="left", left_on=keys, right_index=True)
+    gdf = gdf.copy()
+    for variable in variables:
+        gdf[variable] = merged[variable].values
+    return gdf
+
+
 def get_dataframe_from_geodb(
     collection: str,
     database: str,
@@ -38,41 +243,50 @@ def get_dataframe_from_geodb(
     label: str = None,
     levels: List[str] = None,
     mask: gpd.GeoDataFrame = None,
+    max_rows: Optional[int] = DEFAULT_MAX_ROWS,
+    where: str = None,
 ) -> gpd.GeoDataFrame:
-    geodb = _get_client()
-    num_rows = geodb.count_collection_rows(collection, database=database)
-    if num_rows > 1000000:
-        gdf = geodb.get_collection_pg(
-            collection, where="id % 100 = 0", database=database
-        )
-    else:
-        gdf = geodb.get_collection(collection, database=database)
-
-    gdf = gdf.sort_values("id")
-    if gdf.crs != REFERENCE_CRS:
-        gdf = gdf.to_crs(REFERENCE_CRS)
-    if mask is not None:
-        gdf = gdf.clip(mask)
-
-    if convert_from_parameters:
-        keys = convert_from_parameters.get("keys")
-        value = convert_from_parameters.get("value")
-        parameter = convert_from_parameters.get("parameter")
-        full = keys + [value]
-        for variable in variables:
-            sgdf = gdf[gdf[parameter] == variable][full]
-            for row, line in sgdf.iterrows():
-                loc_row = gdf[keys[0]] == line[keys[0]]
-                for key in keys[1:]:
-                    loc_row &= gdf[key] == line[key]
-                gdf.loc[loc_row, variable] = line[value]
-
     sub_gdf_list = ["geometry", name_of_time_column] + variables
     if levels:
         sub_gdf_list.extend(levels)
     if label:
         sub_gdf_list.append(label)
     sub_gdf_list = list(set(sub_gdf_list))
+
+    columns = sub_gdf_list + ["id"]
+    if convert_from_parameters:
+        # the variables are values of the parameter column
+        columns = [c for c in columns if c not in variables]
+        columns += convert_from_parameters.get("keys") + [
+            convert_from_parameters.get("value"),
+            convert_from_parameters.get("parameter"),
+        ]
+    parts = list(
+        read_parts_from_geodb(
+            collection,
+            database,
+            columns=columns,
+            mask=mask,
+            max_rows=max_rows,
+            where=where,
+        )
+    )
+    if len(parts) == 0:
+        return gpd.GeoDataFrame(
+            columns=sub_gdf_list, geometry="geometry", crs=REFERENCE_CRS
+        )
+    gdf = pd.concat(parts, ignore_index=True)
+    gdf = gdf.sort_values("id")
+
+    if convert_from_parameters:
+        gdf = convert_parameters_to_columns(
+            gdf,
+            variables,
+            convert_from_parameters.get("keys"),
+            convert_from_parameters.get("value"),
+            convert_from_parameters.get("parameter"),
+        )
+
     sub_gdf = gdf[sub_gdf_list]
 
     sub_gdf = sub_gdf.drop_duplicates()
@@ -0,0 +1,64 @@
+import geopandas as gpd
+import numpy as np
+import shapely
+import threading
+from typing import Optional
+import weakref
+
+# prepared union geometries of masks, by the id of the mask frame
+_MASK_GEOMETRIES = {}
+_MASK_GEOMETRIES_LOCK = threading.Lock()
+
+
+def get_mask_geometry(mask: gpd.GeoDataFrame) -> shapely.Geometry:
+    # masks are shared between collections, so their geometries are merged
+    # and prepared once
+    with _MASK_GEOMETRIES_LOCK:
+        cached = _MASK_GEOMETRIES.get(id(mask))
+        if cached is not None and cached[0]() is mask:
+            return cached[1]
+        geometry = mask.union_all()
+        shapely.prepare(geometry)
+        for key in [k for k, (ref, _) in _MASK_GEOMETRIES.items() if ref() is None]:
+            del _MASK_GEOMETRIES[key]
+        _MASK_GEOMETRIES[id(mask)] = (weakref.ref(mask), geometry)
+        return geometry
+
+
+def mask_frame(
+    gdf: gpd.GeoDataFrame, mask: Optional[gpd.GeoDataFrame]
+) -> gpd.GeoDataFrame:
+    # keeps the rows intersecting the mask, like gdf.clip(mask); points are
+    # only tested for intersection, other geometries are clipped
+    if mask is None or len(gdf) == 0:
+        return gdf
+    mask_geometry = get_mask_geometry(mask)
+    min_x, min_y, max_x, max_y = mask_geometry.bounds
+    geometries = np.asarray(gdf.geometry.values)
+    bounds = shapely.bounds(geometries)
+    candidates = np.flatnonzero(
+        (bounds[:, 0] <= max_x)
+        & (bounds[:, 1] <= max_y)
+        & (bounds[:, 2] >= min_x)
+        & (bounds[:, 3] >= min_y)
+    )
+    is_point = shapely.get_type_id(geometries[candidates]) == 0
+    points = candidates[is_point]
+    others = candidates[~is_point]
+    tree = shapely.STRtree(geometries[points])
+    points = points[tree.query(mask_geometry, predicate="intersects")]
+    others = others[shapely.intersects(mask_geometry, geometries[others])]
+    rows = np.sort(np.concatenate([points, others]))
+    masked = gdf.iloc[rows]
+    if len(others) == 0:
+        return masked
+    masked_geometries = geometries[rows]
+    is_clipped = np.isin(rows, others)
+    masked_geometries[is_clipped] = shapely.intersection(
+        geometries[others], mask_geometry
+    )
+    masked = masked.copy()
+    masked[gdf.geometry.name] = gpd.GeoSeries(
+        masked_geometries, index=masked.index, crs=gdf.crs
+    )
+    return masked
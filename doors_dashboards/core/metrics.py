@@ -0,0 +1,266 @@
+import dash
+from dash.exceptions import PreventUpdate
+import flask
+import functools
+import os
+import threading
+import time
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from doors_dashboards.core.constants import LOG
+
+METRICS_ROUTE = "/metrics"
+LOG_CALLBACKS_ENV_VAR = "DOORS_LOG_CALLBACKS"
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PAYLOAD_BUCKETS = (1e3, 1e4, 1e5, 1e6, 1e7)
+
+# flask.g attribute holding the callback handled by the current request
+_REQUEST_CALLBACK = "doors_callback"
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    escaped = [
+        (key, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in labels.items()
+    ]
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+def _get_key(name: str, dashboard_id: Optional[str]) -> Tuple[str, str]:
+    return name, dashboard_id or ""
+
+
+def _get_labels(key: Tuple[str, str]) -> Dict[str, str]:
+    # callbacks registered for every dashboard are told apart by the dashboard
+    name, dashboard_id = key
+    if not dashboard_id:
+        return dict(callback=name)
+    return dict(callback=name, dashboard=dashboard_id)
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Histogram:
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.count += 1
+        self.sum += value
+
+    def to_lines(self, name: str, labels: Dict[str, str]) -> List[str]:
+        lines = [
+            f"{name}_bucket{_format_labels(dict(labels, le=_format_value(bound)))} "
+            f"{count}"
+            for bound, count in zip(self.buckets, self.counts)
+        ]
+        lines.append(
+            f"{name}_bucket{_format_labels(dict(labels, le='+Inf'))} {self.count}"
+        )
+        lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(self.sum)}")
+        lines.append(f"{name}_count{_format_labels(labels)} {self.count}")
+        return lines
+
+
+class CallbackMetrics:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._durations = {}
+        self._request_sizes = {}
+        self._response_sizes = {}
+        self._exceptions = {}
+
+    def record_call(
+        self,
+        name: str,
+        duration: float,
+        exception: str = None,
+        dashboard_id: str = None,
+    ):
+        key = _get_key(name, dashboard_id)
+        with self._lock:
+            self._calls[key] = self._calls.get(key, 0) + 1
+            if key not in self._durations:
+                self._durations[key] = _Histogram(DURATION_BUCKETS)
+            self._durations[key].observe(duration)
+            if exception is not None:
+                exception_key = (key, exception)
+                self._exceptions[exception_key] = (
+                    self._exceptions.get(exception_key, 0) + 1
+                )
+
+    def record_payload(
+        self,
+        name: str,
+        request_size: Optional[int],
+        response_size: Optional[int],
+        dashboard_id: str = None,
+    ):
+        key = _get_key(name, dashboard_id)
+        with self._lock:
+            for sizes, size in [
+                (self._request_sizes, request_size),
+                (self._response_sizes, response_size),
+            ]:
+                if size is None:
+                    continue
+                if key not in sizes:
+                    sizes[key] = _Histogram(PAYLOAD_BUCKETS)
+                sizes[key].observe(size)
+
+    def get_calls(self, name: str, dashboard_id: str = None) -> int:
+        with self._lock:
+            return self._calls.get(_get_key(name, dashboard_id), 0)
+
+    def get_exceptions(self, name: str, dashboard_id: str = None) -> Dict[str, int]:
+        with self._lock:
+            return {
+                exception: count
+                for (key, exception), count in self._exceptions.items()
+                if key == _get_key(name, dashboard_id)
+            }
+
+    def to_prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            lines.append("# HELP doors_callback_calls_total Callback invocations.")
+            lines.append("# TYPE doors_callback_calls_total counter")
+            for key, count in sorted(self._calls.items()):
+                labels = _format_labels(_get_labels(key))
+                lines.append(f"doors_callback_calls_total{labels} {count}")
+            for metric, help_text, histograms in [
+                (
+                    "doors_callback_duration_seconds",
+                    "Time spent in callbacks.",
+                    self._durations,
+                ),
+                (
+                    "doors_callback_request_bytes",
+                    "Size of callback requests.",
+                    self._request_sizes,
+                ),
+                (
+                    "doors_callback_response_bytes",
+                    "Size of callback responses.",
+                    self._response_sizes,
+                ),
+            ]:
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} histogram")
+                for key, histogram in sorted(histograms.items()):
+                    lines.extend(histogram.to_lines(metric, _get_labels(key)))
+            lines.append(
+                "# HELP doors_callback_exceptions_total Exceptions raised by callbacks."
+            )
+            lines.append("# TYPE doors_callback_exceptions_total counter")
+            for (key, exception), count in sorted(self._exceptions.items()):
+                labels = _format_labels(dict(_get_labels(key), exception=exception))
+                lines.append(f"doors_callback_exceptions_total{labels} {count}")
+        return "\n".join(lines) + "\n"
+
+
+_METRICS = CallbackMetrics()
+
+
+def get_callback_metrics() -> CallbackMetrics:
+    return _METRICS
+
+
+def _log_callbacks() -> bool:
+    return os.getenv(LOG_CALLBACKS_ENV_VAR, "false").lower() in ["1", "true", "yes"]
+
+
+def _log_call(
+    name: str,
+    dashboard_id: Optional[str],
+    duration: float,
+    request_size: Optional[int] = None,
+    response_size: Optional[int] = None,
+):
+    message = f"Callback '{name}'"
+    if dashboard_id:
+        message += f" of dashboard '{dashboard_id}'"
+    message += f" took {duration * 1000:.1f} ms"
+    if request_size is not None and response_size is not None:
+        message += f", received {request_size} bytes, sent {response_size} bytes"
+    LOG.info(message)
+
+
+def _timed(name: str, function: Callable, dashboard_id: str = None) -> Callable:
+    @functools.wraps(function)
+    def timed_function(*args, **kwargs):
+        exception = None
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        except PreventUpdate:
+            raise
+        except Exception as e:
+            exception = type(e).__name__
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            _METRICS.record_call(name, duration, exception, dashboard_id)
+            if flask.has_request_context():
+                # payload sizes are recorded when the response is sent
+                setattr(flask.g, _REQUEST_CALLBACK, (name, dashboard_id, duration))
+            elif _log_callbacks():
+                _log_call(name, dashboard_id, duration)
+
+    return timed_function
+
+
+def callback(*args, dashboard_id: str = None, **kwargs) -> Callable:
+    # registers a dash callback like dash.callback and records its metrics
+    # under the name of the decorated function and the dashboard it is
+    # registered for
+    register = dash.callback(*args, **kwargs)
+
+    def decorator(function: Callable) -> Callable:
+        return register(_timed(function.__name__, function, dashboard_id))
+
+    return decorator
+
+
+def _get_payload_sizes(
+    response: flask.Response,
+) -> Tuple[Optional[int], Optional[int]]:
+    request_size = flask.request.content_length
+    response_size = None if response.is_streamed else len(response.get_data())
+    return request_size, response_size
+
+
+def register_metrics(server: flask.Flask):
+    @server.after_request
+    def record_callback_payload(response: flask.Response) -> flask.Response:
+        request_callback = getattr(flask.g, _REQUEST_CALLBACK, None)
+        if request_callback is None:
+            return response
+        name, dashboard_id, duration = request_callback
+        request_size, response_size = _get_payload_sizes(response)
+        _METRICS.record_payload(name, request_size, response_size, dashboard_id)
+        if _log_callbacks():
+            _log_call(name, dashboard_id, duration, request_size, response_size)
+        return response
+
+    @server.route(METRICS_ROUTE)
+    def get_metrics():
+        return flask.Response(
+            _METRICS.to_prometheus(), mimetype="text/plain; version=0.0.4"
+        )
@@ -0,0 +1,27 @@
+import geopandas as gpd
+import numpy as np
+import shapely
+
+
+class PointIndex:
+
+    def __init__(self, geometries: gpd.GeoSeries):
+        geometry_values = np.asarray(geometries.values)
+        xs = shapely.get_x(geometry_values)
+        ys = shapely.get_y(geometry_values)
+        # sorted by x first and by y second, non-point geometries (nan) are
+        # sorted to the end and never found
+        self._order = np.lexsort((ys, xs))
+        self._xs = xs[self._order]
+        self._ys = ys[self._order]
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def lookup(self, x: float, y: float) -> np.ndarray:
+        x_start = np.searchsorted(self._xs, x, side="left")
+        x_end = np.searchsorted(self._xs, x, side="right")
+        ys = self._ys[x_start:x_end]
+        y_start = np.searchsorted(ys, y, side="left")
+        y_end = np.searchsorted(ys, y, side="right")
+        return np.sort(self._order[x_start + y_start : x_start + y_end])
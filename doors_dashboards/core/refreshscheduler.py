@@ -0,0 +1,77 @@
+import threading
+import time
+from typing import Optional
+
+from doors_dashboards.core.constants import LOG
+from doors_dashboards.core.featurehandler import FeatureHandler
+
+
+class _RefreshJob:
+
+    def __init__(self, feature_handler: FeatureHandler, interval: float):
+        self.feature_handler = feature_handler
+        self.interval = interval
+        self.due = time.monotonic() + interval
+
+
+class RefreshScheduler:
+
+    def __init__(self):
+        self._jobs = []
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopped = False
+
+    def add(self, feature_handler: FeatureHandler, interval: float):
+        with self._condition:
+            self._jobs.append(_RefreshJob(feature_handler, interval))
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="doors-refresh", daemon=True
+                )
+                self._thread.start()
+            self._condition.notify()
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+
+    def _get_due_job(self) -> Optional[_RefreshJob]:
+        with self._condition:
+            while not self._stopped:
+                job = min(self._jobs, key=lambda j: j.due)
+                timeout = job.due - time.monotonic()
+                if timeout <= 0:
+                    job.due = time.monotonic() + job.interval
+                    return job
+                self._condition.wait(timeout)
+            return None
+
+    def _run(self):
+        while True:
+            job = self._get_due_job()
+            if job is None:
+                return
+            start = time.perf_counter()
+            try:
+                changed = job.feature_handler.refresh()
+            except Exception as e:
+                LOG.warning(f"Could not refresh collections: {e}")
+                continue
+            LOG.debug(
+                f"Refreshed collections {job.feature_handler.get_collections()} "
+                f"in {time.perf_counter() - start:.2f}s, changed: {changed}"
+            )
+
+
+_REFRESH_SCHEDULER = None
+_REFRESH_SCHEDULER_LOCK = threading.Lock()
+
+
+def get_refresh_scheduler() -> RefreshScheduler:
+    global _REFRESH_SCHEDULER
+    with _REFRESH_SCHEDULER_LOCK:
+        if _REFRESH_SCHEDULER is None:
+            _REFRESH_SCHEDULER = RefreshScheduler()
+        return _REFRESH_SCHEDULER
@@ -0,0 +1,39 @@
+from concurrent.futures import Future
+import threading
+from typing import Callable
+from typing import Dict
+from typing import Hashable
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+# runs a load at most once per key at a time: the first caller loads, callers
+# coming in while the load is running wait for and share its result
+class SingleFlight:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._futures: Dict[Hashable, Future] = {}
+
+    def do(self, key: Hashable, load: Callable[[], T]) -> T:
+        with self._lock:
+            future = self._futures.get(key)
+            is_loader = future is None
+            if is_loader:
+                future = Future()
+                self._futures[key] = future
+        if not is_loader:
+            return future.result()
+        try:
+            result = load()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            # failed loads are not kept, the next caller tries again
+            with self._lock:
+                del self._futures[key]
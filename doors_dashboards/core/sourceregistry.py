@@ -0,0 +1,98 @@
+import threading
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Hashable
+from typing import Optional
+
+from doors_dashboards.core.constants import LOG
+from doors_dashboards.core.singleflight import SingleFlight
+
+
+class _Entry:
+
+    def __init__(self, value: Any):
+        # None marks a value that has to be loaded again
+        self.value = value
+        self.references = 0
+
+
+# holds sources like collection frames and EEZ outlines that are used by
+# several dashboards once per process; values are shared and must not be
+# modified by the holders
+class SourceRegistry:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, _Entry] = {}
+        self._loads = SingleFlight()
+
+    def acquire(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        # returns the value for the key, loading it if it is not registered;
+        # every acquire must be matched by a release
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.value is not None:
+                entry.references += 1
+                return entry.value
+        value = self._loads.do(key, lambda: self._load(key, load))
+        with self._lock:
+            entry = self._entries.setdefault(key, _Entry(value))
+            entry.references += 1
+            return entry.value if entry.value is not None else value
+
+    def _load(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.value is not None:
+                return entry.value
+        value = load()
+        with self._lock:
+            self._entries.setdefault(key, _Entry(None)).value = value
+        return value
+
+    def release(self, key: Hashable):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.references -= 1
+            if entry.references <= 0:
+                del self._entries[key]
+                LOG.debug(f"Evicted source '{key}'")
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry.value if entry is not None else None
+
+    def get_references(self, key: Hashable) -> int:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry.references if entry is not None else 0
+
+    def update(self, key: Hashable, value: Any):
+        # replaces a refreshed value, holders pick it up with get
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.value = value
+
+    def invalidate(self, key: Hashable):
+        # the value is loaded again on the next acquire, current holders
+        # keep the value they have
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.value = None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_SOURCE_REGISTRY = SourceRegistry()
+
+
+def get_source_registry() -> SourceRegistry:
+    return _SOURCE_REGISTRY
@@ -0,0 +1,148 @@
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from typing import Callable
+from typing import Dict
+from typing import Optional
+
+from doors_dashboards.core.constants import LOG
+from doors_dashboards.core.featurecache import get_cache_dir
+
+TILE_CACHE_MAX_AGE_ENV_VAR = "DOORS_TILE_CACHE_MAX_AGE"
+TILE_CACHE_MAX_SIZE_ENV_VAR = "DOORS_TILE_CACHE_MAX_SIZE"
+DEFAULT_TILE_CACHE_MAX_AGE = 7 * 24 * 60 * 60
+DEFAULT_TILE_CACHE_MAX_SIZE = 256 * 1024 * 1024
+TILES_SUB_DIR = "tiles"
+
+_ENTRY_SUFFIX = ".bin"
+
+
+class TileCache:
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_age: Optional[float] = DEFAULT_TILE_CACHE_MAX_AGE,
+        max_size: int = DEFAULT_TILE_CACHE_MAX_SIZE,
+    ):
+        self._cache_dir = cache_dir
+        self._max_age = max_age
+        self._max_size = max_size
+        os.makedirs(self._cache_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._size = sum(
+            os.path.getsize(os.path.join(self._cache_dir, name))
+            for name in os.listdir(self._cache_dir)
+            if name.endswith(_ENTRY_SUFFIX)
+        )
+
+    @classmethod
+    def from_env(cls) -> "TileCache":
+        # tiles are cached even without a configured cache directory
+        cache_dir = get_cache_dir(TILES_SUB_DIR) or os.path.join(
+            tempfile.gettempdir(), "doors-tiles"
+        )
+        max_age = float(
+            os.environ.get(TILE_CACHE_MAX_AGE_ENV_VAR, DEFAULT_TILE_CACHE_MAX_AGE)
+        )
+        max_size = int(
+            os.environ.get(TILE_CACHE_MAX_SIZE_ENV_VAR, DEFAULT_TILE_CACHE_MAX_SIZE)
+        )
+        return cls(cache_dir, max_age, max_size)
+
+    @property
+    def cache_dir(self) -> str:
+        return self._cache_dir
+
+    def _path(self, key: str) -> str:
+        name = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self._cache_dir, f"{name}{_ENTRY_SUFFIX}")
+
+    def _get_key_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _read(self, path: str, max_age: Optional[float]) -> Optional[bytes]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if max_age is not None and time.time() - stat.st_mtime > max_age:
+            return None
+        try:
+            with open(path, "rb") as entry_file:
+                data = entry_file.read()
+            # the access time orders entries for eviction
+            os.utime(path, (time.time(), stat.st_mtime))
+        except OSError:
+            return None
+        return data
+
+    def get(
+        self,
+        key: str,
+        fetch: Callable[[], Optional[bytes]],
+        max_age: Optional[float] = None,
+    ) -> Optional[bytes]:
+        max_age = self._max_age if max_age is None else max_age
+        path = self._path(key)
+        data = self._read(path, max_age)
+        if data is not None:
+            return data
+        # concurrent requests for the same entry fetch it only once
+        with self._get_key_lock(key):
+            data = self._read(path, max_age)
+            if data is not None:
+                return data
+            data = fetch()
+            if data is not None:
+                self._write(path, data)
+        with self._lock:
+            self._key_locks.pop(key, None)
+        return data
+
+    def _write(self, path: str, data: bytes):
+        old_size = os.path.getsize(path) if os.path.exists(path) else 0
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as entry_file:
+                entry_file.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            LOG.warning(f"Could not write tile cache entry: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        with self._lock:
+            self._size += len(data) - old_size
+            if self._size > self._max_size:
+                self._evict()
+
+    def _evict(self):
+        # least recently used entries are removed until a tenth of the
+        # maximum size is free again
+        entries = []
+        for name in os.listdir(self._cache_dir):
+            if name.endswith(_ENTRY_SUFFIX):
+                try:
+                    stat = os.stat(os.path.join(self._cache_dir, name))
+                except OSError:
+                    continue
+                entries.append((stat.st_atime, stat.st_size, name))
+        entries.sort()
+        size = sum(entry[1] for entry in entries)
+        num_evicted = 0
+        for _, entry_size, name in entries:
+            if size <= self._max_size * 0.9:
+                break
+            try:
+                os.remove(os.path.join(self._cache_dir, name))
+            except OSError:
+                continue
+            size -= entry_size
+            num_evicted += 1
+        self._size = size
+        LOG.debug(f"Evicted {num_evicted} entries from tile cache")
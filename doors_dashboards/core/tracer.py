@@ -0,0 +1,186 @@
+from contextlib import contextmanager
+from contextlib import nullcontext
+import json
+import os
+import threading
+import time
+import tracemalloc
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from doors_dashboards.core.constants import LOG
+
+TRACE_DIR_ENV_VAR = "DOORS_STARTUP_TRACE"
+STARTUP_PROFILE_ID = "startup"
+
+
+class _Frame:
+
+    def __init__(
+        self, name: str, profile_id: str, path: List[str], start_memory: int = 0
+    ):
+        self.name = name
+        self.profile_id = profile_id
+        self.path = path
+        self.start = time.perf_counter()
+        self.start_memory = start_memory
+        self.peak_memory = start_memory
+        self.children_duration = 0.0
+
+
+class StartupTracer:
+
+    def __init__(self, output_dir: str):
+        self._output_dir = output_dir
+        self._origin = time.perf_counter()
+        self._phases = {}
+        self._lock = threading.Lock()
+        self._report_lock = threading.Lock()
+        self._local = threading.local()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @classmethod
+    def from_env(cls) -> Optional["StartupTracer"]:
+        output_dir = os.environ.get(TRACE_DIR_ENV_VAR)
+        if not output_dir:
+            return None
+        return cls(output_dir)
+
+    def _get_stack(self) -> List[_Frame]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def trace(self, name: str, profile_id: str = None):
+        stack = self._get_stack()
+        parent = stack[-1] if stack else None
+        if parent is not None:
+            parent.peak_memory = max(
+                parent.peak_memory, tracemalloc.get_traced_memory()[1]
+            )
+        # memory is sampled before the phase is set up; sampling it later
+        # counts tracer objects freed during the phase against the phase
+        tracemalloc.reset_peak()
+        start_memory = tracemalloc.get_traced_memory()[0]
+        if profile_id is None:
+            profile_id = parent.profile_id if parent else STARTUP_PROFILE_ID
+        # phases of a dashboard start a new flame graph in its own profile
+        if parent and parent.profile_id == profile_id:
+            path = parent.path + [name]
+        else:
+            path = [name]
+        frame = _Frame(name, profile_id, path, start_memory)
+        stack.append(frame)
+        try:
+            yield
+        finally:
+            stack.pop()
+            duration = time.perf_counter() - frame.start
+            # tracemalloc is process-wide, so phases running concurrently in
+            # other threads add to the measured peak
+            frame.peak_memory = max(
+                frame.peak_memory, tracemalloc.get_traced_memory()[1]
+            )
+            tracemalloc.reset_peak()
+            if parent is not None:
+                parent.children_duration += duration
+                parent.peak_memory = max(parent.peak_memory, frame.peak_memory)
+            phase = dict(
+                name=name,
+                path=frame.path,
+                start=frame.start - self._origin,
+                duration=duration,
+                self_duration=duration - frame.children_duration,
+                peak_memory=frame.peak_memory - frame.start_memory,
+            )
+            with self._lock:
+                self._phases.setdefault(profile_id, []).append(phase)
+
+    def get_context(self) -> Optional[_Frame]:
+        stack = self._get_stack()
+        return stack[-1] if stack else None
+
+    @contextmanager
+    def continue_trace(self, context: Optional[_Frame]):
+        # phases traced in another thread are nested under the phase that was
+        # current in the thread handing work over; they are not added to its
+        # duration, as they may run concurrently
+        if context is None:
+            yield
+            return
+        stack = self._get_stack()
+        stack.append(_Frame(context.name, context.profile_id, context.path))
+        try:
+            yield
+        finally:
+            stack.pop()
+
+    def get_profile(self, profile_id: str) -> List[Dict]:
+        with self._lock:
+            return sorted(self._phases.get(profile_id, []), key=lambda p: p["start"])
+
+    def get_profile_ids(self) -> List[str]:
+        with self._lock:
+            return list(self._phases.keys())
+
+    def write_report(self):
+        # reports may be written from the threads building lazy dashboards
+        with self._report_lock:
+            self._write_report()
+
+    def _write_report(self):
+        os.makedirs(self._output_dir, exist_ok=True)
+        for profile_id in self.get_profile_ids():
+            phases = self.get_profile(profile_id)
+            json_path = os.path.join(self._output_dir, f"{profile_id}.json")
+            with open(json_path, "w") as json_file:
+                json.dump(dict(id=profile_id, phases=phases), json_file, indent=2)
+            # folded stacks as consumed by flamegraph.pl or speedscope
+            folded_path = os.path.join(self._output_dir, f"{profile_id}.folded")
+            with open(folded_path, "w") as folded_file:
+                for phase in phases:
+                    stack = ";".join(p.replace(";", ",") for p in phase["path"])
+                    micros = max(int(phase["self_duration"] * 1e6), 0)
+                    folded_file.write(f"{stack} {micros}\n")
+            top_phases = [p for p in phases if len(p["path"]) == 1]
+            print(
+                f"{profile_id}: "
+                f"{sum(p['duration'] for p in top_phases):.2f}s, "
+                f"peak {max(p['peak_memory'] for p in top_phases) / 2**20:.1f} MiB"
+            )
+            for phase in phases:
+                indent = "  " * len(phase["path"])
+                print(
+                    f"{indent}{phase['name']}: {phase['duration']:.3f}s, "
+                    f"peak {phase['peak_memory'] / 2**20:.1f} MiB"
+                )
+        LOG.info(f"Wrote startup profiles to {self._output_dir}")
+
+
+_TRACER = StartupTracer.from_env()
+
+
+def trace(name: str, profile_id: str = None):
+    if _TRACER is None:
+        return nullcontext()
+    return _TRACER.trace(name, profile_id)
+
+
+def get_trace_context():
+    if _TRACER is None:
+        return None
+    return _TRACER.get_context()
+
+
+def continue_trace(context):
+    if _TRACER is None:
+        return nullcontext()
+    return _TRACER.continue_trace(context)
+
+
+def write_report():
+    if _TRACER is not None:
+        _TRACER.write_report()
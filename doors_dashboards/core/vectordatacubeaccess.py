@@ -1,10 +1,19 @@
 import geopandas as gpd
+import numpy as np
+import shapely
+import threading
 from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
 import xvec
 
 from xcube.core.store import new_data_store
 
 from doors_dashboards.core.constants import LOG
+from doors_dashboards.core.masking import get_mask_geometry
+from doors_dashboards.core.masking import mask_frame
+from doors_dashboards.core.singleflight import SingleFlight
 
 REFERENCE_CRS = "EPSG:4326"
 _VECTOR_DATA_CUBES = {}
@@ -16,8 +25,15 @@ class VectorDataCubeAccessor:
         self._vdcs = {}
         self._gdfs = {}
         self._label_to_var = {}
+        self._store_lock = threading.Lock()
+        self._vdc_loads = SingleFlight()
+        self._gdf_loads = SingleFlight()
 
     def _get_store(self, bucket: str):
+        with self._store_lock:
+            return self._get_or_create_store(bucket)
+
+    def _get_or_create_store(self, bucket: str):
         if bucket not in self._vdc_stores:
             storage_options = dict(
                 anon=False
@@ -32,15 +48,33 @@ class VectorDataCubeAccessor:
 
     def _get_vdc(self, filename: str, bucket: str):
         data_id = f"{bucket}/{filename}"
-        if data_id not in self._vdcs:
-            store = self._get_store(bucket)
-            vdc = store.open_data(filename)
-            try:
-                vdc = vdc.xvec.decode_cf()
-            except:
-                LOG.warning(f"Could not decode dataset '{data_id}'")
-            self._vdcs[data_id] = vdc
-        return self._vdcs[data_id]
+        vdc = self._vdcs.get(data_id)
+        if vdc is None:
+            vdc = self._vdc_loads.do(
+                data_id, lambda: self._open_vdc(filename, bucket, data_id)
+            )
+        return vdc
+
+    def _open_vdc(self, filename: str, bucket: str, data_id: str):
+        if data_id in self._vdcs:
+            return self._vdcs[data_id]
+        store = self._get_store(bucket)
+        vdc = store.open_data(filename)
+        try:
+            vdc = vdc.xvec.decode_cf()
+        except:
+            LOG.warning(f"Could not decode dataset '{data_id}'")
+        self._vdcs[data_id] = vdc
+        return vdc
+
+    @staticmethod
+    def _intersects(vdc, geometry_name: str, mask: gpd.GeoDataFrame = None) -> bool:
+        crs = getattr(vdc.xindexes.get(geometry_name), "crs", None)
+        if mask is None or crs is None:
+            return True
+        geometries = gpd.GeoSeries(vdc[geometry_name].values, crs=crs)
+        geometries = np.asarray(geometries.to_crs(REFERENCE_CRS).values)
+        return shapely.intersects(get_mask_geometry(mask), geometries).any()
 
     def get_dataframe_from_vector_data_cube(
         self,
@@ -51,33 +85,74 @@ class VectorDataCubeAccessor:
         time_stamp_name: str = None,
         collection_coord: str = None,
         mask: gpd.GeoDataFrame = None,
+        time_range: Sequence[Optional[str]] = None,
     ) -> gpd.GeoDataFrame:
-        gdf_id = f"{bucket}/{filename}/{collection}"
-        if gdf_id not in self._gdfs:
-            vdc = self._get_vdc(filename, bucket)
-            for j, coord in enumerate(vdc.xvec.geom_coords):
-                geometry_name = coord
-                break
-            labels = vdc[collection_coord].values
-            index = list(labels).index(collection)
-            sub_vdc = vdc.isel({geometry_name: index})
-            sub_gdf = sub_vdc.xvec.to_geodataframe(geometry=geometry_name)
-            sub_gdf = sub_gdf.reset_index()
-            LOG.debug("Created sub-geodataframe")
-            if sub_gdf.crs != REFERENCE_CRS:
-                sub_gdf = sub_gdf.to_crs(REFERENCE_CRS)
-            self._gdfs[gdf_id] = sub_gdf
-        gdf = self._gdfs[gdf_id]
-        variables = variables.copy()
-        if "geometry" not in variables:
-            variables.append("geometry")
-        if time_stamp_name not in variables:
-            variables.append(time_stamp_name)
-        gdf = gdf[variables]
-        if mask is not None:
-            gdf = gdf.clip(mask)
+        variables = [v for v in variables if v not in ["geometry", time_stamp_name]]
+        time_range = tuple(time_range) if time_range else None
+        gdf_id = (bucket, filename, collection, tuple(variables), time_range)
+        gdf = self._gdfs.get(gdf_id)
+        if gdf is None:
+            gdf = self._gdf_loads.do(
+                gdf_id,
+                lambda: self._read_gdf(
+                    gdf_id,
+                    filename,
+                    bucket,
+                    variables,
+                    collection,
+                    time_stamp_name,
+                    collection_coord,
+                    mask,
+                    time_range,
+                ),
+            )
+        if gdf is None:
+            LOG.debug(f"Collection '{collection}' is outside of the mask")
+            return gpd.GeoDataFrame(
+                columns=variables + ["geometry", time_stamp_name],
+                geometry="geometry",
+                crs=REFERENCE_CRS,
+            )
+        gdf = gdf[variables + ["geometry", time_stamp_name]]
+        gdf = mask_frame(gdf, mask)
         return gdf
 
+    def _read_gdf(
+        self,
+        gdf_id: Tuple,
+        filename: str,
+        bucket: str,
+        variables: List[str],
+        collection: str,
+        time_stamp_name: str,
+        collection_coord: str,
+        mask: Optional[gpd.GeoDataFrame],
+        time_range: Optional[Tuple],
+    ) -> Optional[gpd.GeoDataFrame]:
+        if gdf_id in self._gdfs:
+            return self._gdfs[gdf_id]
+        vdc = self._get_vdc(filename, bucket)
+        for j, coord in enumerate(vdc.xvec.geom_coords):
+            geometry_name = coord
+            break
+        labels = vdc[collection_coord].values
+        index = list(labels).index(collection)
+        # the cube is opened lazily, so only the chunks holding the
+        # selected variables, geometry and time range are read
+        sub_vdc = vdc[variables].isel({geometry_name: [index]})
+        if not self._intersects(sub_vdc, geometry_name, mask):
+            return None
+        if time_range is not None:
+            sub_vdc = sub_vdc.sel({time_stamp_name: slice(*time_range)})
+        sub_vdc = sub_vdc.compute()
+        sub_gdf = sub_vdc.xvec.to_geodataframe(geometry=geometry_name)
+        sub_gdf = sub_gdf.reset_index()
+        LOG.debug("Created sub-geodataframe")
+        if sub_gdf.crs != REFERENCE_CRS:
+            sub_gdf = sub_gdf.to_crs(REFERENCE_CRS)
+        self._gdfs[gdf_id] = sub_gdf
+        return sub_gdf
+
     def get_label(
             self,
             filename: str,
@@ -1,15 +1,20 @@
-from dash import dcc, callback, Output, Input, State
+from dash import dcc, no_update, Output, Input, State
 from dash import html
 import dash_bootstrap_components as dbc
 from typing import Dict, List
 
+from doors_dashboards.components.constant import COLLECTION
 from doors_dashboards.components.constant import FONT_COLOR
+from doors_dashboards.components.constant import VERSION
 from doors_dashboards.components.meteogram import MeteogramComponent
 from doors_dashboards.components.scattermap import ScatterMapComponent
 from doors_dashboards.components.scatterplot import ScatterplotComponent
 from doors_dashboards.components.selectcollection import SelectCollectionComponent
 from doors_dashboards.components.timeseries import TimeSeriesComponent
 from doors_dashboards.core.featurehandler import FeatureHandler
+from doors_dashboards.core.metrics import callback
+from doors_dashboards.core.refreshscheduler import get_refresh_scheduler
+from doors_dashboards.core.tracer import trace
 import doors_dashboards.components.infomodal as info_modal
 
 _COMPONENTS = {
@@ -20,8 +25,16 @@ _COMPONENTS = {
     "selectcollection": SelectCollectionComponent,
 }
 
+# clients only compare versions, so they may ask more often than data changes
+_VERSION_POLL_INTERVAL = 60
+
 
 def create_dashboard(config: Dict) -> html.Div:
+    with trace("create dashboard"):
+        return _create_dashboard(config)
+
+
+def _create_dashboard(config: Dict) -> html.Div:
     dashboard_id = config.get("id")
     dashboard_title = config.get("title")
     dashboard_description = config.get("description")
@@ -36,6 +49,8 @@ def create_dashboard(config: Dict) -> html.Div:
     component_placements = dict(top=[], left=[], right=[], bottom=[])
 
     feature_handler = FeatureHandler(config.get("features"), config.get("eez"))
+    # collections are read concurrently while the components are set up
+    feature_handler.prefetch()
 
     for component, component_dict in config.get("components", dict()).items():
         components[component] = _COMPONENTS[component](dashboard_id)
@@ -58,9 +73,10 @@ def create_dashboard(config: Dict) -> html.Div:
             sub_component_params = (
                 config.get("components", {}).get(main_component, {}).get(sub_component)
             )
-            component_div = components[main_component].get(
-                sub_component, sub_component, sub_component_params
-            )
+            with trace(f"get {main_component}/{sub_component}"):
+                component_div = components[main_component].get(
+                    sub_component, sub_component, sub_component_params
+                )
             place_children.append(component_div)
         if placement == "top":
             top_children[placement] = dbc.Col(place_children, className="col m-1")
@@ -135,7 +151,7 @@ def create_dashboard(config: Dict) -> html.Div:
         layout_children.append(
             dcc.Interval(
                 id=f"{dashboard_id}-interval",
-                interval=update_interval * 1000,
+                interval=min(update_interval, _VERSION_POLL_INTERVAL) * 1000,
                 n_intervals=0,
             )
         )
@@ -156,20 +172,27 @@ def create_dashboard(config: Dict) -> html.Div:
     #     return is_open
 
     if update_interval is not None:
+        get_refresh_scheduler().add(feature_handler, update_interval)
 
         @callback(
-            Output("none", "children", allow_duplicate=True),
+            Output(store_ids["general"], "data", allow_duplicate=True),
             [Input(f"{dashboard_id}-interval", "n_intervals")],
+            State(store_ids["general"], "data"),
             prevent_initial_call=True,
+            dashboard_id=dashboard_id,
         )
-        def get_new_data(interval):
-            collections = feature_handler.get_collections()
-            for collection in collections:
-                feature_handler.delete_df(collection)
-                # trigger immediate re-reading
-                _ = feature_handler.get_df(collection)
-
-    for component in components.values():
-        component.register_callbacks(list(components.keys()), dashboard_id)
+        def update_general_store_after_refresh(interval, general_data):
+            version = feature_handler.get_version()
+            general_data = general_data or {}
+            if general_data.get(VERSION, 0) == version:
+                return no_update
+            general_data[VERSION] = version
+            if COLLECTION not in general_data:
+                general_data[COLLECTION] = feature_handler.get_default_collection()
+            return general_data
+
+    for component_name, component in components.items():
+        with trace(f"register callbacks {component_name}"):
+            component.register_callbacks(list(components.keys()), dashboard_id)
 
     return layout
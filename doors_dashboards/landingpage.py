@@ -4,24 +4,33 @@ from dash import dcc
 from dash import html
 from dash import Input
 from dash import Output
+from dash import Patch
 from dash import State
 import dash_bootstrap_components as dbc
 import os
-import plotly.graph_objs as go
 import sys
 from waitress import serve
 
-import doors_dashboards.components.consentmodal as consent_modal
-import doors_dashboards.components.imprintmodal as imprint_modal
-import doors_dashboards.components.helpmodal as help_modal
-from doors_dashboards.core.constants import DEFAULT_LOG_LEVEL
-from doors_dashboards.components.constant import FONT_COLOR
-from doors_dashboards.core.constants import LOG
-import doors_dashboards.components.settingsmodal as settings_modal
-from doors_dashboards.components.settingsmodal import SELECT_MAP_STYLE_DRP
+from doors_dashboards.core.tracer import trace
+from doors_dashboards.core.tracer import write_report
 
-from doors_dashboards.home import register_homepage
-from doors_dashboards.pages import register_pages
+with trace("import modules"):
+    import doors_dashboards.components.consentmodal as consent_modal
+    import doors_dashboards.components.imprintmodal as imprint_modal
+    import doors_dashboards.components.helpmodal as help_modal
+    from doors_dashboards.core.constants import DEFAULT_LOG_LEVEL
+    from doors_dashboards.components.constant import FONT_COLOR
+    from doors_dashboards.core.constants import LOG
+    import doors_dashboards.components.settingsmodal as settings_modal
+    from doors_dashboards.components.settingsmodal import SELECT_MAP_STYLE_DRP
+    from doors_dashboards.core.metrics import callback
+    from doors_dashboards.core.metrics import register_metrics
+
+    from doors_dashboards.components.scattermap import register_tile_proxy
+    from doors_dashboards.home import register_homepage
+    from doors_dashboards.pages import prewarm_pages
+    from doors_dashboards.pages import register_pages
+    from doors_dashboards.pages import wait_for_pages
 
 external_stylesheets = [
     dbc.themes.BOOTSTRAP,
@@ -34,6 +43,9 @@ DOORS_VIEWER_URL = "https://doors.viewer.brockmann-consult.de"
 CLICK_COUNT_STORE = "click-count-store"
 COOKIE_STORE = "cookie-store"
 MAPSTYLE_STORE = "mapstyle_value_store"
+LAZY_PAGES = os.getenv("DOORS_LAZY_PAGES", "false").lower() in ["1", "true", "yes"]
+PREWARM_WORKERS = os.getenv("DOORS_PREWARM_WORKERS")
+PREWARM_WORKERS = int(PREWARM_WORKERS) if PREWARM_WORKERS else None
 LOG.setLevel(os.getenv("DOORS_LOG_LEVEL", DEFAULT_LOG_LEVEL).upper())
 
 app = Dash(
@@ -45,8 +57,20 @@ app = Dash(
     meta_tags=[{"name": "viewport", "content": "width=device-width, initial-scale=1"}],
 )
 
-register_homepage()
-register_pages()
+register_tile_proxy(app.server)
+register_metrics(app.server)
+
+with trace("register pages"):
+    register_homepage()
+    register_pages(lazy=LAZY_PAGES)
+write_report()
+if LAZY_PAGES:
+    # dashboards register their callbacks when built, and dash only picks up
+    # callbacks that exist when serving its first request
+    app.server.before_request_funcs.setdefault(None, []).insert(
+        0, lambda: wait_for_pages(PREWARM_WORKERS)
+    )
+    prewarm_pages(PREWARM_WORKERS)
 
 footer = html.Div(
     html.P(
@@ -192,7 +216,7 @@ off_canvas = html.Div(
 )
 
 
-@app.callback(
+@callback(
     Output("offcanvas", "is_open"),
     Input("open-offcanvas", "n_clicks"),
     State("offcanvas", "is_open"),
@@ -203,7 +227,7 @@ def toggle_offcanvas(n1, is_open):
     return is_open
 
 
-@app.callback(
+@callback(
     Output("settings_modal", "is_open"),
     [
         Input("open-settings", "n_clicks"),
@@ -218,7 +242,7 @@ def toggle_settings_modal(open_click, close_click, revoke_consent, is_open):
     return is_open
 
 
-@app.callback(
+@callback(
     Output(MAPSTYLE_STORE, "data", allow_duplicate=True),
     [Input(SELECT_MAP_STYLE_DRP, "value")],
     prevent_initial_call=True,
@@ -231,28 +255,21 @@ def update_mapstyle_store(value):
         return dash.no_update
 
 
-@app.callback(
+@callback(
     Output("scattermap", "figure", allow_duplicate=True),
     [Input(MAPSTYLE_STORE, "data")],
-    State("scattermap", "figure"),
     prevent_initial_call=True,
 )
-def update_mapstyle_of_scattermap(mapstyle_data, current_figure):
-    if "mapstyle" in mapstyle_data:
-        mapstyle_val = mapstyle_data["mapstyle"]
-
-        if mapstyle_val is not None:
-            if isinstance(current_figure, dict) and "data" in current_figure:
-                current_figure = go.Figure(current_figure)
-                if "accesstoken" not in current_figure.layout.mapbox:
-                    current_figure.layout.mapbox["accesstoken"] = ACCESS_TOKEN
-                current_figure.layout.mapbox["style"] = mapstyle_val
-
-                return current_figure
-    return current_figure
+def update_mapstyle_of_scattermap(mapstyle_data):
+    mapstyle_val = (mapstyle_data or {}).get("mapstyle")
+    if mapstyle_val is None:
+        return dash.no_update
+    patched_figure = Patch()
+    patched_figure["layout"]["mapbox"]["style"] = mapstyle_val
+    return patched_figure
 
 
-@app.callback(
+@callback(
     Output("modal-imprint", "is_open"),
     [Input("open-imprint", "n_clicks"), Input("close-imprint", "n_clicks")],
     [State("modal-imprint", "is_open")],
@@ -263,7 +280,7 @@ def toggle_imprint_modal(open_click, close_click, is_open):
     return is_open
 
 
-@app.callback(
+@callback(
     Output("modal-help", "is_open"),
     [Input("open-help", "n_clicks"), Input("close-help", "n_clicks")],
     [State("modal-help", "is_open")],
@@ -274,7 +291,7 @@ def toggle_help_modal(open_click, close_click, is_open):
     return is_open
 
 
-@app.callback(
+@callback(
     Output("consent_modal", "is_open"),
     Output("open-offcanvas", "disable_n_clicks"),
     Output("open-settings", "disable_n_clicks"),
@@ -305,7 +322,7 @@ def toggle_consent_modal(
     return True, False, False, False, False, dash.no_update, click_count_data
 
 
-@app.callback(
+@callback(
     Output(COOKIE_STORE, "data", allow_duplicate=True),
     Input("revoke-consent", "n_clicks"),
     [State(COOKIE_STORE, "data")],
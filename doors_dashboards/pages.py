@@ -1,54 +1,83 @@
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from dash import html
 from dash import register_page
-import os
-from pathlib import Path
+import threading
 from typing import Dict
 from typing import List
-import yaml
 
+from doors_dashboards.components.constant import FONT_COLOR
+from doors_dashboards.configreader import get_blocked_ids
+from doors_dashboards.configreader import get_dashboard_ids
+from doors_dashboards.configreader import read_config
 from doors_dashboards.core.constants import LOG
+from doors_dashboards.core.tracer import trace
+from doors_dashboards.core.tracer import write_report
 from doors_dashboards.dashboards.dashboard import create_dashboard
 
-CONFIGS_PATH = "../configs"
+_LAZY_DASHBOARDS = {}
+_PAGES_READY = threading.Event()
 
 
-def _get_blocked_ids() -> List[str]:
-    blocked_ids = []
-    with open(os.path.join(CONFIGS_PATH, "blocklist.txt"), "r") as bl:
-        for line in bl:
-            blocked_ids.append(line.strip())
-    return blocked_ids
+class LazyDashboard:
 
+    def __init__(self, dashboard_id: str, config: Dict):
+        self._dashboard_id = dashboard_id
+        self._config = config
+        self._layout = None
+        self._error = None
+        self._lock = threading.Lock()
 
-def _get_dashboard_ids() -> List[str]:
-    p = Path(CONFIGS_PATH)
-    return [
-        entry.stem
-        for entry in p.iterdir()
-        if entry.is_file() and entry.suffix == ".yml"
-    ]
+    def is_done(self) -> bool:
+        return self._layout is not None or self._error is not None
 
+    def build(self) -> html.Div:
+        with self._lock:
+            if not self.is_done():
+                LOG.debug(f"Building dashboard '{self._dashboard_id}'")
+                try:
+                    with trace("build dashboard", self._dashboard_id):
+                        self._layout = create_dashboard(self._config)
+                except Exception as e:
+                    # a failed build is not retried on every page request
+                    self._error = e
+                    raise
+                LOG.debug(f"Built dashboard '{self._dashboard_id}'")
+        if self._error is not None:
+            raise self._error
+        return self._layout
 
-def _read_config(dashboard_id: str) -> Dict:
-    return _read_config_file(f"{dashboard_id}.yml")
+    def _create_error_layout(self) -> html.Div:
+        return html.Div(
+            html.H2(f"Dashboard '{self._dashboard_id}' is not available"),
+            style={"color": FONT_COLOR},
+            className="m-1",
+        )
 
+    def __call__(self, **kwargs) -> html.Div:
+        try:
+            return self.build()
+        except Exception:
+            return self._create_error_layout()
 
-def _read_config_file(config_filename: str) -> Dict:
-    file_dir = os.path.dirname(os.path.abspath(__file__))
-    config_path = os.path.join(file_dir, CONFIGS_PATH, config_filename)
-    with open(config_path, "r", encoding="utf-8") as config_stream:
-        return yaml.safe_load(config_stream)
 
-
-def register_pages():
-    blocked_ids = _get_blocked_ids()
-    dashboard_ids = _get_dashboard_ids()
+def register_pages(lazy: bool = False):
+    blocked_ids = get_blocked_ids()
+    dashboard_ids = get_dashboard_ids()
     for dashboard_id in dashboard_ids:
         if dashboard_id in blocked_ids:
             LOG.info(f"Dashboard '{dashboard_id}' is blocked, will not add")
             continue
         LOG.debug(f"Adding dashboard '{dashboard_id}'")
-        dashboard_config = _read_config(dashboard_id)
-        dashboard_layout = create_dashboard(dashboard_config)
+        with trace("add dashboard", dashboard_id):
+            with trace("parse config"):
+                dashboard_config = read_config(dashboard_id)
+            if lazy:
+                dashboard_layout = LazyDashboard(dashboard_id, dashboard_config)
+                _LAZY_DASHBOARDS[dashboard_id] = dashboard_layout
+            else:
+                dashboard_layout = create_dashboard(dashboard_config)
         dashboard_title = dashboard_config.get("title", dashboard_id)
         if dashboard_title:
             register_page(
@@ -56,3 +85,55 @@ def register_pages():
             )
             LOG.debug(f"Added dashboard '{dashboard_title}'")
     LOG.info("Finished adding dashboards")
+
+
+def _log_build_failure(dashboard_id: str, future: Future):
+    if future.exception() is not None:
+        LOG.error(
+            f"Could not build dashboard '{dashboard_id}': {future.exception()}"
+        )
+
+
+def prewarm_pages(max_workers: int = None) -> Dict[str, Future]:
+    executor = ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="doors-prewarm"
+    )
+    futures = {}
+    for dashboard_id, lazy_dashboard in _LAZY_DASHBOARDS.items():
+        future = executor.submit(lazy_dashboard.build)
+        future.add_done_callback(
+            lambda f, d=dashboard_id: _log_build_failure(d, f)
+        )
+        futures[dashboard_id] = future
+    executor.shutdown(wait=False)
+    if futures:
+        # the startup report covers the prewarmed dashboards once all are built
+        threading.Thread(
+            target=_write_report_when_done,
+            args=(list(futures.values()),),
+            name="doors-prewarm-report",
+            daemon=True,
+        ).start()
+    return futures
+
+
+def _write_report_when_done(futures: List[Future]):
+    wait(futures)
+    write_report()
+
+
+def wait_for_pages(max_workers: int = None):
+    # Dash only serves callbacks that have been registered when it handles its
+    # first request, so all lazy dashboards must be built by then.
+    if _PAGES_READY.is_set():
+        return
+    pending = {i: d for i, d in _LAZY_DASHBOARDS.items() if not d.is_done()}
+    if pending:
+        with ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="doors-build"
+        ) as executor:
+            futures = {i: executor.submit(d.build) for i, d in pending.items()}
+        for dashboard_id, future in futures.items():
+            _log_build_failure(dashboard_id, future)
+        write_report()
+    _PAGES_READY.set()
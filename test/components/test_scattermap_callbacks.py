@@ -0,0 +1,164 @@
+from dash import no_update
+from dash import Patch
+from dash._callback import GLOBAL_CALLBACK_LIST
+from dash._callback import GLOBAL_CALLBACK_MAP
+import os
+import shutil
+import tempfile
+from typing import Dict
+from typing import List
+import unittest
+from unittest import mock
+
+from doors_dashboards.components.constant import COLLECTION
+from doors_dashboards.components.scattermap import ScatterMapComponent
+from doors_dashboards.components.scattermap import SELECTION_TRACE_NAME
+from doors_dashboards.core.featurehandler import FeatureHandler
+
+DASHBOARD_ID = "scattermap-test"
+_TEST_CONFIG = [
+    dict(
+        id="points",
+        type="local",
+        params=dict(file="test_data/1.csv", label="mylabel"),
+    ),
+]
+
+
+class ScatterMapCallbacksTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        num_callbacks = len(GLOBAL_CALLBACK_LIST)
+        cls.component = ScatterMapComponent(DASHBOARD_ID)
+        cls.component.set_feature_handler(FeatureHandler(_TEST_CONFIG))
+        cls.component.register_callbacks({}, DASHBOARD_ID)
+        cls.callbacks = {}
+        for spec in GLOBAL_CALLBACK_LIST[num_callbacks:]:
+            function = GLOBAL_CALLBACK_MAP[spec["output"]]["callback"]
+            cls.callbacks[function.__name__] = function.__wrapped__
+
+    def test_selection_of_collection_without_levels(self):
+        # there is no group to mark for collections without levels
+        update = self.callbacks["update_selected_dropdown_point_on_scattermap"]
+        figure, version = update({COLLECTION: "points"}, None)
+        self.assertIs(no_update, figure)
+        self.assertIs(no_update, version)
+
+
+def _get_operations(patch: Patch) -> Dict[tuple, object]:
+    return {
+        tuple(operation["location"]): operation["params"]["value"]
+        for operation in patch.to_plotly_json()["operations"]
+    }
+
+
+class ScatterMapBaseFigureTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.data_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.data_dir, "points.csv")
+        with open(self.file_path, "w") as csv_file:
+            csv_file.write(
+                'geometry,mylabel\n"POINT(20.5 22.2)",x\n"POINT(28.5 42.2)",y'
+            )
+        num_callbacks = len(GLOBAL_CALLBACK_LIST)
+        self.feature_handler = FeatureHandler(
+            [
+                dict(
+                    id="points",
+                    type="local",
+                    params=dict(file=self.file_path, label="mylabel"),
+                )
+            ]
+        )
+        self.component = ScatterMapComponent(DASHBOARD_ID)
+        self.component.set_feature_handler(self.feature_handler)
+        self.layout = self.component.get("scattermap", "scattermap", {})
+        self.component.register_callbacks({}, DASHBOARD_ID)
+        for spec in GLOBAL_CALLBACK_LIST[num_callbacks:]:
+            function = GLOBAL_CALLBACK_MAP[spec["output"]]["callback"]
+            if function.__name__ == "update_selected_dropdown_point_on_scattermap":
+                self.update = function.__wrapped__
+
+    def tearDown(self) -> None:
+        self.feature_handler.close()
+        shutil.rmtree(self.data_dir)
+
+    @staticmethod
+    def _select(lon: float, lat: float, label: str) -> Dict:
+        return {
+            COLLECTION: "points",
+            "selected_data": dict(lon=[lon], lat=[lat], label=[label]),
+        }
+
+    def _get_shown_version(self) -> int:
+        version_store = self.layout.children[1]
+        return version_store.data
+
+    def _assert_selection(self, traces: List[Dict], lon: float, lat: float):
+        self.assertEqual([[]], [t["selectedpoints"] for t in traces[:-1]])
+        self.assertEqual([lon], traces[-1]["lon"])
+        self.assertEqual([lat], traces[-1]["lat"])
+        self.assertEqual(f"{SELECTION_TRACE_NAME} Mylabel", traces[-1]["name"])
+
+    def test_selection_of_shown_version(self):
+        # only the selection is sent when the client shows the current version
+        shown_version = self._get_shown_version()
+        figure, version = self.update(self._select(20.5, 22.2, "x"), shown_version)
+        self.assertIsInstance(figure, Patch)
+        self.assertIs(no_update, version)
+        operations = _get_operations(figure)
+        self.assertNotIn(("data",), operations)
+        self.assertEqual([], operations[("data", 0, "selectedpoints")])
+        self.assertEqual([20.5], operations[("data", 1, "lon")])
+        self.assertEqual([22.2], operations[("data", 1, "lat")])
+        self.assertEqual(["x"], operations[("data", 1, "text")])
+        self.assertEqual(
+            f"{SELECTION_TRACE_NAME} Mylabel", operations[("data", 1, "name")]
+        )
+        self.assertTrue(operations[("data", 1, "showlegend")])
+
+    def test_selection_of_outdated_version(self):
+        # all traces are sent when the client shows another version
+        shown_version = self._get_shown_version()
+        figure, version = self.update(self._select(28.5, 42.2, "y"), None)
+        self.assertEqual(shown_version, version)
+        operations = _get_operations(figure)
+        self.assertEqual([("data",)], list(operations.keys()))
+        traces = operations[("data",)]
+        self.assertEqual(2, len(traces))
+        self.assertEqual([20.5, 28.5], list(traces[0]["lon"]))
+        self._assert_selection(traces, 28.5, 42.2)
+        # the cached figure is left as it is
+        _, base_figure = self.component._get_base_figure()
+        self.assertEqual([], list(base_figure["data"][1]["lon"]))
+        self.assertNotIn("selectedpoints", base_figure["data"][0])
+
+    def test_repeated_selection(self):
+        # the figure is created once per version
+        shown_version = self._get_shown_version()
+        with mock.patch.object(
+            self.component, "_create_figure", wraps=self.component._create_figure
+        ) as create_figure:
+            first, _ = self.update(self._select(20.5, 22.2, "x"), shown_version)
+            second, _ = self.update(self._select(20.5, 22.2, "x"), shown_version)
+            self.update(self._select(20.5, 22.2, "x"), None)
+        create_figure.assert_not_called()
+        self.assertEqual(_get_operations(first), _get_operations(second))
+
+    def test_version_change(self):
+        shown_version = self._get_shown_version()
+        with open(self.file_path, "a") as csv_file:
+            csv_file.write('\n"POINT(22.5 62.2)",z')
+        self.assertTrue(self.feature_handler.refresh())
+        figure, version = self.update(self._select(22.5, 62.2, "z"), shown_version)
+        self.assertEqual(shown_version + 1, version)
+        traces = _get_operations(figure)[("data",)]
+        self.assertEqual([20.5, 28.5, 22.5], list(traces[0]["lon"]))
+        self._assert_selection(traces, 22.5, 62.2)
+
+        # the client shows the new version now
+        figure, version = self.update(self._select(20.5, 22.2, "x"), version)
+        self.assertIs(no_update, version)
+        self.assertNotIn(("data",), _get_operations(figure))
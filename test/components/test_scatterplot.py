@@ -1,90 +1,373 @@
+from dash import ALL
+from dash import Dash
+from dash import no_update
+from dash._callback import GLOBAL_CALLBACK_LIST
+from dash._callback import GLOBAL_CALLBACK_MAP
+from dash._utils import stringify_id
+import dash_bootstrap_components as dbc
+import json
+import numpy as np
+import os
+import pandas as pd
+import shutil
+import tempfile
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
 import unittest
 
-
+from doors_dashboards.components.constant import COLLECTION
+from doors_dashboards.components.constant import GENERAL_STORE_ID
+from doors_dashboards.components.constant import GROUP
+from doors_dashboards.components.constant import GROUPS_SECTION
+from doors_dashboards.components.constant import MAIN_GROUP
+from doors_dashboards.components.scatterplot import ALL_GROUP_MEMBERS
+from doors_dashboards.components.scatterplot import COMPONENT_STORE_ID
+from doors_dashboards.components.scatterplot import get_menu_id
+from doors_dashboards.components.scatterplot import get_option_id
+from doors_dashboards.components.scatterplot import LINE_VARIABLE
+from doors_dashboards.components.scatterplot import MENU_ROLES
+from doors_dashboards.components.scatterplot import OPTIONS_STORE_ID
 from doors_dashboards.components.scatterplot import ScatterplotComponent
+from doors_dashboards.components.scatterplot import TEMP_STORE_ID
+from doors_dashboards.components.scatterplot import VARIABLES_SECTION
+from doors_dashboards.components.scatterplot import X_VARIABLE
+from doors_dashboards.components.scatterplot import Y_VARIABLE
+from doors_dashboards.core.featurehandler import FeatureHandler
 
-# from doors_dashboards.components.scatterplot import encode_main_group_dropdown
-# from doors_dashboards.components.scatterplot import encode_group_dropdown
-# from doors_dashboards.components.scatterplot import encode_xvar_dropdown
-# from doors_dashboards.components.scatterplot import encode_yvar_dropdown
-# from doors_dashboards.components.scatterplot import encode_linevar_dropdown
-# from doors_dashboards.components.scatterplot import decode_main_group_dropdown
-# from doors_dashboards.components.scatterplot import decode_group_dropdown
+DASHBOARD_ID = "scatterplot-test"
+GENERAL_ID = f"{DASHBOARD_ID}-{GENERAL_STORE_ID}"
+_TEST_CONFIG = [
+    dict(
+        id="cruises",
+        type="local",
+        params=dict(
+            file="test_data/4.csv",
+            label="station",
+            levels=["cruise", "station", "sampling_depth"],
+            variables=["chlorophyll", "temperature"],
+        ),
+    ),
+    dict(
+        id="stations",
+        type="local",
+        params=dict(
+            file="test_data/4.csv",
+            label="station",
+            levels=["station", "sampling_depth"],
+            variables=["chlorophyll", "temperature"],
+        ),
+    ),
+]
 
 
-class EncoderTest(unittest.TestCase):
+class ScatterplotComponentTest(unittest.TestCase):
 
-    def setUp(self) -> None:
-        self.plot = ScatterplotComponent()
+    @classmethod
+    def setUpClass(cls):
+        num_callbacks = len(GLOBAL_CALLBACK_LIST)
+        cls.component = ScatterplotComponent(DASHBOARD_ID)
+        cls.component.set_feature_handler(FeatureHandler(_TEST_CONFIG))
+        cls.layout = cls.component.get("scatterplot", "scatterplot", {})
+        cls.component.register_callbacks([], DASHBOARD_ID)
+        cls.callbacks = {}
+        for spec in GLOBAL_CALLBACK_LIST[num_callbacks:]:
+            function = GLOBAL_CALLBACK_MAP[spec["output"]]["callback"]
+            cls.callbacks[function.__name__] = (spec, function.__wrapped__)
+        app = Dash(__name__)
+        app.layout = cls.layout
+        cls.client = app.server.test_client()
+        cls.client.get("/")
+
+    def _get_menus(self):
+        return {
+            component.id["role"]: component
+            for component in self.layout._traverse()
+            if isinstance(component, dbc.DropdownMenu)
+        }
+
+    def _call(self, name: str, *args):
+        return self.callbacks[name][1](*args)
+
+    def _post(
+        self,
+        name: str,
+        outputs: Any,
+        inputs: List,
+        state: List = None,
+        changed_input: Dict = None,
+    ) -> Optional[Dict]:
+        # callbacks with pattern-matching outputs need the request context
+        spec, _ = self.callbacks[name]
+        changed_input = changed_input or inputs[0]
+        response = self.client.post(
+            "/_dash-update-component",
+            json={
+                "output": spec["output"],
+                "outputs": outputs,
+                "inputs": inputs,
+                "changedPropIds": [
+                    f"{stringify_id(changed_input['id'])}.{changed_input['property']}"
+                ],
+                "state": state or [],
+            },
+        )
+        self.assertIn(response.status_code, [200, 204])
+        if response.status_code == 204:
+            return None
+        # outputs that were not updated are left out
+        return json.loads(response.data)["response"] or None
+
+    @staticmethod
+    def _get_menu_outputs(prop: str, roles: List[str]) -> List[Dict]:
+        # the order of matched outputs is the browser's, not the layout's
+        return [{"id": get_menu_id(DASHBOARD_ID, r), "property": prop} for r in roles]
+
+    def _get_general_to_options(
+        self, general_data: Dict, shown: List, roles: List[str]
+    ) -> Optional[Tuple[Dict, Dict, List]]:
+        response = self._post(
+            "general_to_options",
+            [
+                self._get_menu_outputs("children", roles),
+                self._get_menu_outputs("style", roles),
+                {"id": f"{DASHBOARD_ID}-{OPTIONS_STORE_ID}", "property": "data"},
+            ],
+            [{"id": GENERAL_ID, "property": "data", "value": general_data}],
+            [
+                {
+                    "id": f"{DASHBOARD_ID}-{OPTIONS_STORE_ID}",
+                    "property": "data",
+                    "value": shown,
+                }
+            ],
+        )
+        if response is None:
+            return None
+        options = {}
+        styles = {}
+        for role in roles:
+            menu = response[stringify_id(get_menu_id(DASHBOARD_ID, role))]
+            options[role] = [item["props"]["children"] for item in menu["children"]]
+            styles[role] = menu["style"]
+        shown = response[f"{DASHBOARD_ID}-{OPTIONS_STORE_ID}"]["data"]
+        return options, styles, shown
 
-    def test_encode_decode_main_group_dropdown(self):
-        self.assertEqual("maingroup_drp_option_erf",
-                         self.plot.encode_main_group_dropdown("erf"))
-        self.assertEqual("maingroup_drp_option_erf_arf",
-                         self.plot.encode_main_group_dropdown("erf_arf"))
+    def _get_labels(
+        self, component_data: Optional[Dict], general_data: Dict
+    ) -> Dict[str, Any]:
+        roles = list(reversed(MENU_ROLES))
+        response = self._post(
+            "stores_to_labels",
+            self._get_menu_outputs("label", roles),
+            [
+                {
+                    "id": f"{DASHBOARD_ID}-{COMPONENT_STORE_ID}",
+                    "property": "data",
+                    "value": component_data,
+                },
+                {"id": GENERAL_ID, "property": "data", "value": general_data},
+            ],
+        )
+        return {
+            role: response[stringify_id(get_menu_id(DASHBOARD_ID, role))]["label"]
+            for role in roles
+        }
+
+    def test_ids(self):
+        self.assertEqual(
+            {"type": "scatterplot-menu", "dashboard": "d", "role": GROUP},
+            get_menu_id("d", GROUP),
+        )
         self.assertEqual(
-            "erf", self.plot.decode_main_group_dropdown("maingroup_drp_option_erf")
+            {
+                "type": "scatterplot-option",
+                "dashboard": "d",
+                "role": GROUP,
+                "value": "JBSS GE-UA - 1A",
+            },
+            get_option_id("d", GROUP, "JBSS GE-UA - 1A"),
+        )
+
+    def test_layout(self):
+        menus = self._get_menus()
+        self.assertEqual(set(MENU_ROLES), set(menus.keys()))
+        for role, menu in menus.items():
+            self.assertEqual(get_menu_id(DASHBOARD_ID, role), menu.id)
+        self.assertEqual("JBSS GE-UA 2019", menus[MAIN_GROUP].label)
+        self.assertEqual(
+            ["JBSS GE-UA 2019", "JOSS GE-UA 2016"],
+            [item.children for item in menus[MAIN_GROUP].children],
         )
         self.assertEqual(
-            "erf_arf",
-            self.plot.decode_main_group_dropdown("maingroup_drp_option_erf_arf")
-        )
-
-    def test_encode_decode_group_dropdown(self):
-        self.assertEqual("group_drp_option_erf_arf",
-                         self.plot.encode_group_dropdown("erf", "arf"))
-        self.assertEqual("group_drp_option_erf-arf_ink-ank",
-                         self.plot.encode_group_dropdown("erf_arf", "ink_ank"))
-        collection, main_group = \
-            self.plot.decode_group_dropdown("group_drp_option_erf_arf")
-        self.assertEqual("erf", collection)
-        self.assertEqual("arf", main_group)
-        collection, main_group = \
-            self.plot.decode_group_dropdown("group_drp_option_erf-arf_ink-ank")
-        self.assertEqual("erf_arf", collection)
-        self.assertEqual("ink_ank", main_group)
-
-    def test_encode_xvar_dropdown(self):
-        self.assertEqual("point_x_var_drop_down_id_erf",
-                         self.plot.encode_xvar_dropdown("erf"))
-        self.assertEqual("point_x_var_drop_down_id_erf_arf",
-                         self.plot.encode_xvar_dropdown("erf_arf"))
-
-    def test_decode_xvar_dropdown(self):
+            ["JBSS GE-UA - 1A", "JBSS GE-UA - 2A", ALL_GROUP_MEMBERS],
+            [item.children for item in menus[GROUP].children],
+        )
         self.assertEqual(
-            "erf", self.plot.decode_xvar_dropdown("point_x_var_drop_down_id_erf")
+            get_option_id(DASHBOARD_ID, GROUP, "JBSS GE-UA - 2A"),
+            menus[GROUP].children[1].id,
         )
+        self.assertEqual("chlorophyll", menus[X_VARIABLE].label)
+        self.assertEqual("temperature", menus[Y_VARIABLE].label)
+        self.assertEqual("chlorophyll", menus[LINE_VARIABLE].label)
+
+    def test_menus_are_ordered_like_the_layout(self):
+        menu_ids = [
+            component.id
+            for component in self.layout._traverse()
+            if isinstance(component, dbc.DropdownMenu)
+        ]
+        self.assertEqual([get_menu_id(DASHBOARD_ID, r) for r in MENU_ROLES], menu_ids)
+
+    def test_general_to_options(self):
+        roles = list(reversed(MENU_ROLES))
+        general_data = {COLLECTION: "stations"}
+        options, styles, shown = self._get_general_to_options(
+            general_data, ["cruises", None], roles
+        )
+        self.assertEqual(["stations", None], shown)
+        self.assertEqual([], options[MAIN_GROUP])
+        self.assertEqual("none", styles[MAIN_GROUP]["display"])
         self.assertEqual(
-            "erf_arf",
-            self.plot.decode_xvar_dropdown("point_x_var_drop_down_id_erf_arf")
+            [
+                "JBSS GE-UA - 1A",
+                "JBSS GE-UA - 2A",
+                "JOSS GE-UA - 13",
+                "JOSS GE-UA - 21",
+                ALL_GROUP_MEMBERS,
+            ],
+            options[GROUP],
         )
+        self.assertEqual(["chlorophyll", "temperature"], options[X_VARIABLE])
 
-    def test_encode_yvar_dropdown(self):
-        self.assertEqual("point_y_var_drop_down_id_erf",
-                         self.plot.encode_yvar_dropdown("erf"))
-        self.assertEqual("point_y_var_drop_down_id_erf_arf",
-                         self.plot.encode_yvar_dropdown("erf_arf"))
+        # the options are only sent when they change
+        self.assertIsNone(self._get_general_to_options(general_data, shown, roles))
 
-    def test_decode_yvar_dropdown(self):
+        general_data = {
+            COLLECTION: "cruises",
+            GROUPS_SECTION: {"cruises": {MAIN_GROUP: "JOSS GE-UA 2016"}},
+        }
+        options, styles, shown = self._get_general_to_options(
+            general_data, shown, roles
+        )
+        self.assertEqual(["cruises", "JOSS GE-UA 2016"], shown)
         self.assertEqual(
-            "erf", self.plot.decode_yvar_dropdown("point_y_var_drop_down_id_erf")
+            ["JOSS GE-UA - 13", "JOSS GE-UA - 21", ALL_GROUP_MEMBERS],
+            options[GROUP],
         )
+        self.assertEqual("block", styles[MAIN_GROUP]["display"])
+
+    def test_stores_to_labels(self):
+        general_data = {
+            COLLECTION: "cruises",
+            GROUPS_SECTION: {"cruises": {MAIN_GROUP: "JOSS GE-UA 2016"}},
+        }
+        component_data = {VARIABLES_SECTION: {"cruises": {Y_VARIABLE: "chlorophyll"}}}
         self.assertEqual(
-            "erf_arf",
-            self.plot.decode_yvar_dropdown("point_y_var_drop_down_id_erf_arf")
+            {
+                MAIN_GROUP: "JOSS GE-UA 2016",
+                LINE_VARIABLE: "chlorophyll",
+                GROUP: "JOSS GE-UA - 13",
+                X_VARIABLE: "chlorophyll",
+                Y_VARIABLE: "chlorophyll",
+            },
+            self._get_labels(component_data, general_data),
         )
 
-    def test_encode_linevar_dropdown(self):
-        self.assertEqual("line_var_drop_down_id_erf",
-                         self.plot.encode_linevar_dropdown("erf"))
-        self.assertEqual("line_var_drop_down_id_erf_arf",
-                         self.plot.encode_linevar_dropdown("erf_arf"))
+        # groups selected in the time plots are given for the first level
+        general_data = {
+            COLLECTION: "stations",
+            GROUPS_SECTION: {"stations": "JOSS GE-UA - 21"},
+        }
+        labels = self._get_labels(None, general_data)
+        self.assertEqual(None, labels[MAIN_GROUP])
+        self.assertEqual("JOSS GE-UA - 21", labels[GROUP])
+        self.assertEqual("chlorophyll", labels[X_VARIABLE])
+        self.assertEqual("temperature", labels[Y_VARIABLE])
 
-    def test_decode_linevar_dropdown(self):
+    def test_temp_to_general(self):
+        general_data = {
+            COLLECTION: "cruises",
+            GROUPS_SECTION: {"cruises": {GROUP: "JBSS GE-UA - 2A"}},
+        }
+        general_data = self._call(
+            "temp_to_general", {MAIN_GROUP: "JOSS GE-UA 2016"}, general_data
+        )
         self.assertEqual(
-            "erf", self.plot.decode_linevar_dropdown("line_var_drop_down_id_erf")
+            {"cruises": {MAIN_GROUP: "JOSS GE-UA 2016"}}, general_data[GROUPS_SECTION]
+        )
+
+    def test_options_to_temp(self):
+        option_ids = [
+            get_option_id(DASHBOARD_ID, GROUP, "JBSS GE-UA - 1A"),
+            get_option_id(DASHBOARD_ID, X_VARIABLE, "temperature"),
+        ]
+        clicks = [
+            {"id": option_ids[0], "property": "n_clicks", "value": None},
+            {"id": option_ids[1], "property": "n_clicks", "value": 1},
+        ]
+        response = self._post(
+            "options_to_temp",
+            {"id": f"{DASHBOARD_ID}-{TEMP_STORE_ID}", "property": "data"},
+            [clicks],
+            changed_input=clicks[1],
         )
         self.assertEqual(
-            "erf_arf",
-            self.plot.decode_linevar_dropdown("line_var_drop_down_id_erf_arf")
+            {X_VARIABLE: "temperature"},
+            response[f"{DASHBOARD_ID}-{TEMP_STORE_ID}"]["data"],
+        )
+
+
+class ScatterplotNumericLevelsTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.data_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.data_dir)
+        file_path = os.path.join(self.data_dir, "numeric.csv")
+        with open(file_path, "w") as csv_file:
+            csv_file.write(
+                "geometry,time,station,depth,sample,chlorophyll,temperature\n"
+            )
+            csv_file.write('"POINT(28 43)",2020-01-01,1,0.5,1,1.0,10.0\n')
+            csv_file.write('"POINT(28 43)",2020-01-02,1,1.5,2,2.0,11.0\n')
+            csv_file.write('"POINT(28.1 43)",2020-01-03,2,0.5,3,3.0,12.0\n')
+        self.component = ScatterplotComponent("scatterplot-numeric-test")
+        self.component.set_feature_handler(
+            FeatureHandler(
+                [
+                    dict(
+                        id="numeric",
+                        type="local",
+                        params=dict(
+                            file=file_path,
+                            label="station",
+                            levels=["station", "depth", "sample"],
+                            variables=["chlorophyll", "temperature"],
+                        ),
+                    )
+                ]
+            )
+        )
+
+    def test_layout(self):
+        layout = self.component.get("scatterplot", "scatterplot", {})
+        option_values = {}
+        for component in layout._traverse():
+            if isinstance(component, dbc.DropdownMenuItem):
+                role = component.id["role"]
+                option_values.setdefault(role, []).append(component.id["value"])
+        self.assertEqual([1, 2], option_values[MAIN_GROUP])
+        self.assertEqual([0.5, 1.5, ALL_GROUP_MEMBERS], option_values[GROUP])
+        for value in option_values[MAIN_GROUP] + option_values[GROUP][:-1]:
+            self.assertIn(type(value), [int, float])
+
+    def test_get_option_id(self):
+        self.assertIs(int, type(get_option_id("d", GROUP, np.int64(1))["value"]))
+        self.assertIs(float, type(get_option_id("d", GROUP, np.float64(1.5))["value"]))
+        self.assertEqual(
+            "2020-01-01 00:00:00",
+            get_option_id("d", GROUP, pd.Timestamp("2020-01-01"))["value"],
         )
+        self.assertIs(ALL, get_option_id("d", ALL, ALL)["value"])
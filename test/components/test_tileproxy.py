@@ -0,0 +1,96 @@
+import flask
+import json
+import unittest
+from unittest.mock import patch
+
+from doors_dashboards.components import scattermap
+from doors_dashboards.components.scattermap import register_tile_proxy
+from doors_dashboards.components.scattermap import TILE_PROXY_ROUTE
+
+_TIME_COORDS = ["2024-05-01T00:00:00Z", "2024-05-02T00:00:00Z"]
+
+
+class TileProxyTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        server = flask.Flask(__name__)
+        register_tile_proxy(server)
+        self.client = server.test_client()
+        self.fetched = []
+        patcher = patch.object(
+            scattermap, "get_time_coords", return_value=_TIME_COORDS
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _get(self, path: str, time: str = _TIME_COORDS[0]) -> flask.Response:
+        with patch.object(scattermap, "get_tile_cache") as get_tile_cache:
+            get_tile_cache.return_value.get.side_effect = (
+                lambda url, fetch: self.fetched.append(url) or b"png"
+            )
+            return self.client.get(
+                f"{TILE_PROXY_ROUTE}/{path}", query_string=dict(time=time)
+            )
+
+    def test_get_tile(self):
+        response = self._get("sst/2/1/4", "2024-05-01T00:00:00Z")
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(b"png", response.data)
+        self.assertEqual(1, len(self.fetched))
+        self.assertIn("/2/1/4?", self.fetched[0])
+        self.assertTrue(self.fetched[0].endswith("&time=2024-05-01T00%3A00%3A00Z"))
+
+    def test_get_tile_rejects_unknown_requests(self):
+        self.assertEqual(404, self._get("unknown/2/1/4").status_code)
+        self.assertEqual(404, self._get("sst/2/1/5").status_code)
+        self.assertEqual(404, self._get("sst/8/1/4").status_code)
+        self.assertEqual(404, self._get("sst/2/1/4", "2024-05-03").status_code)
+        self.assertEqual(404, self._get("sst/2/1/4", "x&cbar=y").status_code)
+        self.assertEqual([], self.fetched)
+
+
+_COLOR_BARS = [["Group", "", [["thermal", "iVBORw0KGgo="]]]]
+
+
+class ColorBarsTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.responses = []
+        self.fetched_while_locked = []
+        patchers = [
+            patch.object(scattermap, "_COLOR_BARS", None),
+            patch.object(scattermap, "_COLOR_BARS_FAILURE_TIME", None),
+            patch.object(scattermap, "_fetch", side_effect=self._fetch),
+            patch.object(scattermap, "get_tile_cache"),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        scattermap.get_tile_cache.return_value.get.side_effect = (
+            lambda url, fetch, max_age: fetch()
+        )
+
+    def _fetch(self, url: str):
+        self.fetched_while_locked.append(scattermap._COLOR_BARS_LOCK.locked())
+        return self.responses.pop(0)
+
+    def test_get_color_bars(self):
+        self.responses = [json.dumps(_COLOR_BARS).encode("utf-8")]
+        self.assertEqual(_COLOR_BARS, scattermap.get_color_bars())
+        self.assertEqual(_COLOR_BARS, scattermap.get_color_bars())
+        # the lock is not held while fetching
+        self.assertEqual([False], self.fetched_while_locked)
+
+    def test_get_color_bars_failed(self):
+        self.responses = [None, b"<html>", json.dumps(_COLOR_BARS).encode("utf-8")]
+        self.assertIsNone(scattermap.get_color_bars())
+        self.assertIsNone(scattermap.get_color_bars())
+        self.assertEqual(1, len(self.fetched_while_locked))
+        self.assertIsNone(scattermap.get_color_map_image("sst"))
+        self.assertEqual(1, len(self.fetched_while_locked))
+
+        # failures are retried after a while
+        with patch.object(scattermap, "COLOR_BARS_RETRY_PERIOD", 0):
+            self.assertIsNone(scattermap.get_color_bars())
+            self.assertEqual(_COLOR_BARS, scattermap.get_color_bars())
+        self.assertEqual([False] * 3, self.fetched_while_locked)
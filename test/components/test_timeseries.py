@@ -0,0 +1,57 @@
+from dash._callback import GLOBAL_CALLBACK_LIST
+import unittest
+
+from doors_dashboards.components.constant import GROUP
+from doors_dashboards.components.constant import MAIN_GROUP
+from doors_dashboards.components.timeseries import TimeSeriesComponent
+from doors_dashboards.core.featurehandler import FeatureHandler
+
+_TEST_CONFIG = [
+    dict(
+        id="cruises",
+        type="local",
+        params=dict(
+            file="test_data/4.csv",
+            label="station",
+            levels=["cruise", "station", "sampling_depth"],
+            variables=["chlorophyll", "temperature"],
+        ),
+    ),
+]
+
+
+class TimeSeriesComponentTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.component = TimeSeriesComponent("timeseries-test")
+        self.component.set_feature_handler(FeatureHandler(_TEST_CONFIG))
+
+    def test_get_series(self):
+        times, values = self.component._get_series(
+            "cruises", "temperature", "JOSS GE-UA 2016"
+        )
+        self.assertGreater(len(values), 0)
+        self.assertEqual(len(times), len(values))
+
+    def test_get_series_for_group_selection(self):
+        # groups selected on the scatter map are stored per level
+        expected = self.component._get_series(
+            "cruises", "temperature", "JOSS GE-UA 2016"
+        )
+        times, values = self.component._get_series(
+            "cruises",
+            "temperature",
+            {MAIN_GROUP: "JOSS GE-UA 2016", GROUP: "JOSS GE-UA - 13"},
+        )
+        self.assertEqual(list(expected[0]), list(times))
+        self.assertEqual(list(expected[1]), list(values))
+
+    def test_graph_ids_are_namespaced_by_dashboard(self):
+        num_callbacks = len(GLOBAL_CALLBACK_LIST)
+        for dashboard_id in ["timeseries-test-1", "timeseries-test-2"]:
+            component = TimeSeriesComponent(dashboard_id)
+            component.set_feature_handler(FeatureHandler(_TEST_CONFIG))
+            component.register_callbacks({}, dashboard_id)
+        outputs = [spec["output"] for spec in GLOBAL_CALLBACK_LIST[num_callbacks:]]
+        self.assertIn("timeseries-test-1-timeplots.figure", outputs)
+        self.assertIn("timeseries-test-2-timeplots.figure", outputs)
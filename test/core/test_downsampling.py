@@ -0,0 +1,52 @@
+import numpy as np
+from unittest import TestCase
+
+from doors_dashboards.core.downsampling import downsample
+from doors_dashboards.core.downsampling import m4
+
+
+class DownsamplingTest(TestCase):
+
+    def setUp(self) -> None:
+        self.x = np.arange(10000, dtype=np.int64)
+        self.y = np.sin(self.x / 100)
+        self.y[1234] = 10
+        self.y[5678] = -10
+        self.y[4321] = np.nan
+
+    def test_m4_small_series_is_unchanged(self):
+        np.testing.assert_equal(np.arange(40), m4(self.x[:40], self.y[:40], 10))
+
+    def test_m4(self):
+        indices = m4(self.x, self.y, 100)
+        self.assertLessEqual(len(indices), 400)
+        self.assertTrue(np.all(np.diff(indices) > 0))
+        self.assertIn(0, indices)
+        self.assertIn(9999, indices)
+        self.assertIn(1234, indices)
+        self.assertIn(5678, indices)
+        # every bucket keeps its extremes
+        buckets = self.y.reshape(100, 100)
+        sampled = set(indices)
+        for i, bucket in enumerate(buckets):
+            self.assertIn(i * 100 + np.nanargmin(bucket), sampled)
+            self.assertIn(i * 100 + np.nanargmax(bucket), sampled)
+
+    def test_m4_constant_x(self):
+        indices = m4(np.zeros(1000), self.y[:1000], 10)
+        self.assertIn(0, indices)
+        self.assertIn(999, indices)
+        self.assertLessEqual(len(indices), 4)
+
+    def test_downsample_window(self):
+        overview = downsample(self.x, self.y, 100)
+        indices = downsample(self.x, self.y, 100, (2000, 2299))
+        np.testing.assert_equal(np.arange(1999, 2301), indices[
+            (indices >= 1999) & (indices <= 2300)
+        ])
+        np.testing.assert_equal(
+            overview[overview < 1999], indices[indices < 1999]
+        )
+        np.testing.assert_equal(
+            overview[overview > 2300], indices[indices > 2300]
+        )
@@ -0,0 +1,109 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from doors_dashboards.core.featurecache import FeatureCache
+from doors_dashboards.core.featurehandler import FeatureHandler
+
+_TEST_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_data")
+_EEZ_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "data", "eez", "BG_eez"
+)
+
+
+class FeatureCacheTest(TestCase):
+
+    def setUp(self) -> None:
+        self.cache_dir = tempfile.mkdtemp()
+        self.data_dir = tempfile.mkdtemp()
+        shutil.copy(os.path.join(_TEST_DATA_DIR, "2.csv"), self.data_dir)
+        self.config = [
+            dict(
+                id="2",
+                type="local",
+                params=dict(
+                    file=os.path.join(self.data_dir, "2.csv"),
+                    variables=["chlorophyll", "temperature"],
+                ),
+            )
+        ]
+        self.feature_cache = FeatureCache(self.cache_dir)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.cache_dir)
+        shutil.rmtree(self.data_dir)
+
+    def test_read_from_cache(self):
+        feature_handler = FeatureHandler(self.config, "BG_eez")
+        expected = feature_handler.get_df("2")
+        # frames are shared while a handler holds them
+        feature_handler.close()
+        self.assertEqual(0, len(self.feature_cache.get_entries()))
+
+        feature_handler = FeatureHandler(self.config, "BG_eez", self.feature_cache)
+        gdf = feature_handler.get_df("2")
+        feature_handler.close()
+        entries = self.feature_cache.get_entries()
+        self.assertEqual(1, len(entries))
+        self.assertEqual("2", entries[0]["id"])
+        self.assertEqual("BG_eez", entries[0]["eez"])
+        self.assertEqual(1, entries[0]["rows"])
+        self.assertTrue(expected.equals(gdf))
+
+        feature_handler = FeatureHandler(self.config, "BG_eez", self.feature_cache)
+        self.addCleanup(feature_handler.close)
+        cached = feature_handler.get_df("2")
+        self.assertTrue(expected.equals(cached))
+        self.assertEqual(expected.crs, cached.crs)
+
+    def test_changed_source_file_invalidates_entry(self):
+        feature_handler = FeatureHandler(self.config, None, self.feature_cache)
+        self.addCleanup(feature_handler.close)
+        self.assertEqual(3, len(feature_handler.get_df("2")))
+        key = self.feature_cache.get_entries()[0]["key"]
+
+        with open(os.path.join(self.data_dir, "2.csv"), "a") as csv_file:
+            csv_file.write('\n"POINT(28.2 42.5)",0.02,13.4,2007-10-15T21:01:02')
+        feature_handler = FeatureHandler(self.config, None, self.feature_cache)
+        self.addCleanup(feature_handler.close)
+        self.assertEqual(4, len(feature_handler.get_df("2")))
+        entries = self.feature_cache.get_entries()
+        self.assertEqual(1, len(entries))
+        self.assertNotEqual(key, entries[0]["key"])
+
+    def test_changed_eez_file_invalidates_entry(self):
+        eez_dir = os.path.join(self.data_dir, "BG_eez")
+        shutil.copytree(_EEZ_DIR, eez_dir)
+        eez_path = os.path.join(eez_dir, "BG_eez.shp")
+        with patch.object(FeatureHandler, "_get_eez_path", return_value=eez_path):
+            feature_handler = FeatureHandler(self.config, "BG_eez", self.feature_cache)
+            feature_handler.get_df("2")
+            feature_handler.close()
+            key = self.feature_cache.get_entries()[0]["key"]
+
+            dbf_path = os.path.join(eez_dir, "BG_eez.dbf")
+            stat = os.stat(dbf_path)
+            os.utime(dbf_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+            feature_handler = FeatureHandler(self.config, "BG_eez", self.feature_cache)
+            self.addCleanup(feature_handler.close)
+            feature_handler.get_df("2")
+        entries = self.feature_cache.get_entries()
+        self.assertEqual(1, len(entries))
+        self.assertNotEqual(key, entries[0]["key"])
+
+    def test_evict(self):
+        feature_handler = FeatureHandler(self.config, None, self.feature_cache)
+        self.addCleanup(feature_handler.close)
+        feature_handler.get_df("2")
+        self.assertEqual(0, self.feature_cache.evict_collections(["1"]))
+        self.assertEqual(1, self.feature_cache.evict_collections(["2"]))
+        self.assertEqual([], self.feature_cache.get_entries())
+
+    def test_delete_df_evicts_entry(self):
+        feature_handler = FeatureHandler(self.config, None, self.feature_cache)
+        self.addCleanup(feature_handler.close)
+        feature_handler.get_df("2")
+        feature_handler.delete_df("2")
+        self.assertEqual([], self.feature_cache.get_entries())
@@ -1,6 +1,19 @@
+import geopandas as gpd
+import numpy as np
+import os
+import pandas as pd
+import shapely
+import shutil
+import tempfile
+import threading
+import time
+from typing import List
+from unittest import mock
 from unittest import TestCase
 
 from doors_dashboards.core.featurehandler import FeatureHandler
+from doors_dashboards.core.sourceregistry import get_source_registry
+from doors_dashboards.core.tracer import StartupTracer
 
 _TEST_CONFIG = [
     dict(
@@ -55,6 +68,7 @@ class FeatureHandlerClass(TestCase):
 
     def setUp(self) -> None:
         self.feature_handler = FeatureHandler(_TEST_CONFIG)
+        self.addCleanup(self.feature_handler.close)
 
     def test_get_collections(self):
         self.assertEqual(
@@ -99,16 +113,36 @@ class FeatureHandlerClass(TestCase):
         self.assertEqual(nested_levels_4,
                          self.feature_handler.get_nested_level_values("4"))
 
+    def test_get_nested_level_values_returns_copy(self):
+        self.feature_handler.get_nested_level_values("3").sort()
+        self.assertEqual(
+            "Terminal East", self.feature_handler.get_nested_level_values("3")[0]
+        )
+
+    def test_get_level_df(self):
+        self.assertEqual(8, len(self.feature_handler.get_level_df("4")))
+        gdf = self.feature_handler.get_level_df("4", "JOSS GE-UA 2016")
+        self.assertEqual(["JOSS GE-UA - 13", "JOSS GE-UA - 13",
+                          "JOSS GE-UA - 21", "JOSS GE-UA - 21"],
+                         list(gdf["station"]))
+        gdf = self.feature_handler.get_level_df(
+            "4", "JOSS GE-UA 2016", "JOSS GE-UA - 21"
+        )
+        self.assertEqual([0.0, 40.0], list(gdf["sampling_depth"]))
+        gdf = self.feature_handler.get_level_df("3", "Terminal 2A")
+        self.assertEqual(["Terminal 2A"], list(gdf["label"]))
+        self.assertEqual(0, len(self.feature_handler.get_level_df("3", "Nowhere")))
+
     def test_get_points_as_tuples_1(self):
         lons, lats, labels, values = self.feature_handler.get_points_as_tuples("1")
-        self.assertEqual([20.5, 28.5, 22.5], lons)
-        self.assertEqual([22.2, 42.2, 62.2], lats)
-        self.assertEqual(["x", "y", "z"], labels)
+        self.assertEqual([20.5, 28.5, 22.5], list(lons))
+        self.assertEqual([22.2, 42.2, 62.2], list(lats))
+        self.assertEqual(["x", "y", "z"], list(labels))
 
     def test_get_points_as_tuples_2(self):
         lons, lats, labels, values = self.feature_handler.get_points_as_tuples("2")
-        self.assertEqual([28.1, 10.2, -10.3], lons)
-        self.assertEqual([42.4, 55.3, 45.2], lats)
+        self.assertEqual([28.1, 10.2, -10.3], list(lons))
+        self.assertEqual([42.4, 55.3, 45.2], list(lats))
         self.assertEqual([
             "geometry: POINT (28.1 42.4)<br>chlorophyll: 0.001<br>"
             "temperature: 20.1<br>timestamp: 2007-10-12T23:01:02",
@@ -116,39 +150,124 @@ class FeatureHandlerClass(TestCase):
             "temperature: 10.1<br>timestamp: 2007-10-13T22:01:02",
             "geometry: POINT (-10.3 45.2)<br>chlorophyll: 0.01<br>"
             "temperature: 12.4<br>timestamp: 2007-10-14T21:01:02"],
-            labels
+            list(labels)
         )
 
     def test_get_points_as_tuples_3(self):
         lons, lats, labels, values = self.feature_handler.get_points_as_tuples("3")
         self.assertEqual(
-            [27.479, 27.47, 27.467, 27.457, 27.53, 27.728, 27.687], lons
+            [27.479, 27.47, 27.467, 27.457, 27.53, 27.728, 27.687], list(lons)
         )
         self.assertEqual(
-            [42.486, 42.486, 42.48, 42.485, 42.45, 42.657, 42.42], lats
+            [42.486, 42.486, 42.48, 42.485, 42.45, 42.657, 42.42], list(lats)
         )
         self.assertEqual(["Terminal East", "Terminal Bulk Cargoes",
                           "Terminal 2A", "Terminal West", "Terminal Rosenets",
                           "Terminal Nessebar", "Terminal Sozopol"],
-                         labels)
+                         list(labels))
 
     def test_get_points_as_tuples_4(self):
         lons, lats, labels, values = self.feature_handler.get_points_as_tuples("4")
         self.assertEqual(
             [30.2518, 30.2518, 31.0021, 31.0021,
-             36.0697, 36.0697, 31.5675, 31.5675], lons
+             36.0697, 36.0697, 31.5675, 31.5675], list(lons)
         )
         self.assertEqual(
             [45.3386, 45.3386, 46.3333, 46.3333,
-             43.526, 43.526, 44.1582, 44.1582], lats
+             43.526, 43.526, 44.1582, 44.1582], list(lats)
         )
         self.assertEqual(
             ["JBSS GE-UA - 1A", "JBSS GE-UA - 1A", "JBSS GE-UA - 2A",
              "JBSS GE-UA - 2A", "JOSS GE-UA - 13", "JOSS GE-UA - 13",
              "JOSS GE-UA - 21", "JOSS GE-UA - 21"],
-            labels
+            list(labels)
         )
 
+    def test_get_points_as_tuples_is_cached(self):
+        points = self.feature_handler.get_points_as_tuples("2")
+        self.assertIs(points, self.feature_handler.get_points_as_tuples("2"))
+        self.feature_handler.delete_df("2")
+        self.assertIsNot(points, self.feature_handler.get_points_as_tuples("2"))
+
+    def test_get_df_concurrently(self):
+        read_features = self.feature_handler._read_features
+        reads = []
+
+        def slow_read_features(features):
+            reads.append(features["id"])
+            time.sleep(0.1)
+            return read_features(features)
+
+        gdfs = []
+        with mock.patch.object(
+            self.feature_handler, "_read_features", side_effect=slow_read_features
+        ):
+            threads = [
+                threading.Thread(
+                    target=lambda: gdfs.append(self.feature_handler.get_df("2"))
+                )
+                for _ in range(8)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(["2"], reads)
+        self.assertEqual(8, len(gdfs))
+        self.assertTrue(all(gdf is gdfs[0] for gdf in gdfs))
+
+    def test_prefetch(self):
+        read_features = self.feature_handler._read_features
+        reads = []
+
+        def slow_read_features(features):
+            reads.append(features["id"])
+            time.sleep(0.2)
+            if features["id"] == "1":
+                raise ValueError("1")
+            return read_features(features)
+
+        with mock.patch.object(
+            self.feature_handler, "_read_features", side_effect=slow_read_features
+        ):
+            start = time.perf_counter()
+            futures = self.feature_handler.prefetch()
+            self.assertEqual(["1", "2", "3", "4"], list(futures.keys()))
+            gdf = self.feature_handler.get_df("3")
+            self.assertIs(gdf, futures["3"].result())
+            for future in futures.values():
+                future.exception()
+            # the collections are read at the same time
+            self.assertLess(time.perf_counter() - start, 0.6)
+        self.assertEqual(["1", "2", "3", "4"], sorted(reads))
+        self.assertIsInstance(futures["1"].exception(), ValueError)
+        self.assertEqual({}, self.feature_handler.prefetch([]))
+
+    def test_prefetch_traces_reads_in_profile(self):
+        output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, output_dir)
+        tracer = StartupTracer(output_dir)
+        with mock.patch("doors_dashboards.core.tracer._TRACER", tracer):
+            with tracer.trace("create dashboard", "dash"):
+                futures = self.feature_handler.prefetch(["2", "3"])
+                for future in futures.values():
+                    future.result()
+        paths = [phase["path"] for phase in tracer.get_profile("dash")]
+        self.assertIn(["create dashboard", "read collection 2"], paths)
+        self.assertIn(["create dashboard", "read collection 3"], paths)
+
+    def test_get_df_at_point(self):
+        gdf = self.feature_handler.get_df_at_point("4", 31.0021, 46.3333)
+        self.assertEqual(2, len(gdf))
+        self.assertEqual(["JBSS GE-UA - 2A", "JBSS GE-UA - 2A"], list(gdf["station"]))
+        self.assertEqual([0.0, 21.0], list(gdf["sampling_depth"]))
+
+        gdf = self.feature_handler.get_df_at_point("3", 27.47, 42.486)
+        self.assertEqual(["Terminal Bulk Cargoes"], list(gdf["label"]))
+
+        gdf = self.feature_handler.get_df_at_point("3", 27.47, 42.485)
+        self.assertEqual(0, len(gdf))
+
     def _test_methods(self, exp: str):
         self.assertEqual(exp,
                          self.feature_handler.get_default_collection())
@@ -156,8 +275,10 @@ class FeatureHandlerClass(TestCase):
                          self.feature_handler.get_levels())
         self.assertEqual(self.feature_handler.get_variables(exp),
                          self.feature_handler.get_variables())
-        self.assertEqual(self.feature_handler.get_points_as_tuples(exp),
-                         self.feature_handler.get_points_as_tuples())
+        self.assertEqual(
+            [list(a) for a in self.feature_handler.get_points_as_tuples(exp)[:3]],
+            [list(a) for a in self.feature_handler.get_points_as_tuples()[:3]]
+        )
         self.assertEqual(self.feature_handler.get_nested_level_values(exp),
                          self.feature_handler.get_nested_level_values())
 
@@ -166,19 +287,309 @@ class FeatureHandlerClassWithEez(TestCase):
 
     def setUp(self) -> None:
         self.feature_handler = FeatureHandler(_TEST_CONFIG, "BG_eez")
+        self.addCleanup(self.feature_handler.close)
 
     def test_feature_handler_with_eez_1(self):
         lons, lats, labels, values = self.feature_handler.get_points_as_tuples("1")
-        self.assertEqual([28.5], lons)
-        self.assertEqual([42.2], lats)
-        self.assertEqual(["y"], labels)
+        self.assertEqual([28.5], list(lons))
+        self.assertEqual([42.2], list(lats))
+        self.assertEqual(["y"], list(labels))
 
     def test_feature_handler_with_eez_2(self):
         lons, lats, labels, values = self.feature_handler.get_points_as_tuples("2")
-        self.assertEqual([28.1], lons)
-        self.assertEqual([42.4], lats)
+        self.assertEqual([28.1], list(lons))
+        self.assertEqual([42.4], list(lats))
         self.assertEqual([
             "geometry: POINT (28.1 42.4)<br>chlorophyll: 0.001<br>"
             "temperature: 20.1<br>timestamp: 2007-10-12T23:01:02"],
-            labels
+            list(labels)
+        )
+
+
+class FeatureHandlerLatLonClass(TestCase):
+
+    def test_read_lat_lon_columns(self):
+        feature_handler = FeatureHandler([
+            dict(
+                id="5",
+                type="local",
+                params=dict(
+                    file="test_data/5.csv",
+                    label="station"
+                )
+            )
+        ])
+        lons, lats, labels, values = feature_handler.get_points_as_tuples("5")
+        self.assertEqual([27.479, 27.728], list(lons))
+        self.assertEqual([42.486, 42.657], list(lats))
+        self.assertEqual(["D1", "D2"], list(labels))
+
+    def test_read_configured_lat_lon_columns(self):
+        feature_handler = FeatureHandler([
+            dict(
+                id="5",
+                type="local",
+                params=dict(
+                    file="test_data/5.csv",
+                    label="station",
+                    lat_column="lon",
+                    lon_column="lat"
+                )
+            )
+        ])
+        lons, lats, labels, values = feature_handler.get_points_as_tuples("5")
+        self.assertEqual([42.486, 42.657], list(lons))
+        self.assertEqual([27.479, 27.728], list(lats))
+
+
+class FeatureHandlerRefreshClass(TestCase):
+
+    def setUp(self) -> None:
+        self.data_dir = tempfile.mkdtemp()
+        shutil.copy("test_data/2.csv", self.data_dir)
+        self.file_path = os.path.join(self.data_dir, "2.csv")
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.data_dir)
+
+    def test_refresh_local(self):
+        feature_handler = FeatureHandler(
+            [dict(id="2", type="local", params=dict(file=self.file_path))]
+        )
+        self.assertFalse(feature_handler.refresh())
+        self.assertEqual(3, len(feature_handler.get_df("2")))
+        self.assertFalse(feature_handler.refresh())
+        self.assertEqual(0, feature_handler.get_version())
+
+        with open(self.file_path, "a") as csv_file:
+            csv_file.write('\n"POINT(28.2 42.5)",0.02,13.4,2007-10-15T21:01:02')
+        self.assertTrue(feature_handler.refresh())
+        self.assertEqual(1, feature_handler.get_version())
+        self.assertEqual(4, len(feature_handler.get_df("2")))
+        self.assertEqual(1, len(feature_handler.get_df_at_point("2", 28.2, 42.5)))
+        self.assertFalse(feature_handler.refresh())
+
+    @staticmethod
+    def _get_geodb_gdf(timestamps: List[str], **columns) -> gpd.GeoDataFrame:
+        return gpd.GeoDataFrame(
+            dict(timestamp=pd.to_datetime(timestamps), **columns),
+            geometry=shapely.points([28.0] * len(timestamps), [43.0] * len(timestamps)),
+            crs="EPSG:4326",
+        )
+
+    def test_refresh_geodb(self):
+        get_gdf = self._get_geodb_gdf
+        feature_handler = FeatureHandler(
+            [
+                dict(
+                    id="g",
+                    type="geodb",
+                    params=dict(collection="g", variables=["value"]),
+                )
+            ]
+        )
+        self.addCleanup(feature_handler.close)
+        with mock.patch(
+            "doors_dashboards.core.featurehandler.get_dataframe_from_geodb"
+        ) as read_mock:
+            read_mock.return_value = get_gdf(["2024-01-01", "2024-01-02"], value=[0, 1])
+            self.assertEqual(2, len(feature_handler.get_df("g")))
+
+            # rows at the last time are read again
+            read_mock.return_value = get_gdf(["2024-01-02"], value=[1])
+            self.assertFalse(feature_handler.refresh())
+            self.assertEqual(
+                "\"timestamp\" >= '2024-01-02T00:00:00'",
+                read_mock.call_args.kwargs["where"]
+            )
+            self.assertEqual(0, feature_handler.get_version())
+
+            # rows added at the last time after the last read are kept
+            read_mock.return_value = get_gdf(["2024-01-02"] * 2, value=[1, 2])
+            self.assertTrue(feature_handler.refresh())
+            self.assertEqual([0, 1, 2], list(feature_handler.get_df("g")["value"]))
+
+            read_mock.return_value = get_gdf(
+                ["2024-01-02", "2024-01-02", "2024-01-03"], value=[1, 2, 3]
+            )
+            self.assertTrue(feature_handler.refresh())
+            self.assertEqual([0, 1, 2, 3], list(feature_handler.get_df("g")["value"]))
+            self.assertEqual(2, feature_handler.get_version())
+
+    def test_refresh_geodb_completed_row(self):
+        # rows converted from parameters are completed when later parameters
+        # of the same time arrive
+        get_gdf = self._get_geodb_gdf
+        feature_handler = FeatureHandler(
+            [dict(id="g", type="geodb", params=dict(collection="g"))]
+        )
+        self.addCleanup(feature_handler.close)
+        with mock.patch(
+            "doors_dashboards.core.featurehandler.get_dataframe_from_geodb"
+        ) as read_mock:
+            read_mock.return_value = get_gdf(["2024-01-01", "2024-01-02"], v1=[1, 2])
+            feature_handler.get_df("g")
+
+            read_mock.return_value = get_gdf(["2024-01-02"], v1=[2], v2=[5.0])
+            self.assertTrue(feature_handler.refresh())
+            gdf = feature_handler.get_df("g")
+            self.assertEqual(2, len(gdf))
+            self.assertEqual([1, 2], list(gdf["v1"]))
+            self.assertTrue(pd.isna(gdf["v2"].iloc[0]))
+            self.assertEqual(5.0, gdf["v2"].iloc[1])
+
+            self.assertFalse(feature_handler.refresh())
+            self.assertEqual(1, feature_handler.get_version())
+
+    def test_refresh_empty_geodb_collection(self):
+        feature_handler = FeatureHandler(
+            [dict(id="g", type="geodb", params=dict(collection="g"))]
+        )
+        self.addCleanup(feature_handler.close)
+        empty_gdf = gpd.GeoDataFrame(
+            dict(timestamp=pd.to_datetime([])), geometry=[], crs="EPSG:4326"
+        )
+        with mock.patch(
+            "doors_dashboards.core.featurehandler.get_dataframe_from_geodb",
+            return_value=empty_gdf,
+        ) as read_mock:
+            self.assertEqual(0, len(feature_handler.get_df("g")))
+            self.assertFalse(feature_handler.refresh())
+            self.assertEqual(1, read_mock.call_count)
+
+            with mock.patch(
+                "doors_dashboards.core.featurehandler.time.monotonic",
+                return_value=time.monotonic() + 2 * 60 * 60,
+            ):
+                self.assertFalse(feature_handler.refresh())
+                self.assertEqual(2, read_mock.call_count)
+                self.assertFalse(feature_handler.refresh())
+                self.assertEqual(2, read_mock.call_count)
+
+
+class FeatureHandlerSharedSourcesClass(TestCase):
+
+    def setUp(self) -> None:
+        self.data_dir = tempfile.mkdtemp()
+        shutil.copy("test_data/2.csv", self.data_dir)
+        self.file_path = os.path.join(self.data_dir, "2.csv")
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.data_dir)
+
+    def _get_feature_handler(self, eez: str = None, **params) -> FeatureHandler:
+        feature_handler = FeatureHandler(
+            [dict(id="2", type="local", params=dict(file=self.file_path, **params))],
+            eez,
+        )
+        self.addCleanup(feature_handler.close)
+        return feature_handler
+
+    def test_share_frames(self):
+        feature_handler_1 = self._get_feature_handler(color="red")
+        feature_handler_2 = self._get_feature_handler(color="blue")
+        gdf = feature_handler_1.get_df("2")
+        self.assertIs(gdf, feature_handler_2.get_df("2"))
+
+        # frames clipped to an EEZ are a different source
+        feature_handler_3 = self._get_feature_handler("BG_eez")
+        self.assertIsNot(gdf, feature_handler_3.get_df("2"))
+        self.assertIs(
+            feature_handler_3._eez_frame,
+            self._get_feature_handler("BG_eez")._eez_frame,
+        )
+
+    def test_release_frames(self):
+        registry = get_source_registry()
+        feature_handler_1 = self._get_feature_handler()
+        feature_handler_2 = self._get_feature_handler()
+        gdf = feature_handler_1.get_df("2")
+        feature_handler_2.get_df("2")
+        source_key = feature_handler_1._source_keys["2"]
+        self.assertEqual(2, registry.get_references(source_key))
+
+        feature_handler_1.close()
+        self.assertEqual(1, registry.get_references(source_key))
+        feature_handler_2.delete_df("2")
+        self.assertEqual(0, registry.get_references(source_key))
+        self.assertIsNone(registry.get(source_key))
+        self.assertIsNot(gdf, feature_handler_2.get_df("2"))
+
+    def test_changed_source_file(self):
+        feature_handler_1 = self._get_feature_handler()
+        self.assertEqual(3, len(feature_handler_1.get_df("2")))
+        with open(self.file_path, "a") as csv_file:
+            csv_file.write('\n"POINT(28.2 42.5)",0.02,13.4,2007-10-15T21:01:02')
+        feature_handler_2 = self._get_feature_handler()
+        self.assertEqual(4, len(feature_handler_2.get_df("2")))
+
+        # the refreshed frame is shared with the first handler
+        self.assertTrue(feature_handler_1.refresh())
+        self.assertIs(feature_handler_2.get_df("2"), feature_handler_1.get_df("2"))
+        self.assertFalse(feature_handler_2.refresh())
+
+
+class FeatureHandlerPolygonClass(TestCase):
+
+    def setUp(self) -> None:
+        self.data_dir = tempfile.mkdtemp()
+        file_path = os.path.join(self.data_dir, "sites.csv")
+        circle = shapely.Point(28.0, 43.0).buffer(0.5, quad_segs=64)
+        with open(file_path, "w") as csv_file:
+            csv_file.write("geometry,sitename\n")
+            csv_file.write('"POLYGON((27 42, 28 42, 28 43, 27 42))",A\n')
+            csv_file.write(
+                '"MULTIPOLYGON(((29 42, 30 42, 30 43, 29 42)),'
+                '((31 42, 32 42, 32 43, 31 42)))",B\n'
+            )
+            csv_file.write(f'"{circle.wkt}",C\n')
+        self.feature_handler = FeatureHandler(
+            [dict(id="sites", type="local", params=dict(file=file_path))]
+        )
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.data_dir)
+
+    def test_get_polygon_data(self):
+        lons, lats, texts = self.feature_handler.get_polygon_data("sites")
+        self.assertEqual(3 * 5 + 258, len(lons))
+        self.assertEqual([27.0, 28.0, 28.0, 27.0], list(lons[:4]))
+        self.assertEqual([42.0, 42.0, 43.0, 42.0], list(lats[:4]))
+        self.assertTrue(np.isnan(lons[4]))
+        self.assertEqual([29.0, 30.0, 30.0, 29.0], list(lons[5:9]))
+        self.assertEqual([31.0, 32.0, 32.0, 31.0], list(lons[10:14]))
+        self.assertEqual(["A"] * 5 + ["B"] * 10 + ["C"] * 258, list(texts))
+        self.assertIs(lons, self.feature_handler.get_polygon_data("sites")[0])
+
+    def test_get_polygon_data_without_site_names(self):
+        file_path = os.path.join(self.data_dir, "outlines.csv")
+        with open(file_path, "w") as csv_file:
+            csv_file.write("geometry\n")
+            csv_file.write('"POLYGON((27 42, 28 42, 28 43, 27 42))"\n')
+        feature_handler = FeatureHandler(
+            [dict(id="outlines", type="local", params=dict(file=file_path))]
+        )
+        lons, lats, texts = feature_handler.get_polygon_data("outlines")
+        self.assertEqual([27.0, 28.0, 28.0, 27.0], list(lons[:4]))
+        self.assertEqual([""] * 5, list(texts))
+
+    def test_get_polygon_data_simplified(self):
+        lons, lats, texts = self.feature_handler.get_polygon_data("sites", 4)
+        self.assertLess(len(lons), 3 * 5 + 258)
+        self.assertEqual(list(lons[:4]), [27.0, 28.0, 28.0, 27.0])
+        self.assertEqual(len(lons), len(texts))
+        # zoom levels are mapped to the next precomputed level of detail
+        self.assertIs(lons, self.feature_handler.get_polygon_data("sites", 3.2)[0])
+        self.assertEqual(
+            3 * 5 + 258, len(self.feature_handler.get_polygon_data("sites", 14)[0])
+        )
+
+    def test_get_polygon_data_in_bounds(self):
+        lons, lats, texts = self.feature_handler.get_polygon_data(
+            "sites", bounds=(28.5, 41.0, 31.5, 43.0)
+        )
+        self.assertEqual(["B"] * 10 + ["C"] * 258, list(texts))
+        lons, lats, texts = self.feature_handler.get_polygon_data(
+            "sites", bounds=(40.0, 41.0, 41.0, 42.0)
         )
+        self.assertEqual(0, len(lons))
@@ -0,0 +1,214 @@
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import re
+import shapely
+from unittest import mock
+from unittest import TestCase
+
+from doors_dashboards.core import geodbaccess
+from doors_dashboards.core.geodbaccess import convert_parameters_to_columns
+from doors_dashboards.core.geodbaccess import get_dataframe_from_geodb
+from doors_dashboards.core.geodbaccess import read_parts_from_geodb
+
+
+def _convert_parameters_to_columns_by_rows(gdf, variables, keys, value, parameter):
+    # former implementation, kept as reference
+    gdf = gdf.copy()
+    full = keys + [value]
+    for variable in variables:
+        sgdf = gdf[gdf[parameter] == variable][full]
+        for row, line in sgdf.iterrows():
+            loc_row = gdf[keys[0]] == line[keys[0]]
+            for key in keys[1:]:
+                loc_row &= gdf[key] == line[key]
+            gdf.loc[loc_row, variable] = line[value]
+    return gdf
+
+
+def create_long_frame(num_rows: int, seed: int = 42) -> gpd.GeoDataFrame:
+    rng = np.random.default_rng(seed)
+    stations = [f"S{i}" for i in range(max(num_rows // 20, 1))]
+    station = rng.choice(stations, num_rows).astype(object)
+    station[rng.random(num_rows) < 0.01] = None
+    return gpd.GeoDataFrame(
+        {
+            "station": station,
+            "sampling depth [m]": rng.choice([0.0, 10.0, 20.0], num_rows),
+            "parameter": rng.choice(["Phosphate", "Silicon", "Nitrate"], num_rows),
+            "value": rng.uniform(0, 5, num_rows),
+        },
+        geometry=shapely.points(rng.uniform(40, 42, num_rows), np.full(num_rows, 43)),
+        index=rng.permutation(num_rows) * 3,
+        crs="EPSG:4326",
+    )
+
+
+def _filter(gdf: gpd.GeoDataFrame, where: str) -> gpd.GeoDataFrame:
+    conditions = re.fullmatch(r"\((.+)\) AND \((.+)\)", where)
+    for condition in conditions.groups() if conditions else [where]:
+        envelope = re.fullmatch(
+            r'ST_Intersects\("geometry", ST_MakeEnvelope\((.+), (.+), (.+), (.+), '
+            r"4326\)\)",
+            condition,
+        )
+        if envelope is not None:
+            min_x, min_y, max_x, max_y = (float(e) for e in envelope.groups())
+            gdf = gdf.cx[min_x:max_x, min_y:max_y]
+            continue
+        column, value = re.fullmatch('"(.+)" > \'(.+)\'', condition).groups()
+        gdf = gdf[gdf[column] > pd.Timestamp(value)]
+    return gdf
+
+
+class _GeoDBClientMock:
+
+    def __init__(self, gdf: gpd.GeoDataFrame):
+        self.gdf = gdf
+        self.selects = []
+        self.wheres = []
+
+    def count_collection_rows(self, collection, database=None, exact_count=False):
+        return len(self.gdf)
+
+    def get_collection_srid(self, collection, database=None):
+        return 4326
+
+    def get_collection_pg(
+        self,
+        collection,
+        select="*",
+        where=None,
+        order=None,
+        limit=None,
+        offset=None,
+        database=None,
+    ):
+        self.selects.append(select)
+        self.wheres.append(where)
+        gdf = self.gdf
+        if where is not None:
+            gdf = _filter(gdf, where)
+        if select == "count(*)":
+            return pd.DataFrame(dict(count=[len(gdf)]))
+        part = gdf.sort_values(order).iloc[offset : offset + limit]
+        if select != "*":
+            part = part[[c.strip('"') for c in select.split(", ")]]
+        if len(part) == 0:
+            return pd.DataFrame(columns=["Empty Result"])
+        return part
+
+
+class GeoDBAccessTest(TestCase):
+
+    def setUp(self) -> None:
+        num_rows = 2500
+        rng = np.random.default_rng(42)
+        # a dense cluster and a few isolated points
+        lons = np.concatenate([rng.uniform(28.0, 28.05, num_rows - 5), np.arange(5)])
+        lats = np.concatenate([rng.uniform(43.0, 43.05, num_rows - 5), np.arange(5)])
+        self.gdf = gpd.GeoDataFrame(
+            dict(
+                id=np.arange(num_rows)[::-1],
+                timestamp=pd.date_range("2020-01-01", periods=num_rows, freq="h"),
+                temperature=rng.uniform(5, 25, num_rows),
+                station=[f"S{i % 7}" for i in range(num_rows)],
+            ),
+            geometry=shapely.points(lons, lats),
+            crs="EPSG:4326",
+        )
+        self.client = _GeoDBClientMock(self.gdf)
+        self.client_patch = mock.patch.object(
+            geodbaccess, "_get_client", return_value=self.client
+        )
+        self.client_patch.start()
+        self.part_size_patch = mock.patch.object(geodbaccess, "_PART_SIZE", 300)
+        self.part_size_patch.start()
+
+    def tearDown(self) -> None:
+        self.client_patch.stop()
+        self.part_size_patch.stop()
+
+    def test_read_parts(self):
+        parts = list(read_parts_from_geodb("c", "db", columns=["id", "geometry"]))
+        self.assertEqual(9, len(parts))
+        self.assertEqual(["id", "geometry"], list(parts[0].columns))
+        ids = pd.concat(parts)["id"]
+        np.testing.assert_equal(np.arange(2500), ids.values)
+
+    def test_read_parts_sampled(self):
+        gdf = pd.concat(read_parts_from_geodb("c", "db", max_rows=500, max_workers=2))
+        self.assertLess(len(gdf), 600)
+        # isolated points are kept
+        for i in range(5):
+            self.assertEqual(1, (gdf.geometry.x == i).sum())
+
+    def test_get_dataframe(self):
+        gdf = get_dataframe_from_geodb(
+            "c", "db", ["temperature"], label="station", levels=["station"]
+        )
+        self.assertEqual(2500, len(gdf))
+        self.assertEqual(
+            {"geometry", "timestamp", "temperature", "station"}, set(gdf.columns)
+        )
+        self.assertEqual(
+            list(self.gdf.sort_values("id")["temperature"]), list(gdf["temperature"])
+        )
+
+    def test_convert_parameters_to_columns(self):
+        gdf = create_long_frame(1000)
+        args = (
+            gdf,
+            ["Phosphate", "Silicon", "Nitrate"],
+            ["station", "sampling depth [m]"],
+            "value",
+            "parameter",
+        )
+        expected = _convert_parameters_to_columns_by_rows(*args)
+        actual = convert_parameters_to_columns(*args)
+        pd.testing.assert_frame_equal(expected, actual)
+        self.assertGreater(actual["Silicon"].isna().sum(), 0)
+        self.assertGreater(actual["Silicon"].notna().sum(), 0)
+
+    def test_read_parts_where(self):
+        parts = list(
+            read_parts_from_geodb("c", "db", where="\"timestamp\" > '2020-04-01'")
+        )
+        self.assertEqual(2, len(parts))
+        gdf = pd.concat(parts)
+        self.assertEqual(315, len(gdf))
+        self.assertTrue((gdf["timestamp"] > pd.Timestamp("2020-04-01")).all())
+
+    def test_get_dataframe_projected(self):
+        get_dataframe_from_geodb("c", "db", ["temperature"], levels=["station"])
+        selects = set(self.client.selects)
+        self.assertEqual(1, len(selects))
+        self.assertEqual(
+            {'"geometry"', '"timestamp"', '"temperature"', '"station"', '"id"'},
+            set(selects.pop().split(", ")),
+        )
+
+    def test_get_dataframe_masked(self):
+        mask = gpd.GeoDataFrame(
+            geometry=[shapely.box(-0.5, -0.5, 2.5, 2.5)], crs="EPSG:4326"
+        )
+        gdf = get_dataframe_from_geodb("c", "db", ["temperature"], mask=mask)
+        self.assertEqual([0.0, 1.0, 2.0], sorted(gdf.geometry.x))
+        # only rows within the bounds of the mask are requested
+        self.assertEqual("count(*)", self.client.selects[0])
+        envelope = (
+            'ST_Intersects("geometry", ST_MakeEnvelope(-0.5, -0.5, 2.5, 2.5, 4326))'
+        )
+        self.assertEqual({envelope}, set(self.client.wheres))
+
+        gdf = get_dataframe_from_geodb(
+            "c",
+            "db",
+            ["temperature"],
+            mask=mask,
+            where="\"timestamp\" > '2020-04-01'",
+        )
+        self.assertEqual(
+            f"(\"timestamp\" > '2020-04-01') AND ({envelope})", self.client.wheres[-1]
+        )
+        self.assertEqual([0.0, 1.0, 2.0], sorted(gdf.geometry.x))
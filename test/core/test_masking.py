@@ -0,0 +1,64 @@
+import geopandas as gpd
+import shapely
+from unittest import TestCase
+
+from doors_dashboards.core.masking import get_mask_geometry
+from doors_dashboards.core.masking import mask_frame
+
+_MASK = gpd.GeoDataFrame(
+    geometry=[shapely.box(0, 0, 2, 2), shapely.box(2, 0, 4, 1)], crs="EPSG:4326"
+)
+
+
+class MaskingTest(TestCase):
+
+    def test_get_mask_geometry(self):
+        geometry = get_mask_geometry(_MASK)
+        self.assertTrue(shapely.is_prepared(geometry))
+        self.assertEqual((0.0, 0.0, 4.0, 2.0), geometry.bounds)
+        self.assertIs(geometry, get_mask_geometry(_MASK))
+
+    def test_mask_points(self):
+        gdf = gpd.GeoDataFrame(
+            dict(name=["a", "b", "c", "d", "e"]),
+            geometry=[
+                shapely.Point(1, 1),
+                shapely.Point(3, 1.5),
+                shapely.Point(3, 0.5),
+                shapely.Point(10, 10),
+                shapely.Point(2, 2),
+            ],
+            index=[10, 11, 12, 13, 14],
+            crs="EPSG:4326",
+        )
+        masked = mask_frame(gdf, _MASK)
+        self.assertEqual(["a", "c", "e"], list(masked["name"]))
+        self.assertEqual([10, 12, 14], list(masked.index))
+        self.assertEqual(["a", "c", "e"], list(gdf.clip(_MASK).sort_index()["name"]))
+
+    def test_mask_polygons(self):
+        gdf = gpd.GeoDataFrame(
+            dict(name=["a", "b", "c"]),
+            geometry=[
+                shapely.Point(1, 1),
+                shapely.box(1, 1, 3, 3),
+                shapely.box(5, 5, 6, 6),
+            ],
+            crs="EPSG:4326",
+        )
+        masked = mask_frame(gdf, _MASK)
+        self.assertEqual(["a", "b"], list(masked["name"]))
+        self.assertEqual("EPSG:4326", masked.crs)
+        self.assertTrue(masked.geometry.iloc[0].equals(shapely.Point(1, 1)))
+        self.assertTrue(
+            masked.geometry.iloc[1].equals(gdf.clip(_MASK).geometry.loc[1])
+        )
+        self.assertEqual(1.0, masked.geometry.iloc[1].area)
+        # the frame itself is not changed
+        self.assertTrue(gdf.geometry.iloc[1].equals(shapely.box(1, 1, 3, 3)))
+
+    def test_mask_nothing(self):
+        gdf = gpd.GeoDataFrame(geometry=[shapely.Point(10, 10)], crs="EPSG:4326")
+        self.assertIs(gdf, mask_frame(gdf, None))
+        self.assertEqual(0, len(mask_frame(gdf, _MASK)))
+        self.assertEqual(0, len(mask_frame(gdf.iloc[:0], _MASK)))
@@ -0,0 +1,153 @@
+from dash import Dash
+from dash import dcc
+from dash import html
+from dash import Input
+from dash import Output
+from dash.exceptions import PreventUpdate
+import json
+from unittest import TestCase
+
+from doors_dashboards.core.metrics import callback
+from doors_dashboards.core.metrics import CallbackMetrics
+from doors_dashboards.core.metrics import get_callback_metrics
+from doors_dashboards.core.metrics import register_metrics
+
+
+def update_metrics_test_output(value):
+    if value == "prevent":
+        raise PreventUpdate
+    if value == "fail":
+        raise ValueError(value)
+    return value * 100
+
+
+class CallbackMetricsTest(TestCase):
+
+    def test_to_prometheus(self):
+        metrics = CallbackMetrics()
+        metrics.record_call("update", 0.02)
+        metrics.record_call("update", 2.0, "KeyError")
+        metrics.record_payload("update", 200, 20000)
+
+        lines = metrics.to_prometheus().splitlines()
+        self.assertIn('doors_callback_calls_total{callback="update"} 2', lines)
+        self.assertIn(
+            'doors_callback_duration_seconds_bucket{callback="update",le="0.025"} 1',
+            lines,
+        )
+        self.assertIn(
+            'doors_callback_duration_seconds_bucket{callback="update",le="2.5"} 2',
+            lines,
+        )
+        self.assertIn(
+            'doors_callback_duration_seconds_bucket{callback="update",le="+Inf"} 2',
+            lines,
+        )
+        self.assertIn(
+            'doors_callback_duration_seconds_count{callback="update"} 2', lines
+        )
+        self.assertIn(
+            'doors_callback_request_bytes_bucket{callback="update",le="1000.0"} 1',
+            lines,
+        )
+        self.assertIn(
+            'doors_callback_response_bytes_bucket{callback="update",le="10000.0"} 0',
+            lines,
+        )
+        self.assertIn(
+            'doors_callback_response_bytes_sum{callback="update"} 20000.0', lines
+        )
+        self.assertIn(
+            'doors_callback_exceptions_total{callback="update",exception="KeyError"} 1',
+            lines,
+        )
+        self.assertIn("# TYPE doors_callback_duration_seconds histogram", lines)
+
+
+class CallbackTest(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # dash moves global callbacks to the first app serving a request, so
+        # the callbacks are registered right before this app serves one; the
+        # same callback is registered for two dashboards
+        children = []
+        for dashboard_id in ["metrics-a", "metrics-b"]:
+            callback(
+                Output(f"{dashboard_id}-output", "children"),
+                Input(f"{dashboard_id}-input", "value"),
+                dashboard_id=dashboard_id,
+            )(update_metrics_test_output)
+            children.append(dcc.Input(id=f"{dashboard_id}-input"))
+            children.append(html.Div(id=f"{dashboard_id}-output"))
+        app = Dash(__name__)
+        app.layout = html.Div(children)
+        register_metrics(app.server)
+        cls.client = app.server.test_client()
+        cls.client.get("/")
+
+    def _update(self, value: str, dashboard_id: str = "metrics-a"):
+        output_id = f"{dashboard_id}-output"
+        return self.client.post(
+            "/_dash-update-component",
+            json={
+                "output": f"{output_id}.children",
+                "outputs": {"id": output_id, "property": "children"},
+                "inputs": [
+                    {"id": f"{dashboard_id}-input", "property": "value", "value": value}
+                ],
+                "changedPropIds": [f"{dashboard_id}-input.value"],
+                "state": [],
+            },
+        )
+
+    def test_callback(self):
+        metrics = get_callback_metrics()
+        name = "update_metrics_test_output"
+        calls = metrics.get_calls(name, "metrics-a")
+
+        response = self._update("a")
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(
+            "a" * 100,
+            json.loads(response.data)["response"]["metrics-a-output"]["children"],
+        )
+        self._update("prevent")
+        self.assertEqual(500, self._update("fail").status_code)
+
+        self.assertEqual(calls + 3, metrics.get_calls(name, "metrics-a"))
+        self.assertEqual(1, metrics.get_exceptions(name, "metrics-a").get("ValueError"))
+
+        labels = f'callback="{name}",dashboard="metrics-a"'
+        text = self.client.get("/metrics").get_data(as_text=True)
+        self.assertIn(f"doors_callback_calls_total{{{labels}}}", text)
+        self.assertIn(f"doors_callback_request_bytes_count{{{labels}}}", text)
+        prefix = f"doors_callback_response_bytes_sum{{{labels}}}"
+        sizes = [line for line in text.splitlines() if line.startswith(prefix)]
+        self.assertEqual(1, len(sizes))
+        self.assertGreater(float(sizes[0].split()[-1]), 100)
+
+    def test_callback_per_dashboard(self):
+        metrics = get_callback_metrics()
+        name = "update_metrics_test_output"
+        calls_a = metrics.get_calls(name, "metrics-a")
+        calls_b = metrics.get_calls(name, "metrics-b")
+
+        self.assertEqual(200, self._update("b", "metrics-b").status_code)
+        self.assertEqual(500, self._update("fail", "metrics-b").status_code)
+
+        self.assertEqual(calls_a, metrics.get_calls(name, "metrics-a"))
+        self.assertEqual(calls_b + 2, metrics.get_calls(name, "metrics-b"))
+        self.assertEqual(0, metrics.get_calls(name))
+        text = self.client.get("/metrics").get_data(as_text=True)
+        for dashboard_id in ["metrics-a", "metrics-b"]:
+            self.assertIn(
+                f'doors_callback_duration_seconds_count{{callback="{name}",'
+                f'dashboard="{dashboard_id}"}}',
+                text,
+            )
+        self.assertIn(
+            f'doors_callback_exceptions_total{{callback="{name}",'
+            f'dashboard="metrics-b",exception="ValueError"}} 1',
+            text,
+        )
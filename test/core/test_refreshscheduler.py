@@ -0,0 +1,35 @@
+import threading
+from unittest import TestCase
+
+from doors_dashboards.core.refreshscheduler import RefreshScheduler
+
+
+class _FeatureHandlerMock:
+
+    def __init__(self, num_refreshes: int):
+        self.num_refreshes = num_refreshes
+        self.refreshed = threading.Event()
+
+    def refresh(self) -> bool:
+        self.num_refreshes -= 1
+        if self.num_refreshes == 0:
+            self.refreshed.set()
+        return True
+
+    def get_collections(self):
+        return []
+
+
+class RefreshSchedulerTest(TestCase):
+
+    def test_refresh(self):
+        scheduler = RefreshScheduler()
+        fast_handler = _FeatureHandlerMock(3)
+        slow_handler = _FeatureHandlerMock(1)
+        scheduler.add(fast_handler, 0.01)
+        scheduler.add(slow_handler, 3600)
+        try:
+            self.assertTrue(fast_handler.refreshed.wait(5))
+            self.assertEqual(1, slow_handler.num_refreshes)
+        finally:
+            scheduler.stop()
@@ -0,0 +1,68 @@
+import threading
+import time
+from unittest import TestCase
+
+from doors_dashboards.core.singleflight import SingleFlight
+
+
+class SingleFlightTest(TestCase):
+
+    def setUp(self) -> None:
+        self.single_flight = SingleFlight()
+        self.loads = []
+
+    def _load(self, key: str):
+        def load():
+            self.loads.append(key)
+            time.sleep(0.1)
+            return key * 2
+
+        return load
+
+    def _run_concurrently(self, function, num_threads: int = 8):
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(function()))
+            for _ in range(num_threads)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_do(self):
+        results = self._run_concurrently(
+            lambda: self.single_flight.do("a", self._load("a"))
+        )
+        self.assertEqual(["aa"] * 8, results)
+        self.assertEqual(["a"], self.loads)
+
+        # a finished load is not remembered
+        self.assertEqual("aa", self.single_flight.do("a", self._load("a")))
+        self.assertEqual(["a", "a"], self.loads)
+
+    def test_do_different_keys(self):
+        self.assertEqual("aa", self.single_flight.do("a", self._load("a")))
+        self.assertEqual("bb", self.single_flight.do("b", self._load("b")))
+        self.assertEqual(["a", "b"], self.loads)
+
+    def test_do_failing(self):
+        def load():
+            self.loads.append("a")
+            time.sleep(0.1)
+            raise ValueError("a")
+
+        def do():
+            try:
+                return self.single_flight.do("a", load)
+            except ValueError as e:
+                return e
+
+        results = self._run_concurrently(do, num_threads=4)
+        self.assertEqual(4, len(results))
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+        self.assertEqual(["a"], self.loads)
+
+        # failed loads are tried again
+        self.assertEqual("aa", self.single_flight.do("a", self._load("a")))
@@ -0,0 +1,59 @@
+from unittest import TestCase
+
+from doors_dashboards.core.sourceregistry import SourceRegistry
+
+
+class SourceRegistryTest(TestCase):
+
+    def setUp(self) -> None:
+        self.registry = SourceRegistry()
+        self.loads = []
+
+    def _load(self, value: str):
+        def load():
+            self.loads.append(value)
+            return value
+
+        return load
+
+    def test_acquire_and_release(self):
+        self.assertEqual("a", self.registry.acquire("k", self._load("a")))
+        self.assertEqual("a", self.registry.acquire("k", self._load("b")))
+        self.assertEqual(["a"], self.loads)
+        self.assertEqual(2, self.registry.get_references("k"))
+
+        self.registry.release("k")
+        self.assertEqual("a", self.registry.get("k"))
+        self.registry.release("k")
+        self.assertIsNone(self.registry.get("k"))
+        self.assertEqual(0, self.registry.get_references("k"))
+
+        self.assertEqual("b", self.registry.acquire("k", self._load("b")))
+        self.assertEqual(["a", "b"], self.loads)
+
+    def test_acquire_failing(self):
+        def load():
+            raise ValueError("a")
+
+        with self.assertRaises(ValueError):
+            self.registry.acquire("k", load)
+        self.assertEqual(0, self.registry.get_references("k"))
+        self.assertEqual("a", self.registry.acquire("k", self._load("a")))
+
+    def test_update(self):
+        self.registry.acquire("k", self._load("a"))
+        self.registry.update("k", "b")
+        self.assertEqual("b", self.registry.get("k"))
+        self.assertEqual("b", self.registry.acquire("k", self._load("c")))
+        self.assertEqual(["a"], self.loads)
+
+        # values are only updated while they are held
+        self.registry.update("l", "b")
+        self.assertIsNone(self.registry.get("l"))
+
+    def test_invalidate(self):
+        self.registry.acquire("k", self._load("a"))
+        self.registry.invalidate("k")
+        self.assertIsNone(self.registry.get("k"))
+        self.assertEqual("b", self.registry.acquire("k", self._load("b")))
+        self.assertEqual(2, self.registry.get_references("k"))
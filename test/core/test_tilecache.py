@@ -0,0 +1,69 @@
+import os
+import shutil
+import tempfile
+import time
+from unittest import TestCase
+
+from doors_dashboards.core.tilecache import TileCache
+
+
+class TileCacheTest(TestCase):
+
+    def setUp(self) -> None:
+        self.cache_dir = tempfile.mkdtemp()
+        self.fetched = []
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.cache_dir)
+
+    def _fetch(self, key: str, size: int = 10):
+        def fetch():
+            self.fetched.append(key)
+            return key.encode("utf-8") * size
+
+        return fetch
+
+    def test_get(self):
+        cache = TileCache(self.cache_dir)
+        self.assertEqual(b"a" * 10, cache.get("a", self._fetch("a")))
+        self.assertEqual(b"a" * 10, cache.get("a", self._fetch("a")))
+        self.assertEqual(["a"], self.fetched)
+
+        # entries are kept on disk across instances
+        cache = TileCache(self.cache_dir)
+        self.assertEqual(b"a" * 10, cache.get("a", self._fetch("a")))
+        self.assertEqual(["a"], self.fetched)
+
+    def test_get_failed_fetch(self):
+        cache = TileCache(self.cache_dir)
+        self.assertIsNone(cache.get("a", lambda: None))
+        self.assertEqual(b"a" * 10, cache.get("a", self._fetch("a")))
+        self.assertEqual(["a"], self.fetched)
+
+    def test_max_age(self):
+        cache = TileCache(self.cache_dir, max_age=60)
+        cache.get("a", self._fetch("a"))
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            os.utime(path, (time.time(), time.time() - 120))
+        cache.get("a", self._fetch("a"))
+        self.assertEqual(["a", "a"], self.fetched)
+        cache.get("a", self._fetch("a"), max_age=3600)
+        self.assertEqual(["a", "a"], self.fetched)
+
+    def test_evict_least_recently_used(self):
+        cache = TileCache(self.cache_dir, max_size=250)
+        for key in ["a", "b"]:
+            cache.get(key, self._fetch(key, 100))
+        # make "a" the most recently used entry
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            os.utime(path, (time.time() - 100, os.stat(path).st_mtime))
+        cache.get("a", self._fetch("a", 100))
+        cache.get("c", self._fetch("c", 100))
+        self.assertEqual(2, len(os.listdir(self.cache_dir)))
+        cache.get("a", self._fetch("a", 100))
+        cache.get("c", self._fetch("c", 100))
+        self.assertEqual(["a", "b", "c"], self.fetched)
+        cache.get("b", self._fetch("b", 100))
+        self.assertEqual(["a", "b", "c", "b"], self.fetched)
@@ -0,0 +1,75 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+from unittest import TestCase
+
+from doors_dashboards.core.tracer import StartupTracer
+from doors_dashboards.core.tracer import STARTUP_PROFILE_ID
+
+
+class StartupTracerTest(TestCase):
+
+    def setUp(self) -> None:
+        self.output_dir = tempfile.mkdtemp()
+        self.tracer = StartupTracer(self.output_dir)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.output_dir)
+
+    def test_trace(self):
+        with self.tracer.trace("register pages"):
+            with self.tracer.trace("create dashboard", "dash"):
+                with self.tracer.trace("read collection"):
+                    _ = [0] * 100000
+
+        startup = self.tracer.get_profile(STARTUP_PROFILE_ID)
+        self.assertEqual(1, len(startup))
+        self.assertEqual(["register pages"], startup[0]["path"])
+
+        dash = self.tracer.get_profile("dash")
+        self.assertEqual(2, len(dash))
+        self.assertEqual(["create dashboard"], dash[0]["path"])
+        self.assertEqual(["create dashboard", "read collection"], dash[1]["path"])
+        self.assertGreaterEqual(dash[0]["duration"], dash[1]["duration"])
+        self.assertGreater(dash[1]["peak_memory"], 100000 * 8 - 1)
+        self.assertGreaterEqual(dash[0]["peak_memory"], dash[1]["peak_memory"])
+
+    def test_continue_trace(self):
+        def read_collection(context):
+            with self.tracer.continue_trace(context):
+                with self.tracer.trace("read collection"):
+                    pass
+
+        with self.tracer.trace("create dashboard", "dash"):
+            thread = threading.Thread(
+                target=read_collection, args=(self.tracer.get_context(),)
+            )
+            thread.start()
+            thread.join()
+        read_collection(None)
+
+        dash = self.tracer.get_profile("dash")
+        self.assertEqual(2, len(dash))
+        self.assertEqual(["create dashboard", "read collection"], dash[1]["path"])
+        self.assertGreaterEqual(dash[0]["self_duration"], 0)
+        startup = self.tracer.get_profile(STARTUP_PROFILE_ID)
+        self.assertEqual([["read collection"]], [p["path"] for p in startup])
+
+    def test_write_report(self):
+        with self.tracer.trace("create dashboard", "dash"):
+            with self.tracer.trace("get scattermap/map"):
+                pass
+
+        self.tracer.write_report()
+
+        with open(os.path.join(self.output_dir, "dash.json")) as json_file:
+            profile = json.load(json_file)
+        self.assertEqual("dash", profile["id"])
+        self.assertEqual(2, len(profile["phases"]))
+        with open(os.path.join(self.output_dir, "dash.folded")) as folded_file:
+            lines = folded_file.read().splitlines()
+        self.assertEqual(2, len(lines))
+        self.assertTrue(lines[0].startswith("create dashboard "))
+        self.assertTrue(lines[1].startswith("create dashboard;get scattermap/map "))
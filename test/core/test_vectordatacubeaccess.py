@@ -0,0 +1,87 @@
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+from unittest import TestCase
+import xarray as xr
+import xvec
+
+from doors_dashboards.core.vectordatacubeaccess import VectorDataCubeAccessor
+
+_BUCKET = "bucket"
+_FILE_NAME = "rivers.zarr"
+
+
+def _create_vdc() -> xr.Dataset:
+    times = pd.date_range("2020-01-01", periods=4, freq="D")
+    geometries = [shapely.Point(30.0, 45.0), shapely.Point(10.0, 10.0)]
+    shape = (len(geometries), len(times))
+    vdc = xr.Dataset(
+        dict(
+            discharge=(("geometry", "time"), np.arange(8.0).reshape(shape)),
+            nitrate=(("geometry", "time"), np.arange(8.0).reshape(shape) * 10),
+        ),
+        coords=dict(
+            geometry=geometries,
+            time=times,
+            river=("geometry", ["danube", "nile"]),
+        ),
+    )
+    return vdc.xvec.set_geom_indexes("geometry", crs="EPSG:4326")
+
+
+class VectorDataCubeAccessorTest(TestCase):
+
+    def setUp(self) -> None:
+        self.accessor = VectorDataCubeAccessor()
+        self.accessor._vdcs[f"{_BUCKET}/{_FILE_NAME}"] = _create_vdc()
+
+    def _get_df(self, variables, collection: str = "danube", **kwargs):
+        return self.accessor.get_dataframe_from_vector_data_cube(
+            _FILE_NAME,
+            _BUCKET,
+            variables=variables,
+            collection=collection,
+            time_stamp_name="time",
+            collection_coord="river",
+            **kwargs,
+        )
+
+    def test_get_dataframe(self):
+        gdf = self._get_df(["discharge"])
+        self.assertEqual(["discharge", "geometry", "time"], list(gdf.columns))
+        self.assertEqual([0.0, 1.0, 2.0, 3.0], list(gdf["discharge"]))
+        self.assertEqual("EPSG:4326", gdf.crs)
+
+        gdf = self._get_df(["nitrate"], collection="nile")
+        self.assertEqual([40.0, 50.0, 60.0, 70.0], list(gdf["nitrate"]))
+
+    def test_get_dataframe_time_range(self):
+        gdf = self._get_df(
+            ["discharge", "nitrate"], time_range=["2020-01-02", "2020-01-03"]
+        )
+        self.assertEqual([1.0, 2.0], list(gdf["discharge"]))
+        self.assertEqual([10.0, 20.0], list(gdf["nitrate"]))
+
+        # open ends
+        gdf = self._get_df(["discharge"], time_range=[None, "2020-01-02"])
+        self.assertEqual([0.0, 1.0], list(gdf["discharge"]))
+
+    def test_get_dataframe_is_cached_per_variables(self):
+        self._get_df(["discharge"])
+        self._get_df(["discharge"])
+        self._get_df(["discharge", "nitrate"])
+        self.assertEqual(2, len(self.accessor._gdfs))
+
+    def test_get_dataframe_outside_of_mask(self):
+        mask = gpd.GeoDataFrame(
+            geometry=[shapely.box(27.0, 40.0, 42.0, 47.0)], crs="EPSG:4326"
+        )
+        gdf = self._get_df(["discharge"], mask=mask)
+        self.assertEqual(4, len(gdf))
+
+        gdf = self._get_df(["discharge"], collection="nile", mask=mask)
+        self.assertEqual(0, len(gdf))
+        self.assertEqual(["discharge", "geometry", "time"], list(gdf.columns))
+        # collections outside of the mask are not read
+        self.assertEqual(1, len(self.accessor._gdfs))
@@ -0,0 +1,65 @@
+import threading
+from unittest import TestCase
+from unittest.mock import patch
+
+from dash import html
+
+from doors_dashboards import pages
+from doors_dashboards.pages import LazyDashboard
+from doors_dashboards.pages import prewarm_pages
+from doors_dashboards.pages import wait_for_pages
+
+
+class LazyDashboardTest(TestCase):
+
+    def setUp(self) -> None:
+        pages._PAGES_READY.clear()
+        self.addCleanup(pages._LAZY_DASHBOARDS.clear)
+        self.addCleanup(pages._PAGES_READY.clear)
+
+    def test_failed_build_is_not_retried(self):
+        lazy_dashboard = LazyDashboard("broken", {})
+        with patch.object(
+            pages, "create_dashboard", side_effect=ValueError("no components")
+        ) as create_dashboard:
+            with self.assertRaises(ValueError):
+                lazy_dashboard.build()
+            self.assertTrue(lazy_dashboard.is_done())
+            layout = lazy_dashboard()
+        self.assertEqual(1, create_dashboard.call_count)
+        self.assertIsInstance(layout, html.Div)
+        self.assertEqual(
+            "Dashboard 'broken' is not available", layout.children.children
+        )
+
+    def test_wait_for_pages(self):
+        pages._LAZY_DASHBOARDS["broken"] = LazyDashboard("broken", {})
+        pages._LAZY_DASHBOARDS["working"] = LazyDashboard("working", {})
+
+        def create_dashboard(config):
+            if pages._LAZY_DASHBOARDS["broken"]._config is config:
+                raise ValueError("no components")
+            return html.Div()
+
+        with patch.object(pages, "create_dashboard", side_effect=create_dashboard):
+            with self.assertLogs("doors-dashboards", "ERROR") as logs:
+                wait_for_pages()
+        self.assertEqual(1, len(logs.records))
+        self.assertIn("'broken'", logs.records[0].getMessage())
+        self.assertTrue(pages._LAZY_DASHBOARDS["working"].is_done())
+
+        # later requests do not wait for pages anymore
+        pages._LAZY_DASHBOARDS["later"] = LazyDashboard("later", {})
+        wait_for_pages()
+        self.assertFalse(pages._LAZY_DASHBOARDS["later"].is_done())
+
+    def test_prewarm_pages_writes_report(self):
+        pages._LAZY_DASHBOARDS["first"] = LazyDashboard("first", {})
+        pages._LAZY_DASHBOARDS["second"] = LazyDashboard("second", {})
+        reported = threading.Event()
+        with patch.object(pages, "create_dashboard", return_value=html.Div()):
+            with patch.object(pages, "write_report", side_effect=reported.set):
+                futures = prewarm_pages()
+                self.assertTrue(reported.wait(10))
+        self.assertEqual(["first", "second"], sorted(futures.keys()))
+        self.assertTrue(all(future.done() for future in futures.values()))